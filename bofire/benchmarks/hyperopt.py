@@ -15,6 +15,7 @@ class Hyperopt(Benchmark):
         training_data: pd.DataFrame,
         folds: int,
         random_state: Optional[int] = None,
+        n_jobs: int = 1,
     ) -> None:
         super().__init__()
         if surrogate_data.hyperconfig is None:
@@ -24,6 +25,7 @@ class Hyperopt(Benchmark):
         self.folds = folds
         self.results = None
         self.random_state = random_state
+        self.n_jobs = n_jobs
 
     @property
     def domain(self) -> Domain:
@@ -38,7 +40,10 @@ class Hyperopt(Benchmark):
             self.surrogate_data.update_hyperparameters(candidate)
             surrogate = surrogates.map(self.surrogate_data)
             _, cv_test, _ = surrogate.cross_validate(  # type: ignore
-                self.training_data, folds=self.folds, random_state=self.random_state
+                self.training_data,
+                folds=self.folds,
+                random_state=self.random_state,
+                n_jobs=self.n_jobs,
             )
             if i == 0:
                 results = cv_test.get_metrics(combine_folds=True)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import itertools
+import math
 import warnings
 from enum import Enum
 from typing import (
@@ -345,40 +346,110 @@ class Inputs(_BaseFeatures[AnyInput]):
             raise ValueError("there are na values")
         return experiments
 
-    def get_categorical_combinations(
+    def get_categorical_combination_features(
         self,
         include: Union[Type, List[Type]] = Input,
         exclude: Union[Type, List[Type]] = None,  # type: ignore
-    ):
-        """get a list of tuples pairing the feature keys with a list of valid categories
+    ) -> List[Union[CategoricalInput, DiscreteInput]]:
+        """get the non fixed categorical and discrete input features spanning the
+        categorical combinations, in the order in which they are combined
 
         Args:
             include (Feature, optional): Features to be included. Defaults to Input.
             exclude (Feature, optional): Features to be excluded, e.g. subclasses of the included features. Defaults to None.
 
         Returns:
-            List[(str, List[str])]: Returns a list of tuples pairing the feature keys with a list of valid categories (str)
+            List[Union[CategoricalInput, DiscreteInput]]: List of the features.
         """
         features = [
             f
             for f in self.get(includes=include, excludes=exclude)
             if (isinstance(f, CategoricalInput) and not f.is_fixed())
         ]
-        list_of_lists = [
-            [(f.key, cat) for cat in f.get_allowed_categories()] for f in features
-        ]
-
         discretes = [
             f
             for f in self.get(includes=include, excludes=exclude)
             if (isinstance(f, DiscreteInput) and not f.is_fixed())
         ]
+        return features + discretes  # type: ignore
 
-        list_of_lists_2 = [[(d.key, v) for v in d.values] for d in discretes]
+    def _get_categorical_combination_lists(
+        self,
+        include: Union[Type, List[Type]] = Input,
+        exclude: Union[Type, List[Type]] = None,  # type: ignore
+    ) -> List[List[Tuple[str, Union[str, float]]]]:
+        return [
+            (
+                [(f.key, cat) for cat in f.get_allowed_categories()]
+                if isinstance(f, CategoricalInput)
+                else [(f.key, v) for v in f.values]
+            )
+            for f in self.get_categorical_combination_features(
+                include=include, exclude=exclude
+            )
+        ]
 
-        list_of_lists = list_of_lists + list_of_lists_2
+    def iter_categorical_combinations(
+        self,
+        include: Union[Type, List[Type]] = Input,
+        exclude: Union[Type, List[Type]] = None,  # type: ignore
+    ) -> Iterator[Tuple[Tuple[str, Union[str, float]], ...]]:
+        """lazily iterate over the tuples pairing the feature keys with valid categories,
+        in the same order as `get_categorical_combinations`
 
-        return list(itertools.product(*list_of_lists))
+        Args:
+            include (Feature, optional): Features to be included. Defaults to Input.
+            exclude (Feature, optional): Features to be excluded, e.g. subclasses of the included features. Defaults to None.
+
+        Returns:
+            Iterator[Tuple[(str, str)]]: Iterator over the combinations.
+        """
+        return itertools.product(
+            *self._get_categorical_combination_lists(include=include, exclude=exclude)
+        )
+
+    def get_number_of_categorical_combinations(
+        self,
+        include: Union[Type, List[Type]] = Input,
+        exclude: Union[Type, List[Type]] = None,  # type: ignore
+    ) -> int:
+        """get the number of categorical combinations without enumerating them
+
+        Args:
+            include (Feature, optional): Features to be included. Defaults to Input.
+            exclude (Feature, optional): Features to be excluded, e.g. subclasses of the included features. Defaults to None.
+
+        Returns:
+            int: Number of combinations.
+        """
+        return math.prod(
+            (
+                len(f.get_allowed_categories())
+                if isinstance(f, CategoricalInput)
+                else len(f.values)
+            )
+            for f in self.get_categorical_combination_features(
+                include=include, exclude=exclude
+            )
+        )
+
+    def get_categorical_combinations(
+        self,
+        include: Union[Type, List[Type]] = Input,
+        exclude: Union[Type, List[Type]] = None,  # type: ignore
+    ):
+        """get a list of tuples pairing the feature keys with a list of valid categories
+
+        Args:
+            include (Feature, optional): Features to be included. Defaults to Input.
+            exclude (Feature, optional): Features to be excluded, e.g. subclasses of the included features. Defaults to None.
+
+        Returns:
+            List[(str, List[str])]: Returns a list of tuples pairing the feature keys with a list of valid categories (str)
+        """
+        return list(
+            self.iter_categorical_combinations(include=include, exclude=exclude)
+        )
 
     # transformation related methods
     def _get_transform_info(
@@ -10,3 +10,5 @@ class MolecularKernel(Kernel):
 class TanimotoKernel(MolecularKernel):
     type: Literal["TanimotoKernel"] = "TanimotoKernel"
     ard: bool = True
+    # if True, the inputs are fingerprints packed into 32 bit words
+    packed: bool = False
@@ -1,50 +1,102 @@
+import hashlib
 from abc import abstractmethod
-from typing import List, Literal, Optional
+from typing import List, Literal, Optional, Union
 
+import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 from pydantic import Field, field_validator
 from typing_extensions import Annotated
 
 import bofire.data_models.molfeatures.names as names
 from bofire.data_models.base import BaseModel
 from bofire.utils.cheminformatics import (  # smiles2bag_of_characters,
+    pack_fingerprints,
     smiles2fingerprints,
     smiles2fragments,
     smiles2fragments_fingerprints,
     smiles2mordred,
 )
+from bofire.utils.featurization_cache import get_featurization_cache
 
 
 class MolFeatures(BaseModel):
     """Base class for all molecular features"""
 
     type: str
+    # if True, the descriptor values are returned as sparse columns, which keeps
+    # the featurization and its cache small. Only `MinHashTanimotoGPSurrogate`
+    # consumes the sparse columns as they are, the exact GP surrogates densify them
+    # when building their training tensors, as botorch models require dense inputs.
+    # The sparse branches of the Tanimoto kernel are only used when it is called
+    # directly with sparse COO tensors.
+    sparse: bool = False
 
     @abstractmethod
     def get_descriptor_names(self) -> List[str]:
         pass
 
     @abstractmethod
-    def get_descriptor_values(self, values: pd.Series) -> pd.DataFrame:
+    def _get_descriptor_values(
+        self, smiles: List[str]
+    ) -> Union[np.ndarray, sp.csr_matrix]:
         pass
 
+    def get_cache_key(self) -> str:
+        """Returns a hash of the configuration of the featurizer, which is used
+        to key its values in the featurization cache."""
+        return hashlib.sha256(self.model_dump_json().encode()).hexdigest()
+
+    def get_descriptor_values(self, values: pd.Series) -> pd.DataFrame:
+        cache = get_featurization_cache()
+        smiles = values.to_list()
+        data = (
+            self._get_descriptor_values(smiles)
+            if cache is None
+            else cache.featurize(
+                self.get_cache_key(), smiles, self._get_descriptor_values
+            )
+        )
+        if self.sparse:
+            return pd.DataFrame.sparse.from_spmatrix(
+                sp.csr_matrix(data, dtype=float),
+                columns=self.get_descriptor_names(),
+                index=values.index,
+            )
+        return pd.DataFrame(
+            data=data.toarray() if sp.issparse(data) else data.astype(float),  # type: ignore
+            columns=self.get_descriptor_names(),
+            index=values.index,
+        )
+
 
 class Fingerprints(MolFeatures):
     type: Literal["Fingerprints"] = "Fingerprints"
     bond_radius: int = 5
     n_bits: int = 2048
+    # if True, the bits are packed into 32 bit words, one descriptor per word,
+    # which can be consumed by a `TanimotoKernel` with `packed=True`
+    packed: bool = False
+
+    @field_validator("packed")
+    @classmethod
+    def validate_packed(cls, packed, info):
+        if packed and info.data.get("sparse", False):
+            raise ValueError("Fingerprints cannot be both packed and sparse.")
+        return packed
 
     def get_descriptor_names(self) -> List[str]:
+        if self.packed:
+            return [f"fingerprint_word_{i}" for i in range(-(-self.n_bits // 32))]
         return [f"fingerprint_{i}" for i in range(self.n_bits)]
 
-    def get_descriptor_values(self, values: pd.Series) -> pd.DataFrame:
-        return pd.DataFrame(
-            data=smiles2fingerprints(
-                values.to_list(), bond_radius=self.bond_radius, n_bits=self.n_bits
-            ).astype(float),
-            columns=self.get_descriptor_names(),
-            index=values.index,
+    def _get_descriptor_values(
+        self, smiles: List[str]
+    ) -> Union[np.ndarray, sp.csr_matrix]:
+        fingerprints = smiles2fingerprints(
+            smiles, bond_radius=self.bond_radius, n_bits=self.n_bits, sparse=self.sparse
         )
+        return pack_fingerprints(fingerprints) if self.packed else fingerprints
 
 
 class Fragments(MolFeatures):
@@ -79,17 +131,24 @@ class Fragments(MolFeatures):
     def get_descriptor_names(self) -> List[str]:
         return self.fragments if self.fragments is not None else names.fragments
 
-    def get_descriptor_values(self, values: pd.Series) -> pd.DataFrame:
-        return pd.DataFrame(
-            data=smiles2fragments(values.to_list(), self.get_descriptor_names()),
-            columns=self.get_descriptor_names(),
-            index=values.index,
-        )
+    def _get_descriptor_values(
+        self, smiles: List[str]
+    ) -> Union[np.ndarray, sp.csr_matrix]:
+        return smiles2fragments(smiles, self.get_descriptor_names(), sparse=self.sparse)
 
 
 class FingerprintsFragments(Fingerprints, Fragments):
     type: Literal["FingerprintsFragments"] = "FingerprintsFragments"
 
+    @field_validator("packed")
+    @classmethod
+    def validate_packed(cls, packed):
+        if packed:
+            raise ValueError(
+                "Packed fingerprints are not supported in combination with fragments."
+            )
+        return packed
+
     def get_descriptor_names(self) -> List[str]:
         fingerprints_list = [f"fingerprint_{i}" for i in range(self.n_bits)]
         fragments_list = (
@@ -100,20 +159,17 @@ class FingerprintsFragments(Fingerprints, Fragments):
 
         return fingerprints_fragment_list
 
-    def get_descriptor_values(self, values: pd.Series) -> pd.DataFrame:
+    def _get_descriptor_values(self, smiles: List[str]) -> np.ndarray:
         fragments_list = (
             self.fragments if self.fragments is not None else names.fragments
         )
 
-        return pd.DataFrame(
-            data=smiles2fragments_fingerprints(
-                values.to_list(),
-                bond_radius=self.bond_radius,
-                n_bits=self.n_bits,
-                fragments_list=fragments_list,
-            ),
-            columns=self.get_descriptor_names(),
-            index=values.index,
+        return smiles2fragments_fingerprints(
+            smiles,
+            bond_radius=self.bond_radius,
+            n_bits=self.n_bits,
+            fragments_list=fragments_list,
+            sparse=self.sparse,
         )
 
 
@@ -148,9 +204,5 @@ class MordredDescriptors(MolFeatures):
     def get_descriptor_names(self) -> List[str]:
         return self.descriptors
 
-    def get_descriptor_values(self, values: pd.Series) -> pd.DataFrame:
-        return pd.DataFrame(
-            data=smiles2mordred(values.to_list(), self.descriptors),
-            columns=self.descriptors,
-            index=values.index,
-        )
+    def _get_descriptor_values(self, smiles: List[str]) -> np.ndarray:
+        return smiles2mordred(smiles, self.descriptors)
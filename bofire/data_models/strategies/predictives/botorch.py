@@ -72,6 +72,21 @@ class BotorchStrategy(PredictiveStrategy):
     num_raw_samples: IntPowerOfTwo = 1024
     maxiter: PositiveInt = 2000
     batch_limit: Optional[PositiveInt] = Field(default=None, validate_default=True)
+    # number of threads used to optimize the acqf over the fixed feature
+    # combinations generated by the EXHAUSTIVE categorical methods
+    n_jobs: PositiveInt = 1
+    # if set, the fixed feature combinations are first screened by evaluating
+    # the acqf on quasi-random points and only the best ones are optimized
+    screening_top_k: Optional[PositiveInt] = None
+    screening_num_samples: IntPowerOfTwo = 64
+    # number of combinations scored at once in fully combinatorial search spaces
+    combinatorial_chunk_size: PositiveInt = 2048
+    # how batches of candidates are generated, either by optimizing all of them
+    # jointly or greedily one after another with fantasized observations
+    batch_method: Literal["joint", "kriging_believer", "constant_liar"] = "joint"
+    # if True, the next candidates are generated in a background thread after
+    # every tell, using the candidate count of the last ask
+    ask_ahead: bool = False
     # encoding params
     descriptor_method: CategoricalMethodEnum = CategoricalMethodEnum.EXHAUSTIVE
     categorical_method: CategoricalMethodEnum = CategoricalMethodEnum.EXHAUSTIVE
@@ -86,6 +101,9 @@ class BotorchStrategy(PredictiveStrategy):
     # hyperopt params
     frequency_hyperopt: Annotated[int, Field(ge=0)] = 0  # 0 indicates no hyperopt
     folds: int = 5
+    # retrain params, in between two full refits new experiments are only
+    # conditioned into the already fitted models
+    refit_every_n: PositiveInt = 1
     # local search region params
     local_search_config: Optional[AnyLocalSearchConfig] = None
 
@@ -10,6 +10,9 @@ from bofire.data_models.surrogates.deterministic import LinearDeterministicSurro
 from bofire.data_models.surrogates.empirical import EmpiricalSurrogate
 from bofire.data_models.surrogates.fully_bayesian import SaasSingleTaskGPSurrogate
 from bofire.data_models.surrogates.linear import LinearSurrogate
+from bofire.data_models.surrogates.minhash_tanimoto_gp import (
+    MinHashTanimotoGPSurrogate,
+)
 from bofire.data_models.surrogates.mixed_single_task_gp import (
     MixedSingleTaskGPHyperconfig,
     MixedSingleTaskGPSurrogate,
@@ -52,6 +55,7 @@ AnySurrogate = Union[
     LinearSurrogate,
     PolynomialSurrogate,
     TanimotoGPSurrogate,
+    MinHashTanimotoGPSurrogate,
     LinearDeterministicSurrogate,
     MultiTaskGPSurrogate,
     SingleTaskIBNNSurrogate,
@@ -70,6 +74,7 @@ AnyTrainableSurrogate = Union[
     PolynomialSurrogate,
     SingleTaskIBNNSurrogate,
     TanimotoGPSurrogate,
+    MinHashTanimotoGPSurrogate,
 ]
 
 AnyRegressionSurrogate = Union[
@@ -84,6 +89,7 @@ AnyRegressionSurrogate = Union[
     LinearSurrogate,
     PolynomialSurrogate,
     TanimotoGPSurrogate,
+    MinHashTanimotoGPSurrogate,
     LinearDeterministicSurrogate,
     MultiTaskGPSurrogate,
     SingleTaskIBNNSurrogate,
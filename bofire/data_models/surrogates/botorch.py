@@ -1,4 +1,4 @@
-from pydantic import field_validator
+from pydantic import PositiveInt, field_validator
 
 from bofire.data_models.enum import CategoricalEncodingEnum
 from bofire.data_models.features.api import (
@@ -12,6 +12,9 @@ from bofire.data_models.surrogates.surrogate import Surrogate
 
 
 class BotorchSurrogate(Surrogate):
+    # maximal number of rows for which the posterior is evaluated at once
+    max_batch_rows: PositiveInt = 2048
+
     @field_validator("input_preprocessing_specs")
     @classmethod
     def validate_input_preprocessing_specs(cls, v, info):
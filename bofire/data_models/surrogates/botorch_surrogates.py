@@ -1,7 +1,7 @@
 import itertools
 from typing import List, Union
 
-from pydantic import field_validator
+from pydantic import PositiveInt, field_validator
 
 from bofire.data_models.base import BaseModel
 from bofire.data_models.domain.api import Inputs, Outputs
@@ -9,6 +9,9 @@ from bofire.data_models.surrogates.deterministic import LinearDeterministicSurro
 from bofire.data_models.surrogates.empirical import EmpiricalSurrogate
 from bofire.data_models.surrogates.fully_bayesian import SaasSingleTaskGPSurrogate
 from bofire.data_models.surrogates.linear import LinearSurrogate
+from bofire.data_models.surrogates.minhash_tanimoto_gp import (
+    MinHashTanimotoGPSurrogate,
+)
 from bofire.data_models.surrogates.mixed_single_task_gp import (
     MixedSingleTaskGPSurrogate,
 )
@@ -34,6 +37,7 @@ AnyBotorchSurrogate = Union[
     ClassificationMLPEnsemble,
     SaasSingleTaskGPSurrogate,
     TanimotoGPSurrogate,
+    MinHashTanimotoGPSurrogate,
     LinearSurrogate,
     PolynomialSurrogate,
     LinearDeterministicSurrogate,
@@ -47,6 +51,16 @@ class BotorchSurrogates(BaseModel):
     Behaves similar to a Surrogate."""
 
     surrogates: List[AnyBotorchSurrogate]
+    # number of worker processes used to fit the individual surrogates concurrently.
+    # Starting a worker takes a few seconds, so this pays off for surrogates with
+    # expensive fits like GPs on larger datasets, SAAS GPs or MLP ensembles. The
+    # surrogates have to be picklable.
+    n_jobs: PositiveInt = 1
+    # if True, single task GPs that share their training inputs, input transforms
+    # and kernel structure are fused into one batched multi-output GP instead of
+    # being combined into a `ModelListGP`. Surrogates that cannot be fused fall back
+    # to the `ModelListGP`, so this only changes the speed of posterior evaluations.
+    fuse_models: bool = True
 
     @property
     def input_preprocessing_specs(self) -> InputTransformSpecs:
@@ -9,9 +9,13 @@ from bofire.data_models.surrogates.trainable_botorch import TrainableBotorchSurr
 
 class SaasSingleTaskGPSurrogate(TrainableBotorchSurrogate):
     type: Literal["SaasSingleTaskGPSurrogate"] = "SaasSingleTaskGPSurrogate"
+    # "nuts" samples the hyperparameters with NUTS, "map" fits `num_restarts`
+    # maximum a posteriori estimates, which is much faster in high dimensions
+    fit_method: Literal["nuts", "map"] = "nuts"
     warmup_steps: Annotated[int, Field(ge=1)] = 256
     num_samples: Annotated[int, Field(ge=1)] = 128
     thinning: Annotated[int, Field(ge=1)] = 16
+    num_restarts: Annotated[int, Field(ge=1)] = 8
 
     @field_validator("thinning")
     @classmethod
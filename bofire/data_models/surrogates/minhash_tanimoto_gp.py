@@ -0,0 +1,71 @@
+from typing import Literal, Optional, Type
+
+from pydantic import Field, PositiveInt, field_validator
+from typing_extensions import Annotated
+
+from bofire.data_models.features.api import AnyOutput, ContinuousOutput, MolecularInput
+from bofire.data_models.molfeatures.api import (
+    Fingerprints,
+    FingerprintsFragments,
+    Fragments,
+)
+from bofire.data_models.priors.api import (
+    BOTORCH_NOISE_PRIOR,
+    BOTORCH_SCALE_PRIOR,
+    AnyPrior,
+)
+from bofire.data_models.surrogates.scaler import ScalerEnum
+from bofire.data_models.surrogates.trainable_botorch import TrainableBotorchSurrogate
+
+
+class MinHashTanimotoGPSurrogate(TrainableBotorchSurrogate):
+    """Scalable approximation of the `TanimotoGPSurrogate`.
+
+    The fingerprints are mapped to a b-bit MinHash embedding whose inner product
+    estimates the Tanimoto (Jaccard) similarity of the sets of non-zero bits, and a
+    Bayesian linear model is fitted on top of it. Fitting and prediction are linear
+    in the number of experiments. Fragment counts enter only via their support.
+    """
+
+    type: Literal["MinHashTanimotoGPSurrogate"] = "MinHashTanimotoGPSurrogate"
+    # number of hash functions, the embedding has `n_hashes * 2**hash_bits` dimensions
+    n_hashes: PositiveInt = 256
+    hash_bits: Annotated[int, Field(ge=1, le=8)] = 2
+    random_state: Optional[int] = None
+    outputscale_prior: AnyPrior = Field(default_factory=lambda: BOTORCH_SCALE_PRIOR())
+    noise_prior: AnyPrior = Field(default_factory=lambda: BOTORCH_NOISE_PRIOR())
+    # maximal number of iterations of the L-BFGS fit of the hyperparameters
+    maxiter: PositiveInt = 100
+    scaler: Literal[ScalerEnum.IDENTITY] = ScalerEnum.IDENTITY
+
+    @classmethod
+    def is_output_implemented(cls, my_type: Type[AnyOutput]) -> bool:
+        """Abstract method to check output type for surrogate models
+        Args:
+            my_type: continuous or categorical output
+        Returns:
+            bool: True if the output type is valid for the surrogate chosen, False otherwise
+        """
+        return isinstance(my_type, type(ContinuousOutput))
+
+    @field_validator("input_preprocessing_specs")
+    @classmethod
+    def validate_moleculars(cls, v, info):
+        """Checks that all inputs are molecular and encoded by unpacked fingerprints,
+        fragments, or fingerprintsfragments."""
+        if "inputs" not in info.data:
+            return v
+        inputs = info.data["inputs"]
+        specs = [
+            v.get(feat.key, Fingerprints() if type(feat) is MolecularInput else None)
+            for feat in inputs.get()
+        ]
+        if len(inputs.get(MolecularInput)) != len(inputs) or not all(
+            isinstance(spec, (Fingerprints, Fragments))
+            and not getattr(spec, "packed", False)
+            for spec in specs
+        ):
+            raise ValueError(
+                "MinHashTanimotoGPSurrogate can only be used if all inputs are molecular and encoded by unpacked fingerprints, fragments, or fingerprintsfragments."
+            )
+        return v
@@ -95,6 +95,7 @@ class MixedSingleTaskGPSurrogate(TrainableBotorchSurrogate):
         default_factory=lambda: HammingDistanceKernel(ard=True)
     )
     noise_prior: AnyPrior = Field(default_factory=lambda: BOTORCH_NOISE_PRIOR())
+    warm_start: bool = False
     hyperconfig: Optional[MixedSingleTaskGPHyperconfig] = Field(
         default_factory=lambda: MixedSingleTaskGPHyperconfig()
     )
@@ -1,6 +1,6 @@
 from typing import Literal, Type
 
-from pydantic import Field, validator
+from pydantic import Field, model_validator, validator
 
 # from bofire.data_models.enum import MolecularEncodingEnum
 from bofire.data_models.features.api import AnyOutput, ContinuousOutput
@@ -23,6 +23,7 @@ from bofire.data_models.priors.api import (
     AnyPrior,
 )
 from bofire.data_models.surrogates.scaler import ScalerEnum
+from bofire.data_models.surrogates.tanimoto_gp import validate_packed_fingerprints
 from bofire.data_models.surrogates.trainable_botorch import TrainableBotorchSurrogate
 
 
@@ -45,6 +46,7 @@ class MixedTanimotoGPSurrogate(TrainableBotorchSurrogate):
     )
     scaler: ScalerEnum = ScalerEnum.NORMALIZE
     noise_prior: AnyPrior = Field(default_factory=lambda: BOTORCH_NOISE_PRIOR())
+    warm_start: bool = False
 
     @classmethod
     def is_output_implemented(cls, my_type: Type[AnyOutput]) -> bool:
@@ -69,3 +71,10 @@ class MixedTanimotoGPSurrogate(TrainableBotorchSurrogate):
                 "MixedTanimotoGPSurrogate can only be used if at least one of fingerprints, fragments, or fingerprintsfragments features are present."
             )
         return v
+
+    @model_validator(mode="after")
+    def validate_packed(self):
+        validate_packed_fingerprints(
+            self.molecular_kernel, self.input_preprocessing_specs
+        )
+        return self
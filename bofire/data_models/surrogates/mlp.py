@@ -1,4 +1,4 @@
-from typing import Annotated, Literal, Sequence, Type
+from typing import Annotated, Literal, Optional, Sequence, Type
 
 from pydantic import Field
 
@@ -23,6 +23,10 @@ class MLPEnsemble(TrainableBotorchSurrogate):
     weight_decay: Annotated[float, Field(ge=0.0)] = 0.0
     subsample_fraction: Annotated[float, Field(gt=0.0)] = 1.0
     shuffle: bool = True
+    # if set, a validation split of the training data is held out and the training
+    # stops after this number of epochs without improvement of the validation loss
+    early_stopping_patience: Optional[Annotated[int, Field(ge=1)]] = None
+    validation_fraction: Annotated[float, Field(gt=0.0, lt=1.0)] = 0.1
 
 
 class RegressionMLPEnsemble(MLPEnsemble):
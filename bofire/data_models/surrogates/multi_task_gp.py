@@ -92,6 +92,7 @@ class MultiTaskGPSurrogate(TrainableBotorchSurrogate):
     )
     noise_prior: AnyPrior = Field(default_factory=lambda: BOTORCH_NOISE_PRIOR())
     task_prior: Optional[LKJPrior] = Field(default_factory=lambda: None)
+    warm_start: bool = False
     hyperconfig: Optional[MultiTaskGPHyperconfig] = Field(
         default_factory=lambda: MultiTaskGPHyperconfig()
     )
@@ -1,6 +1,6 @@
-from typing import Literal, Type
+from typing import List, Literal, Type
 
-from pydantic import Field, validator
+from pydantic import Field, model_validator, validator
 
 from bofire.data_models.features.api import AnyOutput, ContinuousOutput
 from bofire.data_models.kernels.api import AnyKernel, ScaleKernel
@@ -17,6 +17,36 @@ from bofire.data_models.priors.api import (
 )
 from bofire.data_models.surrogates.scaler import ScalerEnum
 from bofire.data_models.surrogates.trainable_botorch import TrainableBotorchSurrogate
+from bofire.data_models.types import InputTransformSpecs
+
+
+def _get_tanimoto_kernels(kernel: AnyKernel) -> List[TanimotoKernel]:
+    """Collects all Tanimoto kernels in a possibly nested kernel."""
+    if isinstance(kernel, TanimotoKernel):
+        return [kernel]
+    children = list(getattr(kernel, "kernels", []))
+    if getattr(kernel, "base_kernel", None) is not None:
+        children.append(kernel.base_kernel)  # type: ignore
+    return [k for child in children for k in _get_tanimoto_kernels(child)]
+
+
+def validate_packed_fingerprints(kernel: AnyKernel, specs: InputTransformSpecs):
+    """Checks that the Tanimoto kernels expect packed fingerprints exactly if the
+    molecular features are encoded by packed fingerprints.
+
+    Raises:
+        ValueError: if the packed flags of the kernels and the fingerprints differ.
+    """
+    kernel_flags = {k.packed for k in _get_tanimoto_kernels(kernel)}
+    spec_flags = {
+        getattr(spec, "packed", False)
+        for spec in specs.values()
+        if isinstance(spec, (Fingerprints, Fragments))
+    }
+    if len(kernel_flags | spec_flags) > 1:
+        raise ValueError(
+            "The packed flag of the TanimotoKernel has to match the packed flag of the fingerprints."
+        )
 
 
 class TanimotoGPSurrogate(TrainableBotorchSurrogate):
@@ -32,6 +62,7 @@ class TanimotoGPSurrogate(TrainableBotorchSurrogate):
     )
     noise_prior: AnyPrior = Field(default_factory=lambda: BOTORCH_NOISE_PRIOR())
     scaler: ScalerEnum = ScalerEnum.IDENTITY
+    warm_start: bool = False
 
     @classmethod
     def is_output_implemented(cls, my_type: Type[AnyOutput]) -> bool:
@@ -57,3 +88,8 @@ class TanimotoGPSurrogate(TrainableBotorchSurrogate):
                 "TanimotoGPSurrogate can only be used if at least one of fingerprints, fragments, or fingerprintsfragments features are present."
             )
         return v
+
+    @model_validator(mode="after")
+    def validate_packed(self):
+        validate_packed_fingerprints(self.kernel, self.input_preprocessing_specs)
+        return self
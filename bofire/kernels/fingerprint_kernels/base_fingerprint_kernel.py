@@ -19,9 +19,13 @@ def batch_tanimoto_sim(
     """
     Tanimoto between two batched tensors, across last 2 dimensions.
     eps argument ensures numerical stability if all zero tensors are added.
+    Sparse (COO) tensors are supported without batch dimensions, the costs then
+    scale with the number of non-zeros.
     """
     # Tanimoto distance is proportional to (<x, y>) / (||x||^2 + ||y||^2 - <x, y>) where x and y are bit vectors
     assert x1.ndim >= 2 and x2.ndim >= 2
+    if x1.is_sparse or x2.is_sparse:
+        return sparse_tanimoto_sim(x1, x2, eps=eps)
     dot_prod = torch.matmul(x1, torch.transpose(x2, -1, -2))
     # x1_sum = torch.sum(x1**2, dim=-1, keepdims=True)
     # x2_sum = torch.sum(x2**2, dim=-1, keepdims=True)
@@ -32,6 +36,69 @@ def batch_tanimoto_sim(
     )
 
 
+def _squared_norm(x: torch.Tensor) -> torch.Tensor:
+    if x.is_sparse:
+        return torch.sparse.sum(x * x, dim=-1).to_dense()
+    return torch.sum(x**2, dim=-1)
+
+
+def sparse_tanimoto_sim(
+    x1: torch.Tensor, x2: torch.Tensor, eps: float = 1e-6
+) -> torch.Tensor:
+    """
+    Tanimoto between two `n x d` and `m x d` tensors of which at least one is a
+    sparse COO tensor, the result is a dense `n x m` tensor.
+    """
+    if x1.ndim != 2 or x2.ndim != 2:
+        raise ValueError("Sparse tensors are only supported without batch dimensions.")
+    if x1.is_sparse:
+        dot_prod = torch.sparse.mm(x1, x2.t())
+    else:
+        dot_prod = torch.sparse.mm(x2, x1.t()).t()
+    if dot_prod.is_sparse:
+        dot_prod = dot_prod.to_dense()
+    x1_sum = _squared_norm(x1).unsqueeze(-1)
+    x2_sum = _squared_norm(x2).unsqueeze(-2)
+    return (dot_prod + eps) / (eps + x1_sum + x2_sum - dot_prod)
+
+
+def popcount(x: torch.Tensor) -> torch.Tensor:
+    """
+    Number of set bits of every element of an integer tensor holding 32 bit words.
+    """
+    x = x - ((x >> 1) & 0x55555555)
+    x = (x & 0x33333333) + ((x >> 2) & 0x33333333)
+    x = (x + (x >> 4)) & 0x0F0F0F0F
+    return ((x * 0x01010101) >> 24) & 0xFF
+
+
+def batch_packed_tanimoto_sim(
+    x1: torch.Tensor, x2: torch.Tensor, eps: float = 1e-6, max_chunk_size: int = 2**22
+) -> torch.Tensor:
+    """
+    Tanimoto between two batched tensors of fingerprints packed into 32 bit words,
+    across last 2 dimensions. The intersections are computed via popcounts of the
+    bitwise and of the words, in chunks of rows of x1 to bound the memory.
+    """
+    assert x1.ndim >= 2 and x2.ndim >= 2
+    w1, w2 = x1.long(), x2.long()
+    x1_sum = popcount(w1).sum(dim=-1).unsqueeze(-1)
+    x2_sum = popcount(w2).sum(dim=-1).unsqueeze(-1)
+    chunk_size = max(max_chunk_size // max(w2.shape[-2] * w2.shape[-1], 1), 1)
+    dot_prod = torch.cat(
+        [
+            popcount(
+                w1[..., start : start + chunk_size, :].unsqueeze(-2) & w2.unsqueeze(-3)
+            ).sum(dim=-1)
+            for start in range(0, w1.shape[-2], chunk_size)
+        ],
+        dim=-2,
+    )
+    return (
+        (dot_prod + eps) / (eps + x1_sum + torch.transpose(x2_sum, -1, -2) - dot_prod)
+    ).to(x1.dtype)
+
+
 class BitDistance(torch.nn.Module):
     """
     Distance module for bit vector test_kernels.
@@ -50,7 +117,8 @@ class BitDistance(torch.nn.Module):
             x2 (Tensor): Second set of data where b is a batch dimension. Has shape `m x d` or `b x m x d`
             postprocess (bool): Whether to apply a postprocess script
             x1_eq_x2 (bool, optional): Is x1 equal to x2. Defaults to False
-            metric (str): String specifying the similarity metric. One of ['tanimoto']. Defaults to 'tanimoto'
+            metric (str): String specifying the similarity metric. One of ['tanimoto', 'packed_tanimoto'].
+                Defaults to 'tanimoto'
 
         Raises:
             RuntimeError: If tanimoto is not used as the similarity metric.
@@ -59,13 +127,17 @@ class BitDistance(torch.nn.Module):
             Tensor: corresponding to the similarity matrix between `x1` and `x2`
         """
         # Branch for Tanimoto metric
-        if metric == "tanimoto":
-            res = batch_tanimoto_sim(x1, x2)
+        if metric in ["tanimoto", "packed_tanimoto"]:
+            res = (
+                batch_tanimoto_sim(x1, x2)
+                if metric == "tanimoto"
+                else batch_packed_tanimoto_sim(x1, x2)
+            )
             res.clamp_min_(0)  # zero out negative values
             return self._postprocess(res) if postprocess else res
         else:
             raise RuntimeError(
-                "Similarity metric not supported. Available options are 'tanimoto'"
+                "Similarity metric not supported. Available options are 'tanimoto' and 'packed_tanimoto'"
             )
 
 
@@ -120,7 +192,7 @@ class BitKernel(Kernel):
             x1 = x1.transpose(-1, -2).unsqueeze(-1)
             x2 = x2.transpose(-1, -2).unsqueeze(-1)
 
-        x1_eq_x2 = torch.equal(x1, x2)
+        x1_eq_x2 = x1 is x2 if x1.is_sparse or x2.is_sparse else torch.equal(x1, x2)
 
         # torch scripts expect tensors
         postprocess = torch.tensor(postprocess)
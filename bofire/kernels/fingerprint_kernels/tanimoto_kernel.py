@@ -23,6 +23,10 @@ class TanimotoKernel(BitKernel):
         \langle\mathbf{x}, \mathbf{x'}\rangle}
         \end{equation*}
 
+    If `packed` is True, the inputs are expected to be fingerprints packed into 32 bit
+    words as returned by `bofire.utils.cheminformatics.pack_fingerprints`, and the
+    intersections are computed via popcounts on the words.
+
     This kernel does not have an `outputscale` parameter. To add a scaling parameter,
     decorate this kernel with a `gpytorch.test_kernels.ScaleKernel`.
 
@@ -41,9 +45,9 @@ class TanimotoKernel(BitKernel):
     is_stationary = False
     has_lengthscale = False
 
-    def __init__(self, **kwargs):
+    def __init__(self, packed: bool = False, **kwargs):
         super(TanimotoKernel, self).__init__(**kwargs)
-        self.metric = "tanimoto"
+        self.metric = "packed_tanimoto" if packed else "tanimoto"
 
     def forward(self, x1, x2, diag=False, **params):
         if diag:
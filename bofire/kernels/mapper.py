@@ -170,6 +170,7 @@ def map_TanimotoKernel(
         batch_shape=batch_shape,
         ard_num_dims=len(active_dims) if data_model.ard else None,
         active_dims=active_dims,
+        packed=data_model.packed,
     )
 
 
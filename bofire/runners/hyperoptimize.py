@@ -23,6 +23,7 @@ def hyperoptimize(
     training_data: pd.DataFrame,
     folds: int,
     random_state: Optional[int] = None,
+    n_jobs: int = 1,
 ) -> Tuple[AnyTrainableSurrogate, pd.DataFrame]:
     if surrogate_data.hyperconfig is None:
         warnings.warn(
@@ -48,6 +49,7 @@ def hyperoptimize(
         training_data=training_data,
         folds=folds,
         random_state=random_state,
+        n_jobs=n_jobs,
     )
 
     if surrogate_data.hyperconfig.hyperstrategy == "FactorialStrategy":  # type: ignore
@@ -1,6 +1,22 @@
 import copy
+import itertools
+import math
+import queue
+import time
 from abc import abstractmethod
-from typing import Callable, Dict, List, Optional, Tuple, get_args
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+)
 
 import numpy as np
 import pandas as pd
@@ -11,10 +27,12 @@ from botorch.models.gpytorch import GPyTorchModel
 from botorch.optim.initializers import gen_batch_initial_conditions
 from botorch.optim.optimize import (
     optimize_acqf,
-    optimize_acqf_discrete,
     optimize_acqf_list,
     optimize_acqf_mixed,
 )
+from botorch.utils.sampling import draw_sobol_samples
+from gpytorch.models import ExactGP
+from pydantic import PositiveInt
 from torch import Tensor
 
 from bofire.data_models.constraints.api import (
@@ -23,6 +41,7 @@ from bofire.data_models.constraints.api import (
     NChooseKConstraint,
     ProductConstraint,
 )
+from bofire.data_models.domain.api import Inputs
 from bofire.data_models.enum import CategoricalEncodingEnum, CategoricalMethodEnum
 from bofire.data_models.features.api import (
     CategoricalDescriptorInput,
@@ -51,6 +70,36 @@ from bofire.utils.torch_tools import (
 )
 
 
+class _CategoricalCombinations(Sequence[Dict[int, float]]):
+    """Lazy sequence over the fixed value combinations of a strategy.
+
+    Combinations are decoded from their index on access, so that the full
+    cartesian product is only materialized if it is iterated completely.
+    """
+
+    def __init__(self, strategy: "BotorchStrategy"):
+        self.strategy = strategy
+        self._len = strategy.get_number_of_categorical_combinations()
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("combination index out of range")
+        columns, values = self.strategy.get_categorical_combinations_by_index(
+            torch.tensor([index])
+        )
+        return dict(zip(columns, values[0].tolist()))
+
+    def __iter__(self) -> Iterator[Dict[int, float]]:
+        return self.strategy.iter_categorical_combinations()
+
+
 class BotorchStrategy(PredictiveStrategy):
     def __init__(
         self,
@@ -76,14 +125,155 @@ class BotorchStrategy(PredictiveStrategy):
         self.frequency_check = data_model.frequency_check
         self.frequency_hyperopt = data_model.frequency_hyperopt
         self.folds = data_model.folds
+        self.refit_every_n = data_model.refit_every_n
         self.surrogates = None
+        self._num_fitted_experiments = 0
+        self._num_conditionings = 0
+        self._transformed_experiments_cache: Optional[
+            Tuple[InputTransformSpecs, Tensor, np.ndarray]
+        ] = None
+        self._infeasible_cost_samples_cache: Optional[
+            Tuple[InputTransformSpecs, Tensor]
+        ] = None
         self.local_search_config = data_model.local_search_config
         self.maxiter = data_model.maxiter
         self.batch_limit = data_model.batch_limit
+        self.n_jobs = data_model.n_jobs
+        self.combinatorial_chunk_size = data_model.combinatorial_chunk_size
+        self.ask_ahead = data_model.ask_ahead
+        self.batch_method = data_model.batch_method
+        self._ask_ahead_job: Optional[Tuple[int, Optional[pd.DataFrame], Future]] = None
+        self._last_candidate_count = 1
+        self._deadline: Optional[float] = None
+        self._timeout_sec: Optional[float] = None
+        self.screening_top_k = data_model.screening_top_k
+        self.screening_num_samples = data_model.screening_num_samples
         torch.manual_seed(self.seed)
 
     model: Optional[GPyTorchModel] = None
 
+    def ask(
+        self,
+        candidate_count: Optional[PositiveInt] = None,
+        add_pending: bool = False,
+        raise_validation_error: bool = True,
+        time_budget: Optional[float] = None,
+    ) -> pd.DataFrame:
+        """Function to generate new candidates.
+
+        Args:
+            candidate_count (PositiveInt, optional): Number of candidates to be generated. If not provided, the number of candidates is determined automatically. Defaults to None.
+            add_pending (bool, optional): If true the proposed candidates are added to the set of pending experiments. Defaults to False.
+            raise_validation_error (bool, optional): If true an error will be raised if candidates violate constraints,
+                otherwise only a warning will be displayed. Defaults to True.
+            time_budget (float, optional): Wall-clock time in seconds available for the generation
+                of the candidates. If provided, `num_raw_samples`, `num_restarts`, `maxiter` and
+                `batch_limit` are derived from the measured cost of acquisition function evaluations
+                and the best candidates found so far are returned when the deadline is reached.
+                Defaults to None.
+
+        Returns:
+            pd.DataFrame: DataFrame with candidates (proposed experiments)
+        """
+        if time_budget is None:
+            return super().ask(
+                candidate_count=candidate_count,
+                add_pending=add_pending,
+                raise_validation_error=raise_validation_error,
+            )
+        if time_budget <= 0:
+            raise ValueError(f"time_budget has to be positive but got {time_budget}.")
+        settings = (
+            self.num_raw_samples,
+            self.num_restarts,
+            self.maxiter,
+            self.batch_limit,
+        )
+        self._deadline = time.monotonic() + time_budget
+        try:
+            return super().ask(
+                candidate_count=candidate_count,
+                add_pending=add_pending,
+                raise_validation_error=raise_validation_error,
+            )
+        finally:
+            self._deadline, self._timeout_sec = None, None
+            (
+                self.num_raw_samples,
+                self.num_restarts,
+                self.maxiter,
+                self.batch_limit,
+            ) = settings
+
+    def _adapt_optimizer_budget(
+        self,
+        acqfs: List[AcquisitionFunction],
+        candidate_count: int,
+        bounds: Tensor,
+        fixed_features_list: Optional[Sequence[Dict[int, float]]],
+    ) -> None:
+        """Adapts the acqf optimizer settings to the time left until the deadline.
+
+        The cost of an acquisition function evaluation and of its gradient is
+        measured on a batch of quasi-random points. The remaining time, minus a
+        safety margin, is split evenly over the expected number of `optimize_acqf`
+        calls. A quarter of each share is spent on the raw samples and the rest on
+        the gradient based optimization. The settings from the data model act as upper limits.
+
+        Args:
+            acqfs (List[AcquisitionFunction]): The acquisition functions to optimize.
+            candidate_count (int): Number of candidates to generate.
+            bounds (Tensor): The bounds of the optimization problem.
+            fixed_features_list (Sequence[Dict[int, float]], optional): The fixed
+                feature combinations to optimize over.
+        """
+        assert self._deadline is not None
+        num_calls = len(acqfs)
+        q = candidate_count if len(acqfs) == 1 else 1
+        if fixed_features_list and len(acqfs) == 1:
+            num_combinations = len(fixed_features_list)
+            if self.screening_top_k is not None:
+                num_combinations = min(num_combinations, self.screening_top_k)
+            num_calls = math.ceil(num_combinations / self.n_jobs) * candidate_count
+            q = 1
+        if (
+            self.local_search_config is not None
+            and has_local_search_region(self.domain)
+            and candidate_count == 1
+        ):
+            num_calls *= 2
+
+        num_probes = 64
+        X = draw_sobol_samples(bounds=bounds, n=num_probes, q=q)
+        with torch.no_grad():
+            acqfs[0](X)  # warm up the caches of the model
+            start = time.perf_counter()
+            acqfs[0](X)
+            eval_cost = (time.perf_counter() - start) / num_probes
+        X.requires_grad_(True)
+        start = time.perf_counter()
+        # only differentiate w.r.t. X, `backward` would accumulate gradients in
+        # the parameters of the model
+        torch.autograd.grad(acqfs[0](X).sum(), X)
+        grad_cost = (time.perf_counter() - start) / num_probes
+
+        # keep a margin for the overhead of the optimizer and the post-processing
+        time_per_call = 0.8 * max(self._deadline - time.monotonic(), 0.0) / num_calls
+        num_raw_samples = max(int(0.25 * time_per_call / max(eval_cost, 1e-9)), 1)
+        self.num_raw_samples = min(
+            self.num_raw_samples, 2 ** int(math.log2(num_raw_samples))
+        )
+        self.num_restarts = min(self.num_restarts, self.num_raw_samples)
+        self.batch_limit = min(self.batch_limit, self.num_restarts)
+        self.maxiter = min(
+            self.maxiter,
+            max(
+                int(0.75 * time_per_call / max(grad_cost * self.num_restarts, 1e-9)),
+                1,
+            ),
+        )
+        self._timeout_sec = time_per_call
+
     @property
     def input_preprocessing_specs(self) -> InputTransformSpecs:
         return self.surrogate_specs.input_preprocessing_specs  # type: ignore
@@ -127,6 +317,13 @@ class BotorchStrategy(PredictiveStrategy):
         Args:
             transformed (pd.DataFrame): [description]
         """
+        num_experiments = len(experiments)
+        perform_hyperopt = (self.frequency_hyperopt > 0) and (
+            self.num_experiments % self.frequency_hyperopt == 0
+        )
+        if not self._requires_refit(experiments, perform_hyperopt):
+            self._condition_on_observations(experiments)
+            return
         # perform outlier detection
         if self.outlier_detection_specs is not None:
             if (
@@ -135,9 +332,7 @@ class BotorchStrategy(PredictiveStrategy):
             ):
                 experiments = self.outlier_detection_specs.detect(experiments)
         # perform hyperopt
-        if (self.frequency_hyperopt > 0) and (
-            self.num_experiments % self.frequency_hyperopt == 0
-        ):
+        if perform_hyperopt:
             # we have to import here to avoid circular imports
             from bofire.runners.hyperoptimize import hyperoptimize
 
@@ -155,14 +350,153 @@ class BotorchStrategy(PredictiveStrategy):
             ]
 
         # map the surrogate spec, we keep it here as attribute to be able to save/dump
-        # the surrogate
-        self.surrogates = BotorchSurrogates(data_model=self.surrogate_specs)  # type: ignore
+        # the surrogate, already mapped surrogates are reused as long as their specs
+        # are unchanged, so that their last fit can be used for warm starting
+        if self.surrogates is None or perform_hyperopt:
+            self.surrogates = BotorchSurrogates(data_model=self.surrogate_specs)  # type: ignore
+        else:
+            for surrogate in self.surrogates.surrogates:
+                surrogate.decompatibilize()
 
         self.surrogates.fit(experiments)  # type: ignore
         self.model = self.surrogates.compatibilize(  # type: ignore
             inputs=self.domain.inputs,  # type: ignore
             outputs=self.domain.outputs,  # type: ignore
         )
+        self._num_fitted_experiments = num_experiments
+        self._num_conditionings = 0
+
+    def _requires_refit(
+        self, experiments: pd.DataFrame, perform_hyperopt: bool
+    ) -> bool:
+        """Checks if the surrogates have to be refitted or if it is sufficient to
+        condition the already fitted ones on the newly added experiments.
+
+        Args:
+            experiments (pd.DataFrame): The experiments to be fitted.
+            perform_hyperopt (bool): If True, a hyperparameter optimization is
+                scheduled for the current fit.
+
+        Returns:
+            bool: True if a full refit is required.
+        """
+        if (
+            self.surrogates is None
+            or perform_hyperopt
+            or self.outlier_detection_specs is not None
+            or self._num_conditionings >= self.refit_every_n - 1
+        ):
+            return True
+        if not (0 < self._num_fitted_experiments < len(experiments)):
+            return True
+        return not all(
+            surrogate.can_condition_on_observations
+            for surrogate in self.surrogates.surrogates
+        )
+
+    def _condition_on_observations(self, experiments: pd.DataFrame):
+        """Conditions the already fitted surrogates on the experiments that were
+        added since the last fit, without refitting their hyperparameters.
+
+        Args:
+            experiments (pd.DataFrame): The experiments to be fitted.
+        """
+        new_experiments = experiments.iloc[self._num_fitted_experiments :].copy()
+        for surrogate in self.surrogates.surrogates:  # type: ignore
+            surrogate.decompatibilize()
+            surrogate.condition_on_observations(new_experiments)
+        self.model = self.surrogates.compatibilize(  # type: ignore
+            inputs=self.domain.inputs,  # type: ignore
+            outputs=self.domain.outputs,  # type: ignore
+        )
+        self._num_fitted_experiments = len(experiments)
+        self._num_conditionings += 1
+
+    def set_experiments(self, experiments: pd.DataFrame):
+        super().set_experiments(experiments=experiments)
+        # replaced experiments cannot be conditioned into the fitted models
+        self._num_fitted_experiments = 0
+        self._transformed_experiments_cache = None
+        self._cancel_ask_ahead()
+
+    def add_experiments(self, experiments: pd.DataFrame):
+        super().add_experiments(experiments=experiments)
+        self._cancel_ask_ahead()
+
+    def _start_ask_ahead(self) -> None:
+        """Starts the generation of the next candidates in a background thread.
+
+        The candidates are generated on a copy of the strategy, so new data told
+        in the meantime cannot interfere with the speculative work. Every job gets
+        its own single use executor which is shut down right away, so that its
+        thread exits as soon as the job is finished or cancelled.
+        """
+        self._cancel_ask_ahead()
+        strategy = self._detached_copy()
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            self._ask_ahead_job = (
+                self._last_candidate_count,
+                None if self.candidates is None else self.candidates.copy(),
+                executor.submit(
+                    strategy._ask, candidate_count=self._last_candidate_count
+                ),
+            )
+        finally:
+            executor.shutdown(wait=False)
+
+    def _detached_copy(self) -> "BotorchStrategy":
+        """Returns a deep copy of the strategy without the background machinery,
+        which can be modified without affecting the strategy itself."""
+        job, self._ask_ahead_job = self._ask_ahead_job, None
+        try:
+            strategy = copy.deepcopy(self)
+        finally:
+            self._ask_ahead_job = job
+        strategy.ask_ahead = False
+        return strategy
+
+    def _cancel_ask_ahead(self) -> None:
+        """Discards the speculative candidates. Jobs that have not started yet are
+        cancelled. A running job cannot be interrupted, as the botorch optimizers
+        offer no hook for it, it finishes in the background and its result is
+        ignored."""
+        if self._ask_ahead_job is not None:
+            self._ask_ahead_job[2].cancel()
+            self._ask_ahead_job = None
+
+    def _pop_ask_ahead(self, candidate_count: int) -> Optional[pd.DataFrame]:
+        """Returns the speculatively generated candidates if they were generated for
+        the same candidate count and the same pending candidates, else None.
+
+        A still running job is waited for, which takes at most as long as the
+        regular generation, as the job does the same work and started earlier.
+        If the candidates have to be generated within a time budget, an
+        unfinished job is discarded instead, as it does not respect the budget.
+        """
+        if self._ask_ahead_job is None:
+            return None
+        count, candidates, future = self._ask_ahead_job
+        self._ask_ahead_job = None
+        if (
+            count != candidate_count
+            or not (
+                (candidates is None and self.candidates is None)
+                or (
+                    candidates is not None
+                    and self.candidates is not None
+                    and candidates.equals(self.candidates)
+                )
+            )
+            or (self._deadline is not None and not future.done())
+        ):
+            future.cancel()
+            return None
+        try:
+            return future.result()
+        except Exception:
+            # fall back to the regular generation which raises the error again
+            return None
 
     def _predict(self, transformed: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
         # we are using self.model here for this purpose we have to take the transformed
@@ -212,8 +546,8 @@ class BotorchStrategy(PredictiveStrategy):
         num_categorical_features = len(
             self.domain.inputs.get([CategoricalInput, DiscreteInput])
         )
-        num_categorical_combinations = len(
-            self.domain.inputs.get_categorical_combinations()
+        num_categorical_combinations = (
+            self.domain.inputs.get_number_of_categorical_combinations()
         )
         lower, upper = self.domain.inputs.get_bounds(
             specs=self.input_preprocessing_specs
@@ -266,7 +600,9 @@ class BotorchStrategy(PredictiveStrategy):
             fixed_features_list = None
         else:
             fixed_features = None
-            fixed_features_list = self.get_categorical_combinations()
+            # the combinations are decoded on demand, screening only materializes
+            # the selected ones
+            fixed_features_list = _CategoricalCombinations(self)
         return (
             bounds,
             local_bounds,
@@ -312,7 +648,7 @@ class BotorchStrategy(PredictiveStrategy):
         ic_gen_kwargs: Dict,
         nonlinear_constraints: List[Callable[[Tensor], float]],
         fixed_features: Optional[Dict[int, float]],
-        fixed_features_list: Optional[List[Dict[int, float]]],
+        fixed_features_list: Optional[Sequence[Dict[int, float]]],
     ) -> Tuple[Tensor, Tensor]:
         if len(acqfs) > 1:
             candidates, acqf_vals = optimize_acqf_list(
@@ -330,19 +666,28 @@ class BotorchStrategy(PredictiveStrategy):
                 ),
                 nonlinear_inequality_constraints=nonlinear_constraints,  # type: ignore
                 fixed_features=fixed_features,
-                fixed_features_list=fixed_features_list,
+                fixed_features_list=(
+                    list(fixed_features_list) if fixed_features_list else None
+                ),
                 ic_gen_kwargs=ic_gen_kwargs,
                 ic_generator=ic_generator,
                 options=self._get_optimizer_options(),  # type: ignore
             )
         else:
             if fixed_features_list:
-                candidates, acqf_vals = optimize_acqf_mixed(
+                if (
+                    self.screening_top_k is not None
+                    and len(fixed_features_list) > self.screening_top_k
+                ):
+                    fixed_features_list = self._screen_fixed_features_list(
+                        acq_function=acqfs[0],
+                        bounds=bounds,
+                        fixed_features_list=fixed_features_list,
+                    )
+                candidates, acqf_vals = self._optimize_acqf_mixed(
                     acq_function=acqfs[0],
                     bounds=bounds,
                     q=candidate_count,
-                    num_restarts=self.num_restarts,
-                    raw_samples=self.num_raw_samples,
                     equality_constraints=get_linear_constraints(
                         domain=self.domain,
                         constraint=LinearEqualityConstraint,  # type: ignore
@@ -377,10 +722,335 @@ class BotorchStrategy(PredictiveStrategy):
                     return_best_only=True,
                     options=self._get_optimizer_options(),  # type: ignore
                     ic_generator=ic_generator,  # type: ignore
+                    timeout_sec=self._timeout_sec,
                     **ic_gen_kwargs,  # type: ignore
                 )
         return candidates, acqf_vals
 
+    def _ask_greedy_batch(self, candidate_count: int) -> pd.DataFrame:
+        """Generates a batch of candidates one after another.
+
+        After every candidate, the fitted surrogates of a copy of the strategy are
+        conditioned on a fantasized observation at the candidate: its posterior mean
+        for `kriging_believer` or the mean of the observed values for
+        `constant_liar`. The costs per candidate are thus independent of the batch
+        size. If a surrogate cannot be conditioned on new observations, the
+        candidates are added as pending candidates instead. The returned
+        predictions are computed with the surrogates of the strategy itself.
+
+        Args:
+            candidate_count (int): Number of candidates to generate.
+
+        Returns:
+            pd.DataFrame: The generated candidates.
+        """
+        assert self.experiments is not None
+        strategy = self._detached_copy()
+        can_condition = (
+            strategy.surrogates is not None
+            and strategy._num_fitted_experiments > 0
+            and all(
+                surrogate.can_condition_on_observations
+                for surrogate in strategy.surrogates.surrogates
+            )
+        )
+        input_keys = self.domain.inputs.get_keys()
+        output_keys = self.domain.outputs.get_keys()
+        if can_condition and self.batch_method == "constant_liar":
+            lies = self.domain.outputs.preprocess_experiments_all_valid_outputs(
+                self.experiments
+            )[output_keys].mean()
+        candidates = []
+        for _ in range(candidate_count):
+            candidate = strategy._ask(candidate_count=1)
+            candidates.append(candidate)
+            if not can_condition:
+                strategy.add_candidates(candidate[input_keys])
+                continue
+            fantasy = candidate[input_keys].copy()
+            if self.batch_method == "kriging_believer":
+                predictions = strategy.predict(fantasy)
+                for key in output_keys:
+                    fantasy[key] = predictions[f"{key}_pred"].values
+            else:
+                for key in output_keys:
+                    fantasy[key] = lies[key]
+            for key in output_keys:
+                fantasy[f"valid_{key}"] = 1
+            strategy.add_experiments(fantasy)
+            strategy._condition_on_observations(strategy.experiments)  # type: ignore
+        batch = pd.concat(candidates, ignore_index=True)
+        # the predictions of the copy are biased by the fantasized observations
+        predictions = self.predict(batch[input_keys])
+        batch[predictions.columns] = predictions.values
+        return batch
+
+    def _optimize_acqf_combinatorial(
+        self, acq_function: AcquisitionFunction, candidate_count: int
+    ) -> Tensor:
+        """Optimizes the acquisition function over a fully combinatorial search space.
+
+        The combinations are never materialized at once. Each combination is
+        identified by its index in the mixed radix system spanned by the number of
+        options per feature, and the space is walked in chunks of
+        `combinatorial_chunk_size` indices which are encoded on the fly. Already
+        measured combinations are filtered out via their indices. As in
+        `optimize_acqf_discrete`, batches are generated in a sequential greedy
+        fashion without repeating a combination.
+
+        Args:
+            acq_function (AcquisitionFunction): The acquisition function to optimize.
+            candidate_count (int): Number of candidates to generate.
+
+        Returns:
+            Tensor: `candidate_count x d` tensor of encoded candidates.
+        """
+        assert self.experiments is not None
+        # all categorical and discrete features are enumerated, independent of
+        # the categorical methods
+        features = self.domain.inputs.get_categorical_combination_features()
+        encodings = self._get_categorical_combination_encodings(
+            combination_filter=(Input, None)
+        )
+        num_combinations = math.prod(len(values) for _, values in encodings)
+        fixed_basis = self.get_fixed_features()
+        num_columns = sum(len(idx) for idx in self._features2idx.values())
+
+        def encode(indices: Tensor) -> Tensor:
+            columns, values = self._encode_categorical_combinations(
+                indices, fixed_basis=fixed_basis, encodings=encodings
+            )
+            X = torch.zeros(len(indices), num_columns, **tkwargs)
+            X[:, columns] = values
+            return X
+
+        # indices of the already measured combinations, the last feature varies
+        # fastest as in `get_categorical_combinations_by_index`
+        measured = pd.Series(0, index=self.experiments.index, dtype=float)
+        stride = 1
+        for feat in reversed(features):
+            opts = (
+                feat.get_allowed_categories()
+                if isinstance(feat, CategoricalInput)
+                else list(feat.values)  # type: ignore
+            )
+            measured += (
+                self.experiments[feat.key].map({o: i for i, o in enumerate(opts)})
+                * stride
+            )
+            stride *= len(opts)
+        # experiments deviating from a fixed feature do not correspond to any index
+        for feat in self.domain.inputs.get([CategoricalInput, DiscreteInput]):
+            if feat.is_fixed():
+                measured[
+                    self.experiments[feat.key] != feat.fixed_value()[0]  # type: ignore
+                ] = np.nan
+        excluded = set(measured.dropna().astype(np.int64).tolist())
+
+        base_X_pending = acq_function.X_pending
+        candidates = torch.tensor([], **tkwargs)
+        for _ in range(candidate_count):
+            excluded_indices = torch.tensor(sorted(excluded), dtype=torch.long)
+            best_value, best_index = None, None
+            for start in range(0, num_combinations, self.combinatorial_chunk_size):
+                indices = torch.arange(
+                    start, min(start + self.combinatorial_chunk_size, num_combinations)
+                )
+                indices = indices[~torch.isin(indices, excluded_indices)]
+                if len(indices) == 0:
+                    continue
+                with torch.no_grad():
+                    values = acq_function(encode(indices).unsqueeze(-2))
+                idx = torch.argmax(values)
+                if best_value is None or values[idx] > best_value:
+                    best_value, best_index = values[idx], int(indices[idx])
+                # return the best combination found so far at the deadline
+                if self._deadline is not None and time.monotonic() > self._deadline:
+                    break
+            if best_index is None:
+                raise ValueError(
+                    "Not enough unmeasured combinations left to generate the requested number of candidates."
+                )
+            excluded.add(best_index)
+            candidates = torch.cat(
+                [candidates, encode(torch.tensor([best_index]))], dim=-2
+            )
+            acq_function.set_X_pending(
+                torch.cat([base_X_pending, candidates], dim=-2)
+                if base_X_pending is not None
+                else candidates
+            )
+        acq_function.set_X_pending(base_X_pending)
+        return candidates
+
+    def _screen_fixed_features_list(
+        self,
+        acq_function: AcquisitionFunction,
+        bounds: Tensor,
+        fixed_features_list: _CategoricalCombinations,
+    ) -> List[Dict[int, float]]:
+        """Selects the most promising fixed feature combinations.
+
+        Every combination is scored by the maximum of the acquisition function
+        over `screening_num_samples` quasi-random points in `bounds` in which the
+        fixed features are set to the values of the combination. The combinations
+        are encoded by their indices in chunks of at most `combinatorial_chunk_size`
+        points, only the selected ones are decoded to dicts. Constraints are
+        ignored during screening.
+
+        Args:
+            acq_function (AcquisitionFunction): The acquisition function used for
+                scoring.
+            bounds (Tensor): The bounds of the optimization problem.
+            fixed_features_list (_CategoricalCombinations): The fixed feature
+                combinations to screen.
+
+        Returns:
+            List[Dict[int, float]]: The `screening_top_k` best combinations.
+        """
+        assert self.screening_top_k is not None
+        samples = draw_sobol_samples(
+            bounds=bounds, n=self.screening_num_samples, q=1
+        )  # n x 1 x d
+        num_combinations = len(fixed_features_list)
+        chunk_size = max(self.combinatorial_chunk_size // self.screening_num_samples, 1)
+        scores = []
+        for start in range(0, num_combinations, chunk_size):
+            indices = torch.arange(start, min(start + chunk_size, num_combinations))
+            columns, values = self.get_categorical_combinations_by_index(indices)
+            X = samples.unsqueeze(0).repeat(len(indices), 1, 1, 1)
+            X[..., columns] = values[:, None, None, :]
+            with torch.no_grad():
+                scores.append(
+                    acq_function(X.view(-1, 1, X.shape[-1]))
+                    .view(len(indices), -1)
+                    .max(dim=-1)
+                    .values
+                )
+        top_k = torch.topk(torch.cat(scores), k=self.screening_top_k).indices
+        return [fixed_features_list[i] for i in sorted(top_k.tolist())]
+
+    def _optimize_acqf_mixed(
+        self,
+        acq_function: AcquisitionFunction,
+        bounds: Tensor,
+        q: int,
+        fixed_features_list: Sequence[Dict[int, float]],
+        ic_gen_kwargs: Dict,
+        **kwargs,
+    ) -> Tuple[Tensor, Tensor]:
+        """Optimizes the acquisition function over a list of fixed feature
+        combinations.
+
+        For `n_jobs > 1`, the optimizations for the individual combinations are
+        distributed over a thread pool and the best combination is selected based
+        on the acquisition value. As acquisition functions and models are not
+        thread safe, every worker thread evaluates its own deep copy of
+        `acq_function`. The same code path is used when the optimization runs
+        against a deadline, so that every optimization is time limited. As in
+        `optimize_acqf_mixed`, batches with `q > 1` are generated in a sequential
+        greedy fashion.
+
+        Args:
+            acq_function (AcquisitionFunction): The acquisition function to optimize.
+            bounds (Tensor): The bounds of the optimization problem.
+            q (int): Number of candidates to generate.
+            fixed_features_list (Sequence[Dict[int, float]]): The fixed feature
+                combinations to optimize over.
+            ic_gen_kwargs (Dict): Keyword arguments for the initial condition
+                generator.
+            **kwargs: Further keyword arguments passed to `optimize_acqf`.
+
+        Returns:
+            Tuple[Tensor, Tensor]: The candidates and the associated acquisition
+                value.
+        """
+        if (
+            self.n_jobs == 1 or len(fixed_features_list) == 1
+        ) and self._timeout_sec is None:
+            return optimize_acqf_mixed(
+                acq_function=acq_function,
+                bounds=bounds,
+                q=q,
+                num_restarts=self.num_restarts,
+                raw_samples=self.num_raw_samples,
+                fixed_features_list=list(fixed_features_list),
+                ic_gen_kwargs=ic_gen_kwargs,
+                **kwargs,
+            )
+
+        n_workers = min(self.n_jobs, len(fixed_features_list))
+        # every running optimization takes one of the copies and puts it back
+        # afterwards, so that no copy is evaluated by two threads at once
+        copies = [self._copy_acq_function(acq_function) for _ in range(n_workers)]
+        acq_function_copies = queue.Queue()
+        for acq_function_copy in copies:
+            acq_function_copies.put(acq_function_copy)
+
+        def optimize(fixed_features: Dict[int, float]) -> Tuple[Tensor, Tensor]:
+            acq_function_copy = acq_function_copies.get()
+            try:
+                return optimize_acqf(
+                    acq_function=acq_function_copy,
+                    bounds=bounds,
+                    q=1,
+                    num_restarts=self.num_restarts,
+                    raw_samples=self.num_raw_samples,
+                    fixed_features=fixed_features,
+                    return_best_only=True,
+                    timeout_sec=self._timeout_sec,
+                    **kwargs,
+                    **ic_gen_kwargs,
+                )
+            finally:
+                acq_function_copies.put(acq_function_copy)
+
+        base_X_pending = acq_function.X_pending
+        candidates = torch.tensor([], device=bounds.device, dtype=bounds.dtype)
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            for _ in range(q):
+                results = list(executor.map(optimize, fixed_features_list))
+                acq_values = torch.stack([acq_value for _, acq_value in results])
+                best = int(torch.argmax(acq_values))
+                candidates = torch.cat([candidates, results[best][0]], dim=-2)
+                # all workers are idle between the rounds
+                for acq_function_copy in copies:
+                    acq_function_copy.set_X_pending(
+                        torch.cat([base_X_pending, candidates], dim=-2)
+                        if base_X_pending is not None
+                        else candidates
+                    )
+        if q == 1:
+            return candidates, acq_values[best]
+        return candidates, acq_function(candidates)
+
+    @staticmethod
+    def _copy_acq_function(acq_function: AcquisitionFunction) -> AcquisitionFunction:
+        """Deep copies an acquisition function together with its model.
+
+        The prediction caches of exact GPs can hold tensors which are part of an
+        autograd graph and cannot be deep copied. They are therefore left out of
+        the copy, as in `ExactGP.get_fantasy_model`, and rebuilt on its first
+        evaluation.
+
+        Args:
+            acq_function (AcquisitionFunction): The acquisition function to copy.
+
+        Returns:
+            AcquisitionFunction: The independent copy.
+        """
+        gps = [
+            module for module in acq_function.modules() if isinstance(module, ExactGP)
+        ]
+        prediction_strategies = [gp.prediction_strategy for gp in gps]
+        for gp in gps:
+            gp.prediction_strategy = None
+        try:
+            return copy.deepcopy(acq_function)
+        finally:
+            for gp, prediction_strategy in zip(gps, prediction_strategies):
+                gp.prediction_strategy = prediction_strategy
+
     def _ask(self, candidate_count: int) -> pd.DataFrame:
         """[summary]
 
@@ -395,6 +1065,14 @@ class BotorchStrategy(PredictiveStrategy):
         if self.experiments is None:
             raise ValueError("No experiments have been provided yet.")
 
+        self._last_candidate_count = candidate_count
+        candidates = self._pop_ask_ahead(candidate_count)
+        if candidates is not None:
+            return candidates
+
+        if self.batch_method != "joint" and candidate_count > 1:
+            return self._ask_greedy_batch(candidate_count)
+
         acqfs = self._get_acqfs(candidate_count)
 
         # we check here if we have a fully combinatorical search space
@@ -405,36 +1083,8 @@ class BotorchStrategy(PredictiveStrategy):
                 raise NotImplementedError(
                     "Multiple Acqfs are currently not supported for purely combinatorical search spaces."
                 )
-            # generate the choices as pandas dataframe
-            choices = pd.DataFrame.from_dict(
-                [
-                    {e[0]: e[1] for e in combi}  # type: ignore
-                    for combi in self.domain.inputs.get_categorical_combinations()
-                ]
-            )
-            # adding categorical features that are fixed
-            for feat in self.domain.inputs.get_fixed():
-                choices[feat.key] = feat.fixed_value()[0]  # type: ignore
-            # compare the choices with the training data and remove all that are also part
-            # of the training data
-            merged = choices.merge(
-                self.experiments[self.domain.inputs.get_keys()],
-                on=list(choices.columns),
-                how="left",
-                indicator=True,
-            )
-            filtered_choices = merged[merged["_merge"] == "left_only"].copy()
-            filtered_choices.drop(columns=["_merge"], inplace=True)
-
-            # translate the filtered choice to torch
-            t_choices = torch.from_numpy(
-                self.domain.inputs.transform(
-                    filtered_choices, specs=self.input_preprocessing_specs
-                ).values
-            ).to(**tkwargs)
-
-            candidates, _ = optimize_acqf_discrete(
-                acq_function=acqfs[0], q=candidate_count, unique=True, choices=t_choices
+            candidates = self._optimize_acqf_combinatorial(
+                acq_function=acqfs[0], candidate_count=candidate_count
             )
             return self._postprocess_candidates(candidates=candidates)
 
@@ -448,6 +1098,14 @@ class BotorchStrategy(PredictiveStrategy):
             fixed_features_list,
         ) = self._setup_ask()
 
+        if self._deadline is not None:
+            self._adapt_optimizer_budget(
+                acqfs=acqfs,
+                candidate_count=candidate_count,
+                bounds=bounds,
+                fixed_features_list=fixed_features_list,
+            )
+
         # do the global opt
         candidates, global_acqf_val = self._optimize_acqf_continuous(
             candidate_count=candidate_count,
@@ -494,7 +1152,8 @@ class BotorchStrategy(PredictiveStrategy):
             return self._postprocess_candidates(candidates=candidates)
 
     def _tell(self) -> None:
-        pass
+        if self.ask_ahead:
+            self._start_ask_ahead()
 
     @abstractmethod
     def _get_acqfs(self, n: int) -> List[AcquisitionFunction]:
@@ -568,14 +1227,11 @@ class BotorchStrategy(PredictiveStrategy):
                             fixed_features[idx] = lower[j]
         return fixed_features
 
-    def get_categorical_combinations(self) -> List[Dict[int, float]]:
-        """provides all possible combinations of fixed values
-
-        Returns:
-            list_of_fixed_features List[dict]: Each dict contains a combination of fixed values
-        """
-        fixed_basis = self.get_fixed_features()
-
+    def _get_categorical_combination_filter(
+        self,
+    ) -> Optional[Tuple[Union[Type, List[Type]], Optional[Type]]]:
+        """Returns the include and exclude types of the features that are
+        enumerated exhaustively, or None if all methods are FREE."""
         methods = [
             self.descriptor_method,
             self.discrete_method,
@@ -583,63 +1239,168 @@ class BotorchStrategy(PredictiveStrategy):
         ]
 
         if all(m == CategoricalMethodEnum.FREE for m in methods):
-            return [{}]
-        else:
-            include = []
+            return None
+        include = []
+        exclude = None
+
+        if self.discrete_method == CategoricalMethodEnum.EXHAUSTIVE:
+            include.append(DiscreteInput)
+
+        if self.categorical_method == CategoricalMethodEnum.EXHAUSTIVE:
+            include.append(CategoricalInput)
+            exclude = CategoricalDescriptorInput
+
+        if self.descriptor_method == CategoricalMethodEnum.EXHAUSTIVE:
+            include.append(CategoricalDescriptorInput)
             exclude = None
 
-            if self.discrete_method == CategoricalMethodEnum.EXHAUSTIVE:
-                include.append(DiscreteInput)
+        return (include if include else Input), exclude
 
-            if self.categorical_method == CategoricalMethodEnum.EXHAUSTIVE:
-                include.append(CategoricalInput)
-                exclude = CategoricalDescriptorInput
+    def _get_categorical_combination_encodings(
+        self,
+        combination_filter: Optional[
+            Tuple[Union[Type, List[Type]], Optional[Type]]
+        ] = None,
+    ) -> List[Tuple[List[int], Tensor]]:
+        """Returns for every feature spanning the categorical combinations the
+        indices of its encoded columns together with a tensor holding the encoded
+        values of every allowed category/value (one row per option).
 
-            if self.descriptor_method == CategoricalMethodEnum.EXHAUSTIVE:
-                include.append(CategoricalDescriptorInput)
-                exclude = None
+        Args:
+            combination_filter (Tuple, optional): Include and exclude types of the
+                enumerated features. Defaults to the ones given by the categorical
+                methods of the strategy.
+        """
+        if combination_filter is None:
+            combination_filter = self._get_categorical_combination_filter()
+        if combination_filter is None:
+            return []
+        include, exclude = combination_filter
+        features2idx = self._features2idx
+        encodings = []
+        for feature in self.domain.inputs.get_categorical_combination_features(
+            include=include, exclude=exclude  # type: ignore
+        ):
+            options = (
+                feature.get_allowed_categories()
+                if isinstance(feature, CategoricalInput)
+                else list(feature.values)
+            )
+            values = (
+                Inputs(features=[feature])
+                .transform(
+                    pd.DataFrame({feature.key: options}),
+                    {
+                        key: spec
+                        for key, spec in self.input_preprocessing_specs.items()
+                        if key == feature.key
+                    },
+                )
+                .values
+            )
+            encodings.append(
+                (
+                    list(features2idx[feature.key]),
+                    torch.from_numpy(values.astype(np.float64)).to(**tkwargs),
+                )
+            )
+        return encodings
 
-        if not include:
-            include = None
+    def get_number_of_categorical_combinations(self) -> int:
+        """Returns the number of fixed value combinations without enumerating them.
 
-        combos = self.domain.inputs.get_categorical_combinations(
-            include=(include if include else Input),
-            exclude=exclude,  # type: ignore
+        Returns:
+            int: Number of combinations.
+        """
+        return math.prod(
+            len(values) for _, values in self._get_categorical_combination_encodings()
         )
-        # now build up the fixed feature list
-        if len(combos) == 1:
-            return [fixed_basis]
-        else:
-            features2idx = self._features2idx
-            list_of_fixed_features = []
 
-            for combo in combos:
-                fixed_features = copy.deepcopy(fixed_basis)
+    def get_categorical_combinations_by_index(
+        self, indices: Tensor
+    ) -> Tuple[List[int], Tensor]:
+        """Encodes the combinations with the given indices directly into a tensor of
+        fixed values. The indices refer to the order of `iter_categorical_combinations`.
 
-                for pair in combo:
-                    feat, val = pair
-                    feature = self.domain.inputs.get_by_key(feat)
-                    if (
-                        isinstance(feature, CategoricalDescriptorInput)
-                        and self.input_preprocessing_specs[feat]
-                        == CategoricalEncodingEnum.DESCRIPTOR
-                    ):
-                        index = feature.categories.index(val)
+        Args:
+            indices (Tensor): One dimensional tensor of combination indices.
 
-                        for j, idx in enumerate(features2idx[feat]):
-                            fixed_features[idx] = feature.values[index][j]
+        Returns:
+            List[int]: The indices of the fixed columns.
+            Tensor: `len(indices) x len(columns)` tensor of fixed values.
+        """
+        return self._encode_categorical_combinations(
+            indices,
+            fixed_basis=self.get_fixed_features(),
+            encodings=self._get_categorical_combination_encodings(),
+        )
+
+    @staticmethod
+    def _encode_categorical_combinations(
+        indices: Tensor,
+        fixed_basis: Dict[int, float],
+        encodings: List[Tuple[List[int], Tensor]],
+    ) -> Tuple[List[int], Tensor]:
+        """Decodes combination indices in the mixed radix system spanned by the
+        number of options per feature into fixed values.
 
-                    elif isinstance(feature, CategoricalInput):
-                        # it has to be onehot in this case
-                        transformed = feature.to_onehot_encoding(pd.Series([val]))
-                        for j, idx in enumerate(features2idx[feat]):
-                            fixed_features[idx] = transformed.values[0, j]
+        Args:
+            indices (Tensor): One dimensional tensor of combination indices.
+            fixed_basis (Dict[int, float]): Values shared by all combinations.
+            encodings (List[Tuple[List[int], Tensor]]): Columns and encoded options
+                of every enumerated feature.
 
-                    elif isinstance(feature, DiscreteInput):
-                        fixed_features[features2idx[feat][0]] = val
+        Returns:
+            List[int]: The indices of the fixed columns.
+            Tensor: `len(indices) x len(columns)` tensor of fixed values.
+        """
+        columns = list(fixed_basis.keys())
+        values = [
+            torch.tensor(list(fixed_basis.values()), **tkwargs).expand(len(indices), -1)
+        ]
+        indices = indices.clone().long()
+        encoded = []
+        # the last feature varies fastest as in `itertools.product`
+        for feature_columns, feature_values in reversed(encodings):
+            encoded.append(
+                (feature_columns, feature_values[indices % len(feature_values)])
+            )
+            indices = torch.div(indices, len(feature_values), rounding_mode="floor")
+        for feature_columns, feature_values in reversed(encoded):
+            columns += feature_columns
+            values.append(feature_values)
+        return columns, torch.cat(values, dim=-1)
 
-                list_of_fixed_features.append(fixed_features)
-        return list_of_fixed_features
+    def iter_categorical_combinations(self) -> Iterator[Dict[int, float]]:
+        """Lazily iterates over all possible combinations of fixed values.
+
+        Returns:
+            Iterator[Dict[int, float]]: Each dict contains a combination of fixed values.
+        """
+        fixed_basis = self.get_fixed_features()
+        if self._get_categorical_combination_filter() is None:
+            yield {}
+            return
+        encodings = [
+            [dict(zip(columns, row)) for row in values.tolist()]  # type: ignore
+            for columns, values in self._get_categorical_combination_encodings()
+        ]
+        if len(encodings) == 0:
+            yield fixed_basis
+            return
+        for combo in itertools.product(*encodings):
+            fixed_features = dict(fixed_basis)
+            for encoded in combo:
+                fixed_features.update(encoded)
+            yield fixed_features
+
+    def get_categorical_combinations(self) -> List[Dict[int, float]]:
+        """provides all possible combinations of fixed values
+
+        Returns:
+            list_of_fixed_features List[dict]: Each dict contains a combination of fixed values
+        """
+        return list(self.iter_categorical_combinations())
 
     def has_sufficient_experiments(
         self,
@@ -657,23 +1418,59 @@ class BotorchStrategy(PredictiveStrategy):
             return True
         return False
 
+    def _get_transformed_experiments(self) -> Tuple[Tensor, np.ndarray]:
+        """Returns the encoded inputs of all experiments together with a boolean mask
+        indicating the experiments for which all outputs are valid.
+
+        Both are cached on the strategy. Experiments added since the last call are
+        transformed and appended to the cache, the cache is only invalidated when
+        the experiments are replaced or the transform specs change.
+
+        Returns:
+            Tuple[Tensor, np.ndarray]: The encoded inputs and the validity mask.
+        """
+        assert self.experiments is not None
+        specs = self.input_preprocessing_specs
+        if (
+            self._transformed_experiments_cache is None
+            or self._transformed_experiments_cache[0] != specs
+            or len(self._transformed_experiments_cache[1]) > len(self.experiments)
+        ):
+            num_cached = 0
+        else:
+            num_cached = len(self._transformed_experiments_cache[1])
+        if num_cached < len(self.experiments):
+            new_experiments = self.experiments.iloc[num_cached:]
+            X_new = torch.from_numpy(
+                self.domain.inputs.transform(new_experiments, specs).values
+            ).to(**tkwargs)
+            valid_new = np.all(
+                [
+                    (new_experiments[f"valid_{key}"] > 0).values
+                    & new_experiments[key].notna().values
+                    for key in self.domain.outputs.get_keys()
+                ],
+                axis=0,
+            )
+            if num_cached > 0:
+                _, X_cached, valid_cached = self._transformed_experiments_cache  # type: ignore
+                X_new = torch.cat((X_cached, X_new))
+                valid_new = np.concatenate((valid_cached, valid_new))
+            self._transformed_experiments_cache = (dict(specs), X_new, valid_new)
+        _, X, valid = self._transformed_experiments_cache  # type: ignore
+        return X, valid
+
     def get_acqf_input_tensors(self):
         assert self.experiments is not None
-        experiments = self.domain.outputs.preprocess_experiments_all_valid_outputs(
-            self.experiments
-        )
+        X, valid = self._get_transformed_experiments()
 
         # TODO: should this be selectable?
-        clean_experiments = experiments.drop_duplicates(
-            subset=[var.key for var in self.domain.inputs.get(Input)],
-            keep="first",
-            inplace=False,
-        )
-
-        transformed = self.domain.inputs.transform(
-            clean_experiments, self.input_preprocessing_specs
+        duplicated = (
+            self.experiments[[var.key for var in self.domain.inputs.get(Input)]][valid]
+            .duplicated(keep="first")
+            .values
         )
-        X_train = torch.from_numpy(transformed.values).to(**tkwargs)
+        X_train = X[torch.from_numpy(valid)][torch.from_numpy(~duplicated)]
 
         if self.candidates is not None:
             transformed_candidates = self.domain.inputs.transform(
@@ -689,12 +1486,23 @@ class BotorchStrategy(PredictiveStrategy):
         self, objective: Callable[[Tensor, Tensor], Tensor], n_samples=128
     ) -> Tensor:
         X_train, X_pending = self.get_acqf_input_tensors()
-        sampler = RandomStrategy(data_model=RandomStrategyDataModel(domain=self.domain))
-        samples = sampler.ask(candidate_count=n_samples)
-        # we need to transform the samples
-        transformed_samples = torch.from_numpy(
-            self.domain.inputs.transform(samples, self.input_preprocessing_specs).values
-        ).to(**tkwargs)
+        specs = self.input_preprocessing_specs
+        # the random samples are only drawn and transformed once per strategy
+        if (
+            self._infeasible_cost_samples_cache is None
+            or self._infeasible_cost_samples_cache[0] != specs
+            or len(self._infeasible_cost_samples_cache[1]) != n_samples
+        ):
+            sampler = RandomStrategy(
+                data_model=RandomStrategyDataModel(domain=self.domain)
+            )
+            samples = sampler.ask(candidate_count=n_samples)
+            # we need to transform the samples
+            transformed_samples = torch.from_numpy(
+                self.domain.inputs.transform(samples, specs).values
+            ).to(**tkwargs)
+            self._infeasible_cost_samples_cache = (dict(specs), transformed_samples)
+        transformed_samples = self._infeasible_cost_samples_cache[1]
         X = (
             torch.cat((X_train, X_pending, transformed_samples))
             if X_pending is not None
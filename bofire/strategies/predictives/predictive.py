@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import List, Optional, Tuple
+from typing import Callable, Iterator, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -10,6 +10,7 @@ from bofire.data_models.types import InputTransformSpecs
 from bofire.strategies.data_models.candidate import Candidate
 from bofire.strategies.data_models.values import InputValue, OutputValue
 from bofire.strategies.strategy import Strategy
+from bofire.utils.chunks import DataFrameSource, iter_predictions
 from bofire.utils.naming_conventions import (
     get_column_names,
     postprocess_categorical_predictions,
@@ -124,6 +125,33 @@ class PredictiveStrategy(Strategy):
         predictions.index = experiments.index
         return predictions
 
+    def predict_iter(
+        self,
+        experiments: DataFrameSource,
+        chunksize: int = 10000,
+        callback: Optional[Callable[[int, float], None]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Run predictions chunk by chunk, so that memory stays bounded for very large
+        candidate tables. Only input features have to be provided.
+
+        Args:
+            experiments (DataFrameSource): Experimental data for which predictions should be
+                performed, either as dataframe, iterable of dataframes or the path to a
+                Parquet or CSV file.
+            chunksize (int, optional): Number of rows per chunk. Defaults to 10000.
+            callback (Callable[[int, float], None], optional): Called after every chunk with
+                the number of rows predicted so far and the elapsed time in seconds.
+                Defaults to None.
+
+        Yields:
+            Iterator[pd.DataFrame]: Dataframes with the predicted values per chunk.
+        """
+        if self.is_fitted is not True:
+            raise ValueError("Model not yet fitted.")
+        return iter_predictions(
+            self.predict, experiments, chunksize=chunksize, callback=callback
+        )
+
     @abstractmethod
     def _predict(self, experiments: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Abstract method in which the actual prediction is happening. Has to be overwritten."""
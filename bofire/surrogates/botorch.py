@@ -1,10 +1,15 @@
 import base64
 import io
+from typing import Tuple, Union
 
+import gpytorch
 import numpy as np
 import pandas as pd
 import torch
+from botorch.models.gp_regression import SingleTaskGP
 from botorch.models.transforms.input import ChainedInputTransform, FilterFeatures
+from gpytorch.models import ExactGP
+from torch import Tensor
 
 from bofire.data_models.surrogates.api import BotorchSurrogate as DataModel
 from bofire.surrogates.surrogate import Surrogate
@@ -17,16 +22,94 @@ class BotorchSurrogate(Surrogate):
         data_model: DataModel,
         **kwargs,
     ):
+        self.max_batch_rows = data_model.max_batch_rows
         super().__init__(data_model=data_model, **kwargs)
 
     def _predict(self, transformed_X: pd.DataFrame):
         # transform to tensor
         X = torch.from_numpy(transformed_X.values).to(**tkwargs)
-        with torch.no_grad():
-            preds = self.model.posterior(X=X, observation_noise=True).mean.cpu().detach().numpy()  # type: ignore
-            stds = np.sqrt(self.model.posterior(X=X, observation_noise=True).variance.cpu().detach().numpy())  # type: ignore
+        return self._predict_tensor(X)
+
+    def predict_array(
+        self, X: Union[np.ndarray, Tensor], validate: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if not self.is_fitted:
+            raise ValueError("Model is not fitted/available yet.")
+        if validate:
+            self.validate_array(
+                X.detach().cpu().numpy() if isinstance(X, Tensor) else np.asarray(X)
+            )
+        return self._predict_tensor(torch.as_tensor(X).to(**tkwargs))
+
+    def _predict_tensor(self, X: Tensor) -> Tuple[np.ndarray, np.ndarray]:
+        preds, stds = [], []
+        with torch.no_grad(), gpytorch.settings.fast_pred_var(self._use_fast_pred_var):
+            for X_chunk in X.split(self.max_batch_rows):
+                pred, std = self._predict_chunk(X_chunk)
+                preds.append(pred)
+                stds.append(std)
+        return np.concatenate(preds), np.concatenate(stds)
+
+    def _predict_chunk(self, X: Tensor) -> Tuple[np.ndarray, np.ndarray]:
+        """Computes mean and standard deviation from a single posterior evaluation.
+
+        Args:
+            X (Tensor): Chunk of at most `max_batch_rows` transformed inputs.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The predicted means and standard deviations.
+        """
+        posterior = self.model.posterior(X=X, observation_noise=True)  # type: ignore
+        preds = posterior.mean.cpu().detach().numpy()
+        stds = np.sqrt(posterior.variance.cpu().detach().numpy())
         return preds, stds
 
+    @property
+    def _use_fast_pred_var(self) -> bool:
+        """Return True if the predictive variances can be computed via the LOVE
+        cache without loss of accuracy. This is the case for exact GPs whose
+        training set is small enough to be decomposed via Cholesky."""
+        return (
+            isinstance(self.model, ExactGP)
+            and self.model.train_inputs is not None
+            and self.model.train_inputs[0].shape[-2]
+            <= gpytorch.settings.max_cholesky_size.value()
+        )
+
+    @property
+    def can_condition_on_observations(self) -> bool:
+        """Return True if the fitted model can be conditioned on new observations."""
+        return self.is_fitted and isinstance(self.model, SingleTaskGP)
+
+    def condition_on_observations(self, experiments: pd.DataFrame):
+        """Conditions the fitted model on new observations via a rank-k update of its
+        posterior without refitting its hyperparameters.
+
+        Args:
+            experiments (pd.DataFrame): The new observations.
+        """
+        if not self.can_condition_on_observations:
+            raise ValueError(
+                "Only fitted exact GP models can be conditioned on observations."
+            )
+        experiments = self.inputs.validate_experiments(experiments, strict=False)
+        experiments = self.outputs.preprocess_experiments_all_valid_outputs(
+            experiments=experiments, output_feature_keys=self.outputs.get_keys()
+        )
+        if len(experiments) == 0:
+            return
+        transformed_X = self.inputs.transform(
+            experiments[self.inputs.get_keys()], self.input_preprocessing_specs
+        )
+        X = torch.from_numpy(transformed_X.values).to(**tkwargs)
+        Y = torch.from_numpy(experiments[self.outputs.get_keys()].values).to(**tkwargs)
+        with torch.no_grad():
+            # the prediction caches have to be populated before conditioning
+            self.model.posterior(X=X)  # type: ignore
+            self.model = self.model.condition_on_observations(  # type: ignore
+                X=self.model.transform_inputs(X), Y=Y  # type: ignore
+            )
+
     @property
     def is_compatibilized(self) -> bool:
         if self.is_fitted:
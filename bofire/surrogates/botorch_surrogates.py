@@ -1,19 +1,29 @@
+import copy
 import itertools
 from abc import ABC
-from typing import List
+from typing import List, Optional, Tuple, Union
 
 import botorch
+import numpy as np
 import pandas as pd
 import torch
 from botorch.models import ModelList
+from botorch.models.model import Model
 from botorch.models.transforms.input import ChainedInputTransform, FilterFeatures
+from botorch.models.transforms.outcome import Standardize
 
+import bofire.kernels.api as kernels
+import bofire.priors.api as priors
 from bofire.data_models.domain.api import Inputs, Outputs
 from bofire.data_models.surrogates.api import BotorchSurrogates as DataModel
+from bofire.data_models.surrogates.scaler import ScalerEnum
 from bofire.data_models.types import InputTransformSpecs
 from bofire.surrogates.botorch import BotorchSurrogate
 from bofire.surrogates.mapper import map as map_surrogate
+from bofire.surrogates.single_task_gp import SingleTaskGPSurrogate
 from bofire.surrogates.trainable import TrainableSurrogate
+from bofire.surrogates.utils import fit_in_processes
+from bofire.utils.torch_tools import tkwargs
 
 
 class BotorchSurrogates(ABC):
@@ -25,6 +35,8 @@ class BotorchSurrogates(ABC):
         **kwargs,
     ):
         self.surrogates = [map_surrogate(model) for model in data_model.surrogates]  # type: ignore
+        self.n_jobs = data_model.n_jobs
+        self.fuse_models = data_model.fuse_models
 
     @property
     def input_preprocessing_specs(self) -> InputTransformSpecs:
@@ -35,9 +47,71 @@ class BotorchSurrogates(ABC):
         }
 
     def fit(self, experiments: pd.DataFrame):
-        for model in self.surrogates:
-            if isinstance(model, TrainableSurrogate):
+        """Fits all trainable surrogates.
+
+        For `n_jobs > 1`, the surrogates are fitted concurrently in worker
+        processes, see `fit_in_processes`, and the fitted state is copied back into
+        the surrogates, so that `compatibilize` works as usual.
+
+        Args:
+            experiments (pd.DataFrame): The experiments to fit on.
+        """
+        models = [
+            model for model in self.surrogates if isinstance(model, TrainableSurrogate)
+        ]
+        n_jobs = min(self.n_jobs, len(models))
+        if n_jobs <= 1:
+            for model in models:
                 model.fit(experiments)
+            return
+        fitted = fit_in_processes(
+            [(model, "fit", (experiments,)) for model in models], n_jobs=n_jobs
+        )
+        for model, fitted_model in zip(models, fitted):
+            model.__dict__.update(fitted_model.__dict__)
+
+    @property
+    def inputs(self) -> Inputs:
+        features = {}
+        for model in self.surrogates:
+            for feat in model.inputs.get():
+                features.setdefault(feat.key, feat)
+        return Inputs(features=list(features.values()))
+
+    def predict_array(
+        self, X: Union[np.ndarray, torch.Tensor], validate: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Predicts already encoded inputs with all surrogates without the overhead
+        of the dataframe based prediction.
+
+        Args:
+            X (Union[np.ndarray, torch.Tensor]): Encoded inputs with the column layout
+                given by `inputs._get_transform_info(input_preprocessing_specs)`.
+            validate (bool, optional): If True, the inputs are decoded and validated
+                against the input features before predicting. Defaults to False.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The raw predicted means and standard
+                deviations, one column per output in the order of `outputs`.
+        """
+        features2idx, _ = self.inputs._get_transform_info(
+            self.input_preprocessing_specs
+        )
+        X = torch.as_tensor(X).to(**tkwargs)
+        preds, stds = [], []
+        for model in self.surrogates:
+            indices = []
+            for key in model.inputs.get_keys():
+                indices += features2idx[key]
+            if validate:
+                model.validate_array(X[..., indices].cpu().numpy())
+            # compatibilized models filter the features themselves
+            pred, std = model.predict_array(
+                X if model.is_compatibilized else X[..., indices]
+            )
+            preds.append(pred)
+            stds.append(std)
+        return np.hstack(preds), np.hstack(stds)
 
     @property
     def outputs(self) -> Outputs:
@@ -76,7 +150,7 @@ class BotorchSurrogates(ABC):
         if len(used_feature_keys) != len(inputs):
             raise ValueError("Unused features are present.")
 
-    def compatibilize(self, inputs: Inputs, outputs: Outputs) -> ModelList:
+    def compatibilize(self, inputs: Inputs, outputs: Outputs) -> Model:
         # TODO: add sync option
         # check if models are compatible to provided inputs and outputs
         # of the optimization domain
@@ -125,5 +199,112 @@ class BotorchSurrogates(ABC):
         if len(botorch_models) == 1:
             return botorch_models[0]
         if all_gp:
+            if self.fuse_models:
+                fused_model = self._fuse(
+                    [
+                        {model.outputs[0].key: model for model in self.surrogates}[key]
+                        for key in outputs.get_keys()
+                    ]
+                )
+                if fused_model is not None:
+                    return fused_model
             return botorch.models.ModelListGP(*botorch_models)
         return ModelList(*botorch_models)
+
+    @staticmethod
+    def _fuse(
+        surrogates: List[BotorchSurrogate],
+    ) -> Optional[botorch.models.SingleTaskGP]:
+        """Fuses fitted single task GP surrogates into one batched multi-output GP
+        with the hyperparameters of the individual models, so that posterior
+        evaluations use batched linear algebra instead of looping over the models.
+
+        This is only possible if all surrogates share their training inputs, input
+        transforms, kernel and noise prior, which is for example the case when the
+        same surrogate spec is used for all outputs and all outputs are observed for
+        every experiment.
+
+        Args:
+            surrogates (List[BotorchSurrogate]): The fitted surrogates, ordered as
+                the outputs of the fused model.
+
+        Returns:
+            Optional[botorch.models.SingleTaskGP]: The fused model or None if the
+                models cannot be fused.
+        """
+        reference = surrogates[0]
+        if not all(
+            type(surrogate) is SingleTaskGPSurrogate
+            and type(surrogate.model) is botorch.models.SingleTaskGP
+            and surrogate.inputs == reference.inputs
+            and surrogate.kernel == reference.kernel  # type: ignore
+            and surrogate.noise_prior == reference.noise_prior  # type: ignore
+            and surrogate.output_scaler == reference.output_scaler  # type: ignore
+            for surrogate in surrogates
+        ):
+            return None
+        # work on copies in training mode, in which the models hold their
+        # untransformed training inputs
+        models = [copy.deepcopy(surrogate.model).train() for surrogate in surrogates]  # type: ignore
+        train_X = models[0].train_inputs[0]
+        if not all(torch.equal(model.train_inputs[0], train_X) for model in models):
+            return None
+        if models[0].input_transform is not None and not all(  # type: ignore
+            model.input_transform.equals(models[0].input_transform)  # type: ignore
+            for model in models
+        ):
+            return None
+        outcome_transform = None
+        if reference.output_scaler == ScalerEnum.STANDARDIZE:  # type: ignore
+            # the training targets of the models are already standardized, the
+            # standardizations are combined into one transform for all outputs
+            outcome_transform = Standardize(m=len(models))
+            for name in ["means", "stdvs", "_stdvs_sq"]:
+                setattr(
+                    outcome_transform,
+                    name,
+                    torch.cat(
+                        [getattr(model.outcome_transform, name) for model in models],
+                        dim=-1,
+                    ),
+                )
+            outcome_transform._is_trained = torch.tensor(True)
+            for model in models:
+                model.outcome_transform = None
+        fused_model = botorch.models.SingleTaskGP(
+            train_X=train_X,
+            train_Y=torch.stack([model.train_targets for model in models], dim=-1),
+            covar_module=kernels.map(
+                reference.kernel,  # type: ignore
+                batch_shape=torch.Size([len(models)]),
+                active_dims=list(range(train_X.shape[-1])),
+                ard_num_dims=1,  # this keyword is ingored
+            ),
+            # newer botorch versions standardize by default, the combined
+            # standardization is attached after loading the hyperparameters
+            outcome_transform=None,
+            input_transform=models[0].input_transform,
+        )
+        fused_model.likelihood.noise_covar.noise_prior = priors.map(
+            reference.noise_prior  # type: ignore
+        )
+        # stack the hyperparameters of the individual models along the batch
+        # dimension, everything else has to agree between the models
+        state_dicts = [model.state_dict() for model in models]
+        state_dict = {}
+        for key, value in fused_model.state_dict().items():
+            if not all(key in model_state_dict for model_state_dict in state_dicts):
+                return None
+            values = [model_state_dict[key] for model_state_dict in state_dicts]
+            if value.shape == values[0].shape:
+                if not all(torch.equal(v, values[0]) for v in values):
+                    return None
+                state_dict[key] = values[0]
+            elif value.numel() == len(models) * values[0].numel():
+                state_dict[key] = torch.stack(values).reshape(value.shape)
+            else:
+                return None
+        fused_model.load_state_dict(state_dict)
+        if outcome_transform is not None:
+            fused_model.outcome_transform = outcome_transform
+        return fused_model.eval()
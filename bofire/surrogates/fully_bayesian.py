@@ -1,11 +1,14 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import torch
 from botorch import fit_fully_bayesian_model_nuts
-from botorch.models.fully_bayesian import SaasFullyBayesianSingleTaskGP
+from botorch.models.fully_bayesian import SaasFullyBayesianSingleTaskGP, matern52_kernel
 from botorch.models.transforms.outcome import Standardize
+from botorch.models.utils.gpytorch_modules import MIN_INFERRED_NOISE_LEVEL
+from torch import Tensor
+from torch.distributions import Gamma, HalfCauchy, MultivariateNormal, Normal
 
 from bofire.data_models.enum import OutputFilteringEnum
 from bofire.data_models.surrogates.api import SaasSingleTaskGPSurrogate as DataModel
@@ -16,15 +19,109 @@ from bofire.surrogates.utils import get_scaler
 from bofire.utils.torch_tools import tkwargs
 
 
+def fit_saas_model_map(
+    model: SaasFullyBayesianSingleTaskGP, num_restarts: int = 8, maxiter: int = 200
+) -> None:
+    """Fits the hyperparameters of a SAAS GP by maximum a posteriori estimation.
+
+    The log joint density of the SAAS model is maximized with respect to the log
+    transformed hyperparameters, starting from `num_restarts` random points which
+    are optimized together in one batch. The estimates of all restarts are loaded
+    into the model in place of MCMC samples, so that its posterior is a mixture
+    over the restarts.
+
+    Args:
+        model (SaasFullyBayesianSingleTaskGP): The model to fit.
+        num_restarts (int, optional): Number of restarts. Defaults to 8.
+        maxiter (int, optional): Maximum number of L-BFGS iterations. Defaults to 200.
+    """
+    model.train()
+    X = model.pyro_model.train_X
+    Y = model.pyro_model.train_Y.squeeze(-1)
+    tkwargs_ = {"dtype": X.dtype, "device": X.device}
+    # unconstrained (log) parameters, initialized as `init_to_uniform` in pyro
+    log_tausq, log_outputscale, log_noise, mean = (
+        torch.empty(num_restarts, **tkwargs_).uniform_(-2, 2).requires_grad_()
+        for _ in range(4)
+    )
+    log_inv_length_sq = (
+        torch.empty(num_restarts, X.shape[-1], **tkwargs_)
+        .uniform_(-2, 2)
+        .requires_grad_()
+    )
+    parameters = [log_tausq, log_inv_length_sq, log_outputscale, log_noise, mean]
+
+    def get_log_joint() -> Tensor:
+        tausq, inv_length_sq = log_tausq.exp(), log_inv_length_sq.exp()
+        outputscale, noise = log_outputscale.exp(), log_noise.exp()
+        # priors of the SAAS model, including the log jacobians of the transforms
+        log_joint = (
+            HalfCauchy(torch.tensor(0.1, **tkwargs_)).log_prob(tausq)
+            + log_tausq
+            + (
+                HalfCauchy(torch.tensor(1.0, **tkwargs_)).log_prob(inv_length_sq)
+                + log_inv_length_sq
+            ).sum(dim=-1)
+            + Gamma(
+                torch.tensor(2.0, **tkwargs_), torch.tensor(0.15, **tkwargs_)
+            ).log_prob(outputscale)
+            + log_outputscale
+            + Gamma(
+                torch.tensor(0.9, **tkwargs_), torch.tensor(10.0, **tkwargs_)
+            ).log_prob(noise)
+            + log_noise
+            + Normal(
+                torch.tensor(0.0, **tkwargs_), torch.tensor(1.0, **tkwargs_)
+            ).log_prob(mean)
+        )
+        lengthscale = (tausq.unsqueeze(-1) * inv_length_sq).rsqrt()
+        K = outputscale.view(-1, 1, 1) * matern52_kernel(
+            X=X, lengthscale=lengthscale.unsqueeze(-2)
+        ) + (MIN_INFERRED_NOISE_LEVEL + noise).view(-1, 1, 1) * torch.eye(
+            X.shape[0], **tkwargs_
+        )
+        return log_joint + MultivariateNormal(
+            loc=mean.unsqueeze(-1).expand(num_restarts, X.shape[0]),
+            covariance_matrix=K,
+        ).log_prob(Y)
+
+    optimizer = torch.optim.LBFGS(
+        parameters, lr=1.0, max_iter=maxiter, line_search_fn="strong_wolfe"
+    )
+
+    def closure() -> Tensor:
+        optimizer.zero_grad()
+        # the restarts are independent, hence their losses can be summed up
+        loss = -get_log_joint().sum()
+        loss.backward()
+        return loss
+
+    optimizer.step(closure)  # type: ignore
+    with torch.no_grad():
+        model.load_mcmc_samples(
+            {
+                "mean": mean.detach(),
+                "outputscale": log_outputscale.exp(),
+                "noise": log_noise.exp(),
+                "lengthscale": (
+                    log_tausq.exp().unsqueeze(-1) * log_inv_length_sq.exp()
+                ).rsqrt(),
+            }
+        )
+    model.eval()
+
+
 class SaasSingleTaskGPSurrogate(BotorchSurrogate, TrainableSurrogate):
     def __init__(
         self,
         data_model: DataModel,
         **kwargs,
     ):
+        self.fit_method = data_model.fit_method
         self.warmup_steps = data_model.warmup_steps
         self.num_samples = data_model.num_samples
         self.thinning = data_model.thinning
+        self.num_restarts = data_model.num_restarts
         self.scaler = data_model.scaler
         self.output_scaler = data_model.output_scaler
         super().__init__(data_model=data_model, **kwargs)
@@ -51,20 +148,19 @@ class SaasSingleTaskGPSurrogate(BotorchSurrogate, TrainableSurrogate):
             ),
             input_transform=scaler,
         )
-        fit_fully_bayesian_model_nuts(
-            self.model,
-            warmup_steps=self.warmup_steps,
-            num_samples=self.num_samples,
-            thinning=self.thinning,
-            disable_progbar=disable_progbar,
-        )
-
-    def _predict(self, transformed_X: pd.DataFrame):
-        # transform to tensor
-        X = torch.from_numpy(transformed_X.values).to(**tkwargs)
-        with torch.no_grad():
-            posterior = self.model.posterior(X=X, observation_noise=True)  # type: ignore
+        if self.fit_method == "map":
+            fit_saas_model_map(self.model, num_restarts=self.num_restarts)
+        else:
+            fit_fully_bayesian_model_nuts(
+                self.model,
+                warmup_steps=self.warmup_steps,
+                num_samples=self.num_samples,
+                thinning=self.thinning,
+                disable_progbar=disable_progbar,
+            )
 
+    def _predict_chunk(self, X: Tensor) -> Tuple[np.ndarray, np.ndarray]:
+        posterior = self.model.posterior(X=X, observation_noise=True)  # type: ignore
         preds = posterior.mixture_mean.detach().numpy()
         stds = np.sqrt(posterior.mixture_variance.detach().numpy())
         return preds, stds
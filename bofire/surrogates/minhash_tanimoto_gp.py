@@ -0,0 +1,302 @@
+import base64
+import io
+import math
+from typing import Iterator, Optional, Tuple
+
+import pandas as pd
+import torch
+import torch.nn.functional as F
+from botorch.models.model import Model
+from botorch.models.transforms.outcome import OutcomeTransform, Standardize
+from botorch.posteriors.gpytorch import GPyTorchPosterior
+from gpytorch.distributions import MultivariateNormal
+from gpytorch.priors import Prior
+from linear_operator.utils.cholesky import psd_safe_cholesky
+from torch import Tensor
+
+import bofire.priors.api as priors
+from bofire.data_models.enum import OutputFilteringEnum
+from bofire.data_models.surrogates.api import MinHashTanimotoGPSurrogate as DataModel
+from bofire.data_models.surrogates.scaler import ScalerEnum
+from bofire.surrogates.botorch import BotorchSurrogate
+from bofire.surrogates.trainable import TrainableSurrogate
+from bofire.utils.torch_tools import sparse_frame_to_tensor, tkwargs
+
+
+class _MinHashTanimotoGP(Model):
+    """Bayesian linear model on a b-bit MinHash embedding of fingerprints.
+
+    Each of the `n_hashes` hash functions draws a random permutation of the bits
+    and maps a fingerprint to the first of its non-zero bits under this permutation.
+    Two fingerprints collide with a probability equal to the Tanimoto similarity of
+    their sets of non-zero bits. The collisions are reduced to `hash_bits` bits and
+    one hot encoded, the centered and scaled encoding is the embedding `phi`, whose
+    inner products are unbiased estimates of the Tanimoto similarity.
+
+    The model `f(x) = c + sqrt(s) * phi(x)^T w` with `w ~ N(0, I)` is a low-rank GP
+    with kernel `s * phi(x)^T phi(x')`. All quantities needed for fitting and
+    prediction are computed from the `D x D` Gram matrix of the embedding, with
+    `D = n_hashes * 2**hash_bits`, which can be accumulated in a single pass over
+    the training data.
+    """
+
+    def __init__(
+        self,
+        n_features: int,
+        n_hashes: int,
+        hash_bits: int,
+        outputscale_prior: Prior,
+        noise_prior: Prior,
+        random_state: Optional[int] = None,
+        outcome_transform: Optional[OutcomeTransform] = None,
+    ):
+        """Constructs the model.
+
+        Args:
+            n_features (int): Number of bits of the fingerprints.
+            n_hashes (int): Number of hash functions.
+            hash_bits (int): Number of bits kept from each hash value.
+            outputscale_prior (Prior): Prior on the outputscale `s`.
+            noise_prior (Prior): Prior on the noise variance.
+            random_state (int, optional): Seed for drawing the hash functions.
+                Defaults to None.
+            outcome_transform (OutcomeTransform, optional): Transform applied to
+                the training outputs. Defaults to None.
+        """
+        super().__init__()
+        generator = torch.Generator()
+        if random_state is not None:
+            generator.manual_seed(random_state)
+        else:
+            generator.seed()
+        self.n_hashes = n_hashes
+        self.n_buckets = 2**hash_bits
+        # position of every bit in the random permutation of each hash function
+        self.register_buffer(
+            "ranks",
+            torch.argsort(torch.rand(n_hashes, n_features, generator=generator)).to(
+                torch.int32
+            ),
+        )
+        # bucket of every position, the last position marks empty fingerprints
+        self.register_buffer(
+            "buckets",
+            torch.randint(
+                self.n_buckets, (n_hashes, n_features + 1), generator=generator
+            ),
+        )
+        self.outputscale_prior = outputscale_prior
+        self.noise_prior = noise_prior
+        self.raw_outputscale = torch.nn.Parameter(torch.zeros(1, **tkwargs))
+        self.raw_noise = torch.nn.Parameter(torch.zeros(1, **tkwargs))
+        self.mean_constant = torch.nn.Parameter(torch.zeros(1, **tkwargs))
+        if outcome_transform is not None:
+            self.outcome_transform = outcome_transform
+
+    @property
+    def outputscale(self) -> Tensor:
+        return F.softplus(self.raw_outputscale)
+
+    @property
+    def noise(self) -> Tensor:
+        # same lower bound as the default noise constraint of botorch GPs
+        return 1e-4 + F.softplus(self.raw_noise)
+
+    @property
+    def num_outputs(self) -> int:
+        r"""The number of outputs of the model."""
+        return 1
+
+    def embed(self, X: Tensor) -> Tensor:
+        """Computes the MinHash embedding of fingerprints.
+
+        Args:
+            X (Tensor): Dense or sparse COO `n x d` tensor of fingerprints. Only the
+                positions of the positive entries are taken into account.
+
+        Returns:
+            Tensor: `n x D` embedding, empty fingerprints are mapped to zero.
+        """
+        if X.is_sparse:
+            X = X.coalesce()
+            rows, cols = X.indices()[:, X.values() > 0]
+        else:
+            rows, cols = torch.nonzero(X > 0, as_tuple=True)
+        n_features = self.ranks.shape[-1]
+        min_ranks = torch.full(
+            (self.n_hashes, X.shape[0]), n_features, dtype=torch.int32
+        ).scatter_reduce(
+            1,
+            rows.expand(self.n_hashes, -1),
+            self.ranks[:, cols],
+            reduce="amin",
+        )
+        buckets = torch.gather(self.buckets, 1, min_ranks.long()).T
+        embedding = (
+            F.one_hot(buckets, self.n_buckets).to(**tkwargs) - 1 / self.n_buckets
+        ) / math.sqrt(self.n_hashes * (1 - 1 / self.n_buckets))
+        embedding[min_ranks.T == n_features] = 0.0
+        return embedding.reshape(X.shape[0], -1)
+
+    def fit(self, X_chunks: Iterator[Tensor], Y: Tensor, maxiter: int = 100):
+        """Fits the model by maximizing the marginal log likelihood.
+
+        The sufficient statistics are accumulated chunk by chunk, afterwards every
+        likelihood evaluation only involves `D x D` matrices.
+
+        Args:
+            X_chunks (Iterator[Tensor]): Consecutive chunks of the training inputs.
+            Y (Tensor): `n x 1` training outputs.
+            maxiter (int, optional): Maximal number of L-BFGS iterations.
+                Defaults to 100.
+        """
+        if hasattr(self, "outcome_transform"):
+            self.outcome_transform.train()
+            Y, _ = self.outcome_transform(Y)
+            self.outcome_transform.eval()
+        y = Y.squeeze(-1)
+        dim = self.n_hashes * self.n_buckets
+        gram = torch.zeros(dim, dim, **tkwargs)
+        phi_y = torch.zeros(dim, **tkwargs)
+        phi_one = torch.zeros(dim, **tkwargs)
+        start = 0
+        for X in X_chunks:
+            embedding = self.embed(X)
+            y_chunk = y[start : start + X.shape[0]]
+            start += X.shape[0]
+            gram += embedding.T @ embedding
+            phi_y += embedding.T @ y_chunk
+            phi_one += embedding.sum(dim=0)
+        n = y.shape[0]
+        yy, y_sum = y @ y, y.sum()
+        eye = torch.eye(dim, **tkwargs)
+
+        def decompose() -> Tuple[Tensor, Tensor, Tensor]:
+            chol = psd_safe_cholesky(gram + self.noise / self.outputscale * eye)
+            phi_r = phi_y - self.mean_constant * phi_one
+            rr = yy - 2 * self.mean_constant * y_sum + n * self.mean_constant**2
+            return chol, phi_r, rr
+
+        def closure() -> Tensor:
+            optimizer.zero_grad()
+            chol, phi_r, rr = decompose()
+            a = torch.linalg.solve_triangular(chol, phi_r.unsqueeze(-1), upper=False)
+            inv_quad = (rr - a.square().sum()) / self.noise
+            logdet = (
+                n * self.noise.log()
+                + 2 * chol.diagonal().log().sum()
+                - dim * (self.noise / self.outputscale).log()
+            )
+            mll = -0.5 * (inv_quad + logdet + n * math.log(2 * math.pi))
+            mll = mll + self.outputscale_prior.log_prob(self.outputscale)
+            mll = mll + self.noise_prior.log_prob(self.noise)
+            loss = -mll.sum() / n
+            loss.backward()
+            return loss
+
+        optimizer = torch.optim.LBFGS(
+            self.parameters(), max_iter=maxiter, line_search_fn="strong_wolfe"
+        )
+        optimizer.step(closure)
+        with torch.no_grad():
+            chol, phi_r, _ = decompose()
+            self.register_buffer("chol", chol)
+            self.register_buffer(
+                "coefficients", torch.cholesky_solve(phi_r.unsqueeze(-1), chol)
+            )
+        self.eval()
+
+    def posterior(
+        self,
+        X: Tensor,
+        output_indices=None,
+        observation_noise=False,
+        posterior_transform=None,
+        **kwargs,
+    ) -> GPyTorchPosterior:
+        X = self.transform_inputs(X)
+        embedding = self.embed(X.reshape(-1, X.shape[-1])).reshape(*X.shape[:-1], -1)
+        mean = self.mean_constant + (embedding @ self.coefficients).squeeze(-1)
+        root = torch.linalg.solve_triangular(
+            self.chol, embedding.transpose(-1, -2), upper=False
+        )
+        covar = self.noise * root.transpose(-1, -2) @ root
+        if observation_noise is not False:
+            covar = covar + self.noise * torch.eye(X.shape[-2], **tkwargs)
+        posterior = GPyTorchPosterior(MultivariateNormal(mean, covar))
+        if hasattr(self, "outcome_transform"):
+            posterior = self.outcome_transform.untransform_posterior(posterior)
+        if posterior_transform is not None:
+            return posterior_transform(posterior)
+        return posterior
+
+
+class MinHashTanimotoGPSurrogate(BotorchSurrogate, TrainableSurrogate):
+    """Scalable approximation of a Tanimoto GP via a MinHash embedding.
+
+    In contrast to the exact `TanimotoGPSurrogate`, the training cost grows linearly
+    in the number of experiments, which makes it applicable to datasets of tens of
+    thousands of molecules.
+    """
+
+    def __init__(
+        self,
+        data_model: DataModel,
+        **kwargs,
+    ):
+        self.n_hashes = data_model.n_hashes
+        self.hash_bits = data_model.hash_bits
+        self.random_state = data_model.random_state
+        self.outputscale_prior = data_model.outputscale_prior
+        self.noise_prior = data_model.noise_prior
+        self.maxiter = data_model.maxiter
+        self.output_scaler = data_model.output_scaler
+        super().__init__(data_model=data_model, **kwargs)
+
+    _output_filtering: OutputFilteringEnum = OutputFilteringEnum.ALL
+    model: Optional[_MinHashTanimotoGP] = None
+
+    def _fit(self, X: pd.DataFrame, Y: pd.DataFrame):
+        """Fit the MinHash Tanimoto GP.
+
+        Args:
+            X (pd.DataFrame): Dataframe with X values.
+            Y (pd.DataFrame): Dataframe with Y values.
+        """
+        transformed_X = self.inputs.transform(X, self.input_preprocessing_specs)
+        tY = torch.from_numpy(Y.values).to(**tkwargs)
+
+        self.model = _MinHashTanimotoGP(
+            n_features=transformed_X.shape[1],
+            n_hashes=self.n_hashes,
+            hash_bits=self.hash_bits,
+            outputscale_prior=priors.map(self.outputscale_prior),
+            noise_prior=priors.map(self.noise_prior),
+            random_state=self.random_state,
+            outcome_transform=(
+                Standardize(m=tY.shape[-1])
+                if self.output_scaler == ScalerEnum.STANDARDIZE
+                else None
+            ),
+        )
+        self.model.fit(
+            X_chunks=(
+                self._frame_to_tensor(transformed_X.iloc[i : i + self.max_batch_rows])
+                for i in range(0, len(transformed_X), self.max_batch_rows)
+            ),
+            Y=tY,
+            maxiter=self.maxiter,
+        )
+
+    @staticmethod
+    def _frame_to_tensor(df: pd.DataFrame) -> Tensor:
+        """Converts transformed inputs to a tensor, sparse columns are kept sparse."""
+        if all(isinstance(dtype, pd.SparseDtype) for dtype in df.dtypes):
+            return sparse_frame_to_tensor(df)
+        return torch.from_numpy(df.to_numpy(dtype=float)).to(**tkwargs)
+
+    def _dumps(self) -> str:
+        """Dumps the model to a string via pickle as this is not directly json serializable."""
+        buffer = io.BytesIO()
+        torch.save(self.model, buffer)
+        return base64.b64encode(buffer.getvalue()).decode()
@@ -4,10 +4,8 @@ from typing import Dict, Optional
 import botorch
 import pandas as pd
 import torch
-from botorch.fit import fit_gpytorch_mll
 from botorch.models.transforms.input import ChainedInputTransform, OneHotToNumeric
 from botorch.models.transforms.outcome import Standardize
-from gpytorch.mlls import ExactMarginalLogLikelihood
 
 import bofire.kernels.api as kernels
 import bofire.priors.api as priors
@@ -17,6 +15,7 @@ from bofire.data_models.surrogates.scaler import ScalerEnum
 from bofire.surrogates.botorch import BotorchSurrogate
 from bofire.surrogates.trainable import TrainableSurrogate
 from bofire.surrogates.utils import (
+    fit_gp_model,
     get_categorical_feature_keys,
     get_continuous_feature_keys,
     get_scaler,
@@ -35,6 +34,7 @@ class MixedSingleTaskGPSurrogate(BotorchSurrogate, TrainableSurrogate):
         self.noise_prior = data_model.noise_prior
         self.scaler = data_model.scaler
         self.output_scaler = data_model.output_scaler
+        self.warm_start = data_model.warm_start
         super().__init__(data_model=data_model, **kwargs)
 
     model: Optional[botorch.models.MixedSingleTaskGP] = None
@@ -43,7 +43,12 @@ class MixedSingleTaskGPSurrogate(BotorchSurrogate, TrainableSurrogate):
     # non_numerical_features: Optional[List] = None
     training_specs: Dict = {}
 
-    def _fit(self, X: pd.DataFrame, Y: pd.DataFrame):
+    def _fit(
+        self,
+        X: pd.DataFrame,
+        Y: pd.DataFrame,
+        warm_start_model: Optional[botorch.models.MixedSingleTaskGP] = None,
+    ):
         scaler = get_scaler(self.inputs, self.input_preprocessing_specs, self.scaler, X)
         transformed_X = self.inputs.transform(X, self.input_preprocessing_specs)
 
@@ -99,5 +104,8 @@ class MixedSingleTaskGPSurrogate(BotorchSurrogate, TrainableSurrogate):
         )
         self.model.likelihood.noise_covar.noise_prior = priors.map(self.noise_prior)  # type: ignore
 
-        mll = ExactMarginalLogLikelihood(self.model.likelihood, self.model)
-        fit_gpytorch_mll(mll, options=self.training_specs)
+        fit_gp_model(
+            self.model,  # type: ignore
+            training_specs=self.training_specs,
+            warm_start_model=warm_start_model,
+        )
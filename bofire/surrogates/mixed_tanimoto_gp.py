@@ -3,7 +3,6 @@ from typing import Callable, Dict, List, Optional
 
 import pandas as pd
 import torch
-from botorch.fit import fit_gpytorch_mll
 from botorch.models.gp_regression import SingleTaskGP
 from botorch.models.kernels.categorical import CategoricalKernel
 from botorch.models.transforms.input import (
@@ -19,7 +18,6 @@ from gpytorch.kernels.matern_kernel import MaternKernel
 from gpytorch.kernels.scale_kernel import ScaleKernel
 from gpytorch.likelihoods.gaussian_likelihood import GaussianLikelihood
 from gpytorch.likelihoods.likelihood import Likelihood
-from gpytorch.mlls import ExactMarginalLogLikelihood
 from gpytorch.priors import GammaPrior
 from torch import Tensor
 
@@ -34,6 +32,7 @@ from bofire.data_models.surrogates.api import MixedTanimotoGPSurrogate as DataMo
 from bofire.surrogates.botorch import BotorchSurrogate
 from bofire.surrogates.trainable import TrainableSurrogate
 from bofire.surrogates.utils import (
+    fit_gp_model,
     get_categorical_feature_keys,
     get_continuous_feature_keys,
     get_molecular_feature_keys,
@@ -235,13 +234,19 @@ class MixedTanimotoGPSurrogate(BotorchSurrogate, TrainableSurrogate):
         self.molecular_kernel = data_model.molecular_kernel
         self.scaler = data_model.scaler
         self.noise_prior = data_model.noise_prior
+        self.warm_start = data_model.warm_start
         super().__init__(data_model=data_model, **kwargs)
 
     model: Optional[MixedTanimotoGP] = None
     _output_filtering: OutputFilteringEnum = OutputFilteringEnum.ALL
     training_specs: Dict = {}
 
-    def _fit(self, X: pd.DataFrame, Y: pd.DataFrame):
+    def _fit(
+        self,
+        X: pd.DataFrame,
+        Y: pd.DataFrame,
+        warm_start_model: Optional[MixedTanimotoGP] = None,
+    ):
         molecular_feature_keys = get_molecular_feature_keys(
             self.input_preprocessing_specs
         )
@@ -319,5 +324,9 @@ class MixedTanimotoGPSurrogate(BotorchSurrogate, TrainableSurrogate):
 
         self.model.likelihood.noise_covar.noise_prior = priors.map(self.noise_prior)  # type: ignore
 
-        mll = ExactMarginalLogLikelihood(self.model.likelihood, self.model)
-        fit_gpytorch_mll(mll, options=self.training_specs, max_attempts=10)
+        fit_gp_model(
+            self.model,  # type: ignore
+            training_specs=self.training_specs,
+            max_attempts=10,
+            warm_start_model=warm_start_model,
+        )
@@ -1,5 +1,6 @@
+import math
 from abc import abstractmethod
-from typing import Literal, Optional, Sequence
+from typing import Literal, Optional, Sequence, Tuple, Type, Union
 
 import numpy as np
 import pandas as pd
@@ -91,24 +92,157 @@ class MLP(nn.Module):
         return self.layers(x)
 
 
+_ACTIVATIONS = {"relu": nn.ReLU, "logistic": nn.Sigmoid, "tanh": nn.Tanh}
+
+
+class BatchedMLP(nn.Module):
+    """Ensemble of MLPs with identical architecture.
+
+    The weights of the members are stacked along a leading ensemble dimension, so
+    that all members are trained and evaluated in a single pass.
+    """
+
+    def __init__(
+        self,
+        n_estimators: int,
+        input_size: int,
+        output_size: int = 1,
+        hidden_layer_sizes: Sequence = (100,),
+        dropout: float = 0.0,
+        activation: Literal["relu", "logistic", "tanh"] = "relu",
+        final_activation: Literal["softmax", "identity"] = "identity",
+    ):
+        super().__init__()
+        if activation not in _ACTIVATIONS:
+            raise ValueError(f"Activation {activation} not known.")
+        if final_activation == "softmax":
+            self.final_activation = nn.Softmax(dim=-1)
+        elif final_activation == "identity":
+            self.final_activation = nn.Identity()
+        else:
+            raise ValueError(
+                f"Currently only serving classification and regression problems; {final_activation} is not known."
+            )
+        self.activation = _ACTIVATIONS[activation]()
+        self.dropout = nn.Dropout(dropout) if dropout > 0.0 else nn.Identity()
+        sizes = [input_size, *hidden_layer_sizes, output_size]
+        self.weights = nn.ParameterList()
+        self.biases = nn.ParameterList()
+        # same initialization as `nn.Linear`
+        for fan_in, fan_out in zip(sizes[:-1], sizes[1:]):
+            bound = 1 / math.sqrt(fan_in)
+            self.weights.append(
+                nn.Parameter(
+                    torch.empty(n_estimators, fan_in, fan_out, **tkwargs).uniform_(
+                        -bound, bound
+                    )
+                )
+            )
+            self.biases.append(
+                nn.Parameter(
+                    torch.empty(n_estimators, 1, fan_out, **tkwargs).uniform_(
+                        -bound, bound
+                    )
+                )
+            )
+
+    @classmethod
+    def from_mlps(cls, mlps: Sequence[MLP]) -> "BatchedMLP":
+        """Stacks the weights of individual MLPs with identical architecture.
+
+        Args:
+            mlps (Sequence[MLP]): The MLPs.
+
+        Returns:
+            BatchedMLP: The batched ensemble.
+        """
+        layers = list(mlps[0].layers)
+        linears = [layer for layer in layers if isinstance(layer, nn.Linear)]
+        dropouts = [layer for layer in layers if isinstance(layer, nn.Dropout)]
+        batched = cls(
+            n_estimators=len(mlps),
+            input_size=linears[0].in_features,
+            output_size=linears[-1].out_features,
+            hidden_layer_sizes=[linear.out_features for linear in linears[:-1]],
+            dropout=dropouts[0].p if len(dropouts) > 0 else 0.0,
+            activation={value: key for key, value in _ACTIVATIONS.items()}[
+                type(layers[1])  # type: ignore
+            ],
+            final_activation=(
+                "softmax" if isinstance(layers[-1], nn.Softmax) else "identity"
+            ),
+        )
+        with torch.no_grad():
+            for i, (weight, bias) in enumerate(zip(batched.weights, batched.biases)):
+                member_linears = [
+                    [layer for layer in mlp.layers if isinstance(layer, nn.Linear)][i]
+                    for mlp in mlps
+                ]
+                weight.copy_(
+                    torch.stack([linear.weight.T for linear in member_linears])
+                )
+                bias.copy_(
+                    torch.stack([linear.bias.unsqueeze(0) for linear in member_linears])
+                )
+        return batched
+
+    @property
+    def n_estimators(self) -> int:
+        return self.weights[0].shape[0]
+
+    @property
+    def output_size(self) -> int:
+        return self.weights[-1].shape[-1]
+
+    def forward_members(self, X: Tensor) -> Tensor:
+        """Evaluates every member on its own inputs.
+
+        Args:
+            X (Tensor): A `batch_shape x s x n x d`-dim input tensor, in which the
+                `s` dimension is broadcastable to the size of the ensemble.
+
+        Returns:
+            Tensor: A `batch_shape x s x n x m`-dim output tensor.
+        """
+        for i, (weight, bias) in enumerate(zip(self.weights, self.biases)):
+            X = X @ weight + bias
+            if i < len(self.weights) - 1:
+                X = self.dropout(self.activation(X))
+        return self.final_activation(X)
+
+    def forward(self, X: Tensor) -> Tensor:
+        """Evaluates all members on the same inputs.
+
+        Args:
+            X (Tensor): A `batch_shape x n x d`-dim input tensor.
+
+        Returns:
+            Tensor: A `batch_shape x s x n x m`-dim output tensor.
+        """
+        return self.forward_members(X.unsqueeze(-3))
+
+
 class _MLPEnsemble(EnsembleModel):
     def __init__(
-        self, mlps: Sequence[MLP], output_scaler: Optional[OutcomeTransform] = None
+        self,
+        mlps: Union[Sequence[MLP], BatchedMLP],
+        output_scaler: Optional[OutcomeTransform] = None,
     ):
         super().__init__()
-        if len(mlps) == 0:
-            raise ValueError("List of mlps is empty.")
-        num_in_features = mlps[0].layers[0].in_features
-        num_out_features = mlps[0].layers[-2].out_features
-        for mlp in mlps:
-            assert mlp.layers[0].in_features == num_in_features
-            assert mlp.layers[-2].out_features == num_out_features
-        self.mlps = mlps
+        if not isinstance(mlps, BatchedMLP):
+            if len(mlps) == 0:
+                raise ValueError("List of mlps is empty.")
+            num_in_features = mlps[0].layers[0].in_features
+            num_out_features = mlps[0].layers[-2].out_features
+            for mlp in mlps:
+                assert mlp.layers[0].in_features == num_in_features
+                assert mlp.layers[-2].out_features == num_out_features
+            mlps = BatchedMLP.from_mlps(mlps)
+        self.mlp = mlps
         if output_scaler is not None:
             self.outcome_transform = output_scaler
-        # put all models in eval mode
-        for mlp in self.mlps:
-            mlp.eval()
+        # put the model in eval mode
+        self.mlp.eval()
 
     def forward(self, X: Tensor):
         r"""Compute the model output at X.
@@ -120,12 +254,12 @@ class _MLPEnsemble(EnsembleModel):
             A `batch_shape x s x n x m`-dimensional output tensor where
             `s` is the size of the ensemble.
         """
-        return torch.stack([mlp(X) for mlp in self.mlps], dim=-3)
+        return self.mlp(X)
 
     @property
     def num_outputs(self) -> int:
         r"""The number of outputs of the model."""
-        return self.mlps[0].layers[-2].out_features  # type: ignore
+        return self.mlp.output_size
 
 
 def fit_mlp(
@@ -185,6 +319,118 @@ def fit_mlp(
             current_loss += loss.item()
 
 
+def _get_member_losses(
+    loss_function: nn.Module, outputs: Tensor, targets: Tensor
+) -> Tensor:
+    """Computes the mean loss of every ensemble member.
+
+    Args:
+        loss_function (nn.Module): Loss function with `reduction="none"`.
+        outputs (Tensor): A `s x n x m`-dim tensor of predictions.
+        targets (Tensor): A `s x n x m`-dim tensor of targets, or a `s x n`-dim
+            tensor of class labels for the cross entropy loss.
+
+    Returns:
+        Tensor: A `s`-dim tensor of losses.
+    """
+    if isinstance(loss_function, nn.CrossEntropyLoss):
+        losses = loss_function(outputs.flatten(0, 1), targets.flatten())
+        return losses.reshape(targets.shape).mean(dim=-1)
+    return loss_function(outputs, targets).mean(dim=(-2, -1))
+
+
+def fit_batched_mlp(
+    mlp: BatchedMLP,
+    X: Tensor,
+    y: Tensor,
+    sample_indices: Tensor,
+    batch_size: int = 10,
+    n_epoches: int = 200,
+    lr: float = 1e-4,
+    shuffle: bool = True,
+    weight_decay: float = 0.0,
+    loss_function: Type[nn.Module] = nn.L1Loss,
+    validation_data: Optional[Tuple[Tensor, Tensor]] = None,
+    early_stopping_patience: Optional[int] = None,
+):
+    """Fits all members of a batched MLP ensemble at once.
+
+    Every member is trained on its own rows of `X`, given by `sample_indices`,
+    with the same minibatch schedule as `fit_mlp`. The loss is summed over the
+    members, so that the gradients of the members are independent.
+
+    Args:
+        mlp (BatchedMLP): The ensemble that should be fitted.
+        X (Tensor): A `n x d`-dim tensor of inputs.
+        y (Tensor): A `n x m`-dim tensor of targets.
+        sample_indices (Tensor): A `s x k`-dim tensor holding the rows of `X` on
+            which every member is trained.
+        batch_size (int, optional): Batch size. Defaults to 10.
+        n_epoches (int, optional): Number of training epoches. Defaults to 200.
+        lr (float, optional): Initial learning rate. Defaults to 1e-4.
+        shuffle (bool, optional): Whereas the batches should be shuffled. Defaults to True.
+        weight_decay (float, optional): Weight decay (L2 regularization). Defaults to 0.0 (no regularization).
+        loss_function (Type[nn.Module], optional): Loss function specified by the problem type. Defaults to L1 loss.
+        validation_data (Tuple[Tensor, Tensor], optional): Inputs and targets used for early stopping.
+            Defaults to None.
+        early_stopping_patience (int, optional): Number of epoches without improvement of the validation loss
+            after which the training is stopped. The weights of every member are reset to the ones with the
+            lowest validation loss. Defaults to None (no early stopping).
+    """
+    loss_function = loss_function(reduction="none")  # type: ignore
+    if isinstance(loss_function, nn.CrossEntropyLoss):
+        y = y.flatten().long()
+    else:
+        y = y.reshape((y.shape[0], -1))
+    early_stopping = validation_data is not None and early_stopping_patience is not None
+    if early_stopping:
+        X_val, y_val = validation_data  # type: ignore
+        if isinstance(loss_function, nn.CrossEntropyLoss):
+            y_val = y_val.flatten().long()
+        else:
+            y_val = y_val.reshape((y_val.shape[0], -1))
+        y_val = y_val.expand(mlp.n_estimators, *y_val.shape)
+        best_losses = torch.full((mlp.n_estimators,), math.inf, **tkwargs)
+        best_parameters = [p.detach().clone() for p in mlp.parameters()]
+        epoches_without_improvement = torch.zeros(mlp.n_estimators, dtype=torch.long)
+    mlp.train()
+    optimizer = torch.optim.Adam(mlp.parameters(), lr=lr, weight_decay=weight_decay)
+    for _ in range(n_epoches):
+        indices = (
+            sample_indices.gather(
+                1, torch.argsort(torch.rand(sample_indices.shape), dim=1)
+            )
+            if shuffle
+            else sample_indices
+        )
+        for start in range(0, indices.shape[1], batch_size):
+            batch = indices[:, start : start + batch_size]
+            optimizer.zero_grad()
+            outputs = mlp.forward_members(X[batch])
+            loss = _get_member_losses(loss_function, outputs, y[batch]).sum()
+            loss.backward()
+            optimizer.step()
+        if early_stopping:
+            mlp.eval()
+            with torch.no_grad():
+                losses = _get_member_losses(loss_function, mlp(X_val), y_val)
+                improved = losses < best_losses
+                for best, parameter in zip(best_parameters, mlp.parameters()):
+                    best[improved] = parameter[improved]
+            mlp.train()
+            best_losses = torch.where(improved, losses, best_losses)
+            epoches_without_improvement = torch.where(
+                improved, 0, epoches_without_improvement + 1
+            )
+            if (epoches_without_improvement >= early_stopping_patience).all():
+                break
+    if early_stopping:
+        with torch.no_grad():
+            for best, parameter in zip(best_parameters, mlp.parameters()):
+                parameter.copy_(best)
+    mlp.eval()
+
+
 class MLPEnsemble(BotorchSurrogate, TrainableSurrogate):
     def __init__(self, data_model: DataModel, **kwargs):
         self.n_estimators = data_model.n_estimators
@@ -197,6 +443,8 @@ class MLPEnsemble(BotorchSurrogate, TrainableSurrogate):
         self.weight_decay = data_model.weight_decay
         self.subsample_fraction = data_model.subsample_fraction
         self.shuffle = data_model.shuffle
+        self.early_stopping_patience = data_model.early_stopping_patience
+        self.validation_fraction = data_model.validation_fraction
         self.scaler = data_model.scaler
         self.output_scaler = data_model.output_scaler
         super().__init__(data_model, **kwargs)
@@ -208,6 +456,70 @@ class MLPEnsemble(BotorchSurrogate, TrainableSurrogate):
     def _fit(self, X: pd.DataFrame, Y: pd.DataFrame):
         pass
 
+    def _fit_ensemble(
+        self,
+        X: Tensor,
+        y: Tensor,
+        output_size: int,
+        final_activation: Literal["softmax", "identity"],
+        loss_function: Type[nn.Module],
+    ) -> BatchedMLP:
+        """Trains all members of the ensemble at once, every member on its own
+        bootstrap sample of the training data.
+
+        Args:
+            X (Tensor): The transformed inputs.
+            y (Tensor): The transformed targets.
+            output_size (int): Number of outputs of the members.
+            final_activation (Literal["softmax", "identity"]): Final activation of
+                the members.
+            loss_function (Type[nn.Module]): The loss function.
+
+        Returns:
+            BatchedMLP: The trained ensemble.
+        """
+        train_idx = np.arange(X.shape[0])
+        validation_data = None
+        if self.early_stopping_patience is not None and X.shape[0] > 1:
+            # hold out a validation split shared by all members
+            permutation = np.random.permutation(X.shape[0])
+            n_validation = min(
+                max(round(self.validation_fraction * X.shape[0]), 1), X.shape[0] - 1
+            )
+            validation_idx = permutation[:n_validation]
+            train_idx = permutation[n_validation:]
+            validation_data = (X[validation_idx], y[validation_idx])
+        subsample_size = max(round(self.subsample_fraction * len(train_idx)), 1)
+        sample_indices = torch.from_numpy(
+            np.random.choice(
+                train_idx, replace=True, size=(self.n_estimators, subsample_size)
+            )
+        )
+        mlp = BatchedMLP(
+            n_estimators=self.n_estimators,
+            input_size=X.shape[1],
+            output_size=output_size,
+            hidden_layer_sizes=self.hidden_layer_sizes,
+            activation=self.activation,  # type: ignore
+            dropout=self.dropout,
+            final_activation=final_activation,
+        )
+        fit_batched_mlp(
+            mlp=mlp,
+            X=X,
+            y=y,
+            sample_indices=sample_indices,
+            batch_size=self.batch_size,
+            n_epoches=self.n_epochs,
+            lr=self.lr,
+            shuffle=self.shuffle,
+            weight_decay=self.weight_decay,
+            loss_function=loss_function,
+            validation_data=validation_data,
+            early_stopping_patience=self.early_stopping_patience,
+        )
+        return mlp
+
 
 class RegressionMLPEnsemble(MLPEnsemble):
     def __init__(self, data_model: DataModelRegression, **kwargs):
@@ -223,38 +535,16 @@ class RegressionMLPEnsemble(MLPEnsemble):
         else:
             output_scaler = None
 
-        mlps = []
-        subsample_size = round(self.subsample_fraction * X.shape[0])
-        for _ in range(self.n_estimators):
-            # resample X and Y
-            sample_idx = np.random.choice(X.shape[0], replace=True, size=subsample_size)
-            tX = torch.from_numpy(transformed_X.values[sample_idx]).to(**tkwargs)
-            ty = torch.from_numpy(Y.values[sample_idx]).to(**tkwargs)
-
-            dataset = MLPDataset(
-                X=scaler.transform(tX) if scaler is not None else tX,
-                y=output_scaler(ty)[0] if output_scaler is not None else ty,
-            )
-            mlp = MLP(
-                input_size=transformed_X.shape[1],
-                output_size=1,
-                hidden_layer_sizes=self.hidden_layer_sizes,
-                activation=self.activation,  # type: ignore
-                dropout=self.dropout,
-                final_activation="identity",
-            )
-            fit_mlp(
-                mlp=mlp,
-                dataset=dataset,
-                batch_size=self.batch_size,
-                n_epoches=self.n_epochs,
-                lr=self.lr,
-                shuffle=self.shuffle,
-                weight_decay=self.weight_decay,
-                loss_function=nn.L1Loss,
-            )
-            mlps.append(mlp)
-        self.model = _MLPEnsemble(mlps, output_scaler=output_scaler)
+        tX = torch.from_numpy(transformed_X.values).to(**tkwargs)
+        ty = torch.from_numpy(Y.values).to(**tkwargs)
+        mlp = self._fit_ensemble(
+            X=scaler.transform(tX) if scaler is not None else tX,
+            y=output_scaler(ty)[0] if output_scaler is not None else ty,
+            output_size=1,
+            final_activation="identity",
+            loss_function=nn.L1Loss,
+        )
+        self.model = _MLPEnsemble(mlp, output_scaler=output_scaler)
         if scaler is not None:
             self.model.input_transform = scaler
 
@@ -275,39 +565,15 @@ class ClassificationMLPEnsemble(MLPEnsemble):
             {col: Y[col].map(label_mapping) for col in Y.columns}
         )
 
-        mlps = []
-        subsample_size = round(self.subsample_fraction * X.shape[0])
-        for _ in range(self.n_estimators):
-            # resample X and Y
-            sample_idx = np.random.choice(X.shape[0], replace=True, size=subsample_size)
-            tX = torch.from_numpy(transformed_X.values[sample_idx]).to(**tkwargs)
-            ty = torch.from_numpy(Y.values[sample_idx]).to(**tkwargs)
-
-            dataset = MLPDataset(
-                X=scaler.transform(tX) if scaler is not None else tX,
-                y=ty,
-            )
-            mlp = MLP(
-                input_size=transformed_X.shape[1],
-                output_size=len(
-                    label_mapping
-                ),  # Set outputs based on number of categories
-                hidden_layer_sizes=self.hidden_layer_sizes,
-                activation=self.activation,  # type: ignore
-                dropout=self.dropout,
-                final_activation="softmax",
-            )
-            fit_mlp(
-                mlp=mlp,
-                dataset=dataset,
-                batch_size=self.batch_size,
-                n_epoches=self.n_epochs,
-                lr=self.lr,
-                shuffle=self.shuffle,
-                weight_decay=self.weight_decay,
-                loss_function=nn.CrossEntropyLoss,  # type: ignore
-            )
-            mlps.append(mlp)
-        self.model = _MLPEnsemble(mlps=mlps)
+        tX = torch.from_numpy(transformed_X.values).to(**tkwargs)
+        ty = torch.from_numpy(Y.values).to(**tkwargs)
+        mlp = self._fit_ensemble(
+            X=scaler.transform(tX) if scaler is not None else tX,
+            y=ty,
+            output_size=len(label_mapping),  # Set outputs based on number of categories
+            final_activation="softmax",
+            loss_function=nn.CrossEntropyLoss,
+        )
+        self.model = _MLPEnsemble(mlps=mlp)
         if scaler is not None:
             self.model.input_transform = scaler
@@ -1,13 +1,12 @@
 import warnings
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import botorch
 import numpy as np
 import pandas as pd
 import torch
-from botorch.fit import fit_gpytorch_mll
 from botorch.models.transforms.outcome import Standardize
-from gpytorch.mlls import ExactMarginalLogLikelihood
+from torch import Tensor
 
 import bofire.kernels.api as kernels
 import bofire.priors.api as priors
@@ -20,7 +19,7 @@ from bofire.data_models.surrogates.api import MultiTaskGPSurrogate as DataModel
 from bofire.data_models.surrogates.scaler import ScalerEnum
 from bofire.surrogates.botorch import BotorchSurrogate
 from bofire.surrogates.trainable import TrainableSurrogate
-from bofire.surrogates.utils import get_scaler
+from bofire.surrogates.utils import fit_gp_model, get_scaler
 from bofire.utils.torch_tools import tkwargs
 
 
@@ -36,6 +35,7 @@ class MultiTaskGPSurrogate(BotorchSurrogate, TrainableSurrogate):
         self.output_scaler = data_model.output_scaler
         self.noise_prior = data_model.noise_prior
         self.task_prior = data_model.task_prior
+        self.warm_start = data_model.warm_start
         if isinstance(self.task_prior, LKJPrior):
             # set the number of tasks in the prior
             self.task_prior.n_tasks = self.n_tasks
@@ -48,7 +48,12 @@ class MultiTaskGPSurrogate(BotorchSurrogate, TrainableSurrogate):
     _output_filtering: OutputFilteringEnum = OutputFilteringEnum.ALL
     training_specs: Dict = {}
 
-    def _fit(self, X: pd.DataFrame, Y: pd.DataFrame):
+    def _fit(
+        self,
+        X: pd.DataFrame,
+        Y: pd.DataFrame,
+        warm_start_model: Optional[botorch.models.MultiTaskGP] = None,
+    ):
         scaler = get_scaler(self.inputs, self.input_preprocessing_specs, self.scaler, X)
         transformed_X = self.inputs.transform(X, self.input_preprocessing_specs)
 
@@ -89,17 +94,19 @@ class MultiTaskGPSurrogate(BotorchSurrogate, TrainableSurrogate):
             # )
         self.model.likelihood.noise_covar.noise_prior = priors.map(self.noise_prior)  # type: ignore
 
-        mll = ExactMarginalLogLikelihood(self.model.likelihood, self.model)
-        fit_gpytorch_mll(mll, options=self.training_specs, max_attempts=10)
+        fit_gp_model(
+            self.model,  # type: ignore
+            training_specs=self.training_specs,
+            max_attempts=10,
+            warm_start_model=warm_start_model,
+        )
 
-    def _predict(self, transformed_X: pd.DataFrame):
-        # transform to tensor
-        X = torch.from_numpy(transformed_X.values).to(**tkwargs)
-        with torch.no_grad():
-            preds = self.model.posterior(X=X, observation_noise=False).mean.cpu().detach().numpy()  # type: ignore
-            vars = self.model.posterior(X=X, observation_noise=False).variance.cpu().detach().numpy()  # type: ignore
-            # add the observation noise to the stds
-            stds = np.sqrt(vars + self.model.likelihood.noise.cpu().detach().numpy())  # type: ignore
+    def _predict_chunk(self, X: Tensor) -> Tuple[np.ndarray, np.ndarray]:
+        posterior = self.model.posterior(X=X, observation_noise=False)  # type: ignore
+        preds = posterior.mean.cpu().detach().numpy()
+        vars = posterior.variance.cpu().detach().numpy()
+        # add the observation noise to the stds
+        stds = np.sqrt(vars + self.model.likelihood.noise.cpu().detach().numpy())  # type: ignore
         return preds, stds
 
 
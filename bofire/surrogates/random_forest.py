@@ -1,6 +1,6 @@
 import base64
 import io
-from typing import Optional
+from typing import Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -53,27 +53,60 @@ class _RandomForest(EnsembleModel):
             A `batch_shape x s x n x m`-dimensional output tensor where
             `s` is the size of the ensemble.
         """
-        # we transform to numpy
-        nX = X.detach().numpy()
-        # we need to check if we have a batch dimension
-        if len(X.shape) != 3:
-            # now we add the q-batch dimension
-            nX = nX.reshape((1, *nX.shape))
-        # loop over batches
-        preds = []
-        for i in range(nX.shape[0]):
-            batch_preds = []
-            # loop over estimators
-            for estimator in self._rf.estimators_:
-                batch_preds.append(
-                    estimator.predict(nX[i]).reshape((nX[i].shape[0], 1))
-                )
-            preds.append(np.stack(batch_preds, axis=0))
-        preds = np.stack(preds, axis=0)
-        if X.ndim == 3:  # we have a batch dim
-            return torch.from_numpy(preds).to(**tkwargs)
-        else:  # we have no batch dim
-            return torch.from_numpy(preds).to(**tkwargs).squeeze(dim=0)
+        roots, left, right, feature, threshold, value, max_depth = self._flat_trees
+        # sklearn evaluates the trees in single precision
+        nX = X.detach().cpu().numpy().astype(np.float32).reshape(-1, X.shape[-1])
+        columns = np.arange(nX.shape[0])
+        # walk all trees for all points at once, leaves point to themselves
+        nodes = np.repeat(roots[:, None], nX.shape[0], axis=1)
+        for _ in range(max_depth):
+            nodes = np.where(
+                nX[columns, feature[nodes]] <= threshold[nodes],
+                left[nodes],
+                right[nodes],
+            )
+        # n_estimators x (batch_shape x n) -> batch_shape x n_estimators x n x 1
+        preds = torch.from_numpy(value[nodes]).to(**tkwargs)
+        preds = preds.reshape(len(roots), *X.shape[:-1]).unsqueeze(-1)
+        return preds.movedim(0, -3)
+
+    @property
+    def _flat_trees(
+        self,
+    ) -> Tuple[
+        np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, int
+    ]:
+        """The nodes of all trees flattened into contiguous arrays.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, int]:
+                The root nodes of the trees, the left and right children of all
+                nodes, the features and thresholds of the splits, the node values
+                and the maximal depth of the trees. The children of leaves are the
+                leaves themselves.
+        """
+        if getattr(self, "_flat_trees_cache", None) is None:
+            trees = [estimator.tree_ for estimator in self._rf.estimators_]
+            roots = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+            left, right, feature, threshold, value = [], [], [], [], []
+            for tree, root in zip(trees, roots):
+                nodes = np.arange(tree.node_count)
+                is_leaf = tree.children_left == -1
+                left.append(np.where(is_leaf, nodes, tree.children_left) + root)
+                right.append(np.where(is_leaf, nodes, tree.children_right) + root)
+                feature.append(np.where(is_leaf, 0, tree.feature))
+                threshold.append(tree.threshold)
+                value.append(tree.value[:, 0, 0])
+            self._flat_trees_cache = (
+                roots,
+                np.concatenate(left),
+                np.concatenate(right),
+                np.concatenate(feature),
+                np.concatenate(threshold),
+                np.concatenate(value),
+                max(tree.max_depth for tree in trees),
+            )
+        return self._flat_trees_cache
 
     @property
     def num_outputs(self) -> int:
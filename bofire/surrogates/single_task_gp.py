@@ -3,9 +3,7 @@ from typing import Dict, Optional
 import botorch
 import pandas as pd
 import torch
-from botorch.fit import fit_gpytorch_mll
 from botorch.models.transforms.outcome import Standardize
-from gpytorch.mlls import ExactMarginalLogLikelihood
 
 import bofire.kernels.api as kernels
 import bofire.priors.api as priors
@@ -16,7 +14,7 @@ from bofire.data_models.surrogates.api import SingleTaskGPSurrogate as DataModel
 from bofire.data_models.surrogates.scaler import ScalerEnum
 from bofire.surrogates.botorch import BotorchSurrogate
 from bofire.surrogates.trainable import TrainableSurrogate
-from bofire.surrogates.utils import get_scaler
+from bofire.surrogates.utils import fit_gp_model, get_scaler
 from bofire.utils.torch_tools import tkwargs
 
 
@@ -30,13 +28,21 @@ class SingleTaskGPSurrogate(BotorchSurrogate, TrainableSurrogate):
         self.scaler = data_model.scaler
         self.output_scaler = data_model.output_scaler
         self.noise_prior = data_model.noise_prior
+        # linear and polynomial surrogates are mapped here as well, they are never
+        # warm started
+        self.warm_start = getattr(data_model, "warm_start", False)
         super().__init__(data_model=data_model, **kwargs)
 
     model: Optional[botorch.models.SingleTaskGP] = None
     _output_filtering: OutputFilteringEnum = OutputFilteringEnum.ALL
     training_specs: Dict = {}
 
-    def _fit(self, X: pd.DataFrame, Y: pd.DataFrame):
+    def _fit(
+        self,
+        X: pd.DataFrame,
+        Y: pd.DataFrame,
+        warm_start_model: Optional[botorch.models.SingleTaskGP] = None,
+    ):
         scaler = get_scaler(self.inputs, self.input_preprocessing_specs, self.scaler, X)
         transformed_X = self.inputs.transform(X, self.input_preprocessing_specs)
 
@@ -63,5 +69,9 @@ class SingleTaskGPSurrogate(BotorchSurrogate, TrainableSurrogate):
 
         self.model.likelihood.noise_covar.noise_prior = priors.map(self.noise_prior)  # type: ignore
 
-        mll = ExactMarginalLogLikelihood(self.model.likelihood, self.model)
-        fit_gpytorch_mll(mll, options=self.training_specs, max_attempts=10)
+        fit_gp_model(
+            self.model,  # type: ignore
+            training_specs=self.training_specs,
+            max_attempts=10,
+            warm_start_model=warm_start_model,
+        )
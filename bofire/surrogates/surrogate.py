@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -8,6 +8,7 @@ from bofire.data_models.domain.domain import is_numeric
 from bofire.data_models.features.api import CategoricalOutput
 from bofire.data_models.surrogates.api import Surrogate as DataModel
 from bofire.surrogates.values import PredictedValue
+from bofire.utils.chunks import DataFrameSource, iter_predictions
 from bofire.utils.naming_conventions import (
     get_column_names,
     postprocess_categorical_predictions,
@@ -63,6 +64,86 @@ class Surrogate(ABC):
         # return
         return predictions
 
+    def predict_array(
+        self, X: np.ndarray, validate: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Predicts already encoded inputs without the overhead of `predict`.
+
+        Args:
+            X (np.ndarray): Encoded inputs with the column layout given by
+                `inputs._get_transform_info(input_preprocessing_specs)`.
+            validate (bool, optional): If True, the inputs are decoded and validated
+                against the input features before predicting, which is useful for
+                debugging. Defaults to False.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The raw predicted means and standard
+                deviations, one column per output.
+        """
+        if not self.is_fitted:
+            raise ValueError("Model is not fitted/available yet.")
+        X = np.asarray(X, dtype=np.float64)
+        if validate:
+            self.validate_array(X)
+        return self._predict(pd.DataFrame(data=X, columns=self._transformed_keys))
+
+    @property
+    def _transformed_keys(self) -> List[str]:
+        """Column names of the inputs after applying the preprocessing specs."""
+        _, features2names = self.inputs._get_transform_info(
+            self.input_preprocessing_specs
+        )
+        return [name for names in features2names.values() for name in names]
+
+    def validate_array(self, X: np.ndarray) -> np.ndarray:
+        """Validates encoded inputs as passed to `predict_array`.
+
+        Args:
+            X (np.ndarray): Encoded inputs.
+
+        Raises:
+            ValueError: If the shape does not match the encoding, if non finite values
+                are present or if the decoded inputs are invalid.
+
+        Returns:
+            np.ndarray: The validated inputs.
+        """
+        keys = self._transformed_keys
+        if X.ndim != 2 or X.shape[1] != len(keys):
+            raise ValueError(
+                f"Expected an array of shape (n, {len(keys)}), got {X.shape}."
+            )
+        if not np.isfinite(X).all():
+            raise ValueError("Not all values in the inputs are finite.")
+        self.inputs.validate_experiments(
+            self.inputs.inverse_transform(
+                pd.DataFrame(data=X, columns=keys), self.input_preprocessing_specs
+            ),
+            strict=False,
+        )
+        return X
+
+    def predict_iter(
+        self,
+        X: DataFrameSource,
+        chunksize: int = 10000,
+        callback: Optional[Callable[[int, float], None]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Predicts a large table chunk by chunk, so that memory stays bounded.
+
+        Args:
+            X (DataFrameSource): The inputs, either as dataframe, iterable of
+                dataframes or the path to a Parquet or CSV file.
+            chunksize (int, optional): Number of rows per chunk. Defaults to 10000.
+            callback (Callable[[int, float], None], optional): Called after every
+                chunk with the number of rows predicted so far and the elapsed time
+                in seconds. Defaults to None.
+
+        Yields:
+            Iterator[pd.DataFrame]: The predictions per chunk, indexed as the chunk.
+        """
+        return iter_predictions(self.predict, X, chunksize=chunksize, callback=callback)
+
     def validate_predictions(self, predictions: pd.DataFrame) -> pd.DataFrame:
         # Get the column names
         pred_cols, sd_cols = get_column_names(self.outputs)  # type: ignore
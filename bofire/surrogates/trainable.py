@@ -2,6 +2,7 @@ import warnings
 from abc import ABC, abstractmethod
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import KFold, StratifiedKFold
 
@@ -15,10 +16,12 @@ from bofire.data_models.features.api import (
 from bofire.data_models.objectives.api import ConstrainedCategoricalObjective
 from bofire.surrogates.diagnostics import CvResult, CvResults
 from bofire.surrogates.surrogate import Surrogate
+from bofire.surrogates.utils import fit_in_processes, get_exact_gp_cv_predictions
 
 
 class TrainableSurrogate(ABC):
     _output_filtering: OutputFilteringEnum = OutputFilteringEnum.ALL
+    warm_start: bool = False
 
     def fit(self, experiments: pd.DataFrame, options: Optional[Dict] = None):
         # validate
@@ -31,8 +34,11 @@ class TrainableSurrogate(ABC):
         X = experiments[self.inputs.get_keys()]  # type: ignore
         # TODO: output feature validation
         Y = experiments[self.outputs.get_keys()]  # type: ignore
-        # fit
+        # fit, only refits via this method are warm started from the previous fit,
+        # the fits of the cross validation folds always start from scratch
         options = options or {}
+        if self.warm_start and self.model is not None:  # type: ignore
+            options = {"warm_start_model": self.model, **options}  # type: ignore
         self._fit(X=X, Y=Y, **options)  # type: ignore
 
     def _preprocess_experiments(self, experiments: pd.DataFrame) -> pd.DataFrame:
@@ -79,6 +85,8 @@ class TrainableSurrogate(ABC):
             ]
         ] = None,
         hook_kwargs: Optional[Dict[str, Dict[str, Any]]] = None,
+        n_jobs: int = 1,
+        closed_form: bool = False,
     ) -> Tuple[CvResults, CvResults, Dict[str, List[Any]]]:
         """Perform a cross validation for the provided training data.
 
@@ -96,6 +104,17 @@ class TrainableSurrogate(ABC):
                 modeld and the current CV folds in the following order: X_train, y_train, X_test, y_test. Defaults to {}.
             hook_kwargs (Dict[str, Dict[str, Any]], optional): Dictionary holding hook specefic keyword arguments.
                 Defaults to {}.
+            n_jobs (int, optional): Number of worker processes used to fit the folds concurrently, see
+                `fit_in_processes`. For `n_jobs > 1`, the folds are fitted on copies of the surrogate, which has to be
+                picklable, and scored afterwards in the main process, where also the hooks are called. As starting a
+                worker takes a few seconds, this only pays off for surrogates with expensive fits, like GPs on larger
+                datasets, SAAS GPs or MLP ensembles, but not for e.g. random forests or linear models. For LOO with
+                exact GPs, see also `closed_form`. As for `n_jobs=1`, the surrogate is left fitted on the last fold.
+                The results are returned in fold order. Defaults to 1.
+            closed_form (bool, optional): If true, the predictions of all folds are computed in closed form from a
+                single fit on all experiments instead of refitting the surrogate for every fold. The hyperparameters
+                are then held fixed at the values fitted on all experiments. Only available for exact GP surrogates
+                and without hooks. Defaults to False.
 
         Returns:
             Tuple[CvResults, CvResults, Dict[str, List[Any]]]: First CvResults object reflects the training data,
@@ -142,6 +161,8 @@ class TrainableSurrogate(ABC):
             raise ValueError("Folds must be -1 for LOO, or > 1.")
         elif folds == -1:
             folds = n
+        if n_jobs < 1:
+            raise ValueError("n_jobs has to be at least 1.")
         # preprocess hooks
         if hooks is None:
             hooks = {}
@@ -162,77 +183,258 @@ class TrainableSurrogate(ABC):
                 experiments[stratified_feature],
             )
 
-        key = self.outputs.get_keys()[0]  # type: ignore
-        train_results = []
-        test_results = []
-        # now get the indices for the split
-        for train_index, test_index in cv_func:
-            X_train = experiments.iloc[train_index][self.inputs.get_keys()]  # type: ignore
-            X_test = experiments.iloc[test_index][self.inputs.get_keys()]  # type: ignore
-            y_train = experiments.iloc[train_index][self.outputs.get_keys()]  # type: ignore
-            y_test = experiments.iloc[test_index][self.outputs.get_keys()]  # type: ignore
-            train_labcodes = (
-                experiments.iloc[train_index]["labcode"] if include_labcodes else None
-            )
-            test_labcodes = (
-                experiments.iloc[test_index]["labcode"] if include_labcodes else None
-            )
-            # now fit the model
-            self._fit(X_train, y_train)
-            # now do the scoring
-            y_test_pred = self.predict(X_test)  # type: ignore
-            y_train_pred = self.predict(X_train)  # type: ignore
-
-            # Convert to categorical if applicable
-            if isinstance(self.outputs.get_by_key(key).objective, ConstrainedCategoricalObjective):  # type: ignore
-                y_test_pred[f"{key}_pred"] = y_test_pred[f"{key}_pred"].map(
-                    self.outputs.get_by_key(key).objective.to_dict_label()  # type: ignore
-                )
-                y_train_pred[f"{key}_pred"] = y_train_pred[f"{key}_pred"].map(
-                    self.outputs.get_by_key(key).objective.to_dict_label()  # type: ignore
-                )
-                y_test[key] = y_test[key].map(
-                    self.outputs.get_by_key(key).objective.to_dict_label()  # type: ignore
-                )
-                y_train[key] = y_train[key].map(
-                    self.outputs.get_by_key(key).objective.to_dict_label()  # type: ignore
-                )
+        splits = list(cv_func)
+        fold_kwargs = {
+            "experiments": experiments,
+            "include_X": include_X,
+            "include_labcodes": include_labcodes,
+            "hooks": hooks,
+            "hook_kwargs": hook_kwargs,
+        }
+        fold_results = self._cross_validate_folds(
+            splits=splits,
+            n_jobs=n_jobs,
+            closed_form=closed_form,
+            fold_kwargs=fold_kwargs,
+        )
+        train_results = [train_result for train_result, _, _ in fold_results]
+        test_results = [test_result for _, test_result, _ in fold_results]
+        for _, _, fold_hook_results in fold_results:
+            for hookname, hook_result in fold_hook_results.items():
+                hook_results[hookname].append(hook_result)
+        return (
+            CvResults(results=train_results),
+            CvResults(results=test_results),
+            hook_results,
+        )
+
+    def _cross_validate_folds(
+        self,
+        splits: List[Tuple[np.ndarray, np.ndarray]],
+        n_jobs: int,
+        closed_form: bool,
+        fold_kwargs: Dict[str, Any],
+    ) -> List[Tuple[CvResult, CvResult, Dict[str, Any]]]:
+        """Computes the results of all folds, either serially, concurrently or in
+        closed form.
 
-            # now store the results
-            train_results.append(
-                CvResult(  # type: ignore
-                    key=key,
-                    observed=y_train[key],
-                    predicted=y_train_pred[key + "_pred"],
-                    standard_deviation=y_train_pred[key + "_sd"],
-                    X=X_train if include_X else None,
-                    labcodes=train_labcodes,
+        In all cases the surrogate is left fitted on the training data of the last
+        fold (or on all experiments in closed form).
+
+        Args:
+            splits (List[Tuple[np.ndarray, np.ndarray]]): Train and test indices of
+                the folds.
+            n_jobs (int): Number of worker processes used to fit the folds.
+            closed_form (bool): If true, the folds are computed in closed form.
+            fold_kwargs (Dict[str, Any]): Keyword arguments passed to
+                `_cross_validate_fold` for every fold.
+
+        Returns:
+            List[Tuple[CvResult, CvResult, Dict[str, Any]]]: The results on the
+                training and test data and the hook return values of every fold.
+        """
+        n_jobs = min(n_jobs, len(splits))
+        if closed_form:
+            if len(fold_kwargs["hooks"]) > 0:
+                raise ValueError(
+                    "Hooks are not supported in closed form cross validation."
                 )
+            fold_results = self._cross_validate_closed_form(
+                experiments=fold_kwargs["experiments"],
+                splits=splits,
+                include_X=fold_kwargs["include_X"],
+                include_labcodes=fold_kwargs["include_labcodes"],
             )
-            test_results.append(
-                CvResult(  # type: ignore
-                    key=key,
-                    observed=y_test[key],
-                    predicted=y_test_pred[key + "_pred"],
-                    standard_deviation=y_test_pred[key + "_sd"],
-                    X=X_test if include_X else None,
-                    labcodes=test_labcodes,
+        elif n_jobs == 1:
+            fold_results = [
+                self._cross_validate_fold(
+                    train_index=train_index, test_index=test_index, **fold_kwargs
                 )
+                for train_index, test_index in splits
+            ]
+        else:
+            # the folds are fitted on pickled copies of the surrogate, the fitted
+            # state of the last fold is copied back into the surrogate itself, like
+            # in the serial case
+            experiments = fold_kwargs["experiments"]
+            fitted = fit_in_processes(
+                [
+                    (
+                        self,
+                        "_fit",
+                        (
+                            experiments.iloc[train_index][self.inputs.get_keys()],  # type: ignore
+                            experiments.iloc[train_index][self.outputs.get_keys()],  # type: ignore
+                        ),
+                    )
+                    for train_index, _ in splits
+                ],
+                n_jobs=n_jobs,
             )
-            # now call the hooks if available
-            for hookname, hook in hooks.items():
-                hook_results[hookname].append(
-                    hook(
-                        surrogate=self,  # type: ignore
-                        X_train=X_train,
-                        y_train=y_train,
-                        X_test=X_test,
-                        y_test=y_test,
-                        **hook_kwargs.get(hookname, {}),
+            self.__dict__.update(fitted[-1].__dict__)
+            fitted[-1] = self
+            fold_results = [
+                surrogate._cross_validate_fold(
+                    train_index=train_index,
+                    test_index=test_index,
+                    fit=False,
+                    **fold_kwargs,
+                )
+                for surrogate, (train_index, test_index) in zip(fitted, splits)
+            ]
+        return fold_results
+
+    def _cross_validate_closed_form(
+        self,
+        experiments: pd.DataFrame,
+        splits: List[Tuple[np.ndarray, np.ndarray]],
+        include_X: bool,
+        include_labcodes: bool,
+    ) -> List[Tuple[CvResult, CvResult, Dict[str, Any]]]:
+        """Fits the surrogate on all experiments and computes the results of all folds
+        in closed form, see `get_exact_gp_cv_predictions`.
+
+        Args:
+            experiments (pd.DataFrame): The preprocessed experiments.
+            splits (List[Tuple[np.ndarray, np.ndarray]]): Train and test indices of
+                the folds.
+            include_X (bool): If true the X values of the folds are written to the
+                CvResult objects.
+            include_labcodes (bool): If true the labcodes of the folds are written to
+                the CvResult objects.
+
+        Returns:
+            List[Tuple[CvResult, CvResult, Dict[str, Any]]]: The results on the
+                training and test data of every fold and empty hook results.
+        """
+        key = self.outputs.get_keys()[0]  # type: ignore
+        self._fit(
+            experiments[self.inputs.get_keys()],  # type: ignore
+            experiments[self.outputs.get_keys()],  # type: ignore
+        )
+        predictions = get_exact_gp_cv_predictions(self.model, splits)  # type: ignore
+        fold_results = []
+        for (train_index, test_index), fold_predictions in zip(splits, predictions):
+            train_mean, train_sd, test_mean, test_sd = fold_predictions
+            cv_results = []
+            for index, mean, sd in [
+                (train_index, train_mean, train_sd),
+                (test_index, test_mean, test_sd),
+            ]:
+                fold_experiments = experiments.iloc[index]
+                cv_results.append(
+                    CvResult(  # type: ignore
+                        key=key,
+                        observed=fold_experiments[key],
+                        predicted=pd.Series(
+                            mean, index=fold_experiments.index, name=f"{key}_pred"
+                        ),
+                        standard_deviation=pd.Series(
+                            sd, index=fold_experiments.index, name=f"{key}_sd"
+                        ),
+                        X=(
+                            fold_experiments[self.inputs.get_keys()]  # type: ignore
+                            if include_X
+                            else None
+                        ),
+                        labcodes=(
+                            fold_experiments["labcode"] if include_labcodes else None
+                        ),
                     )
                 )
-        return (
-            CvResults(results=train_results),
-            CvResults(results=test_results),
-            hook_results,
+            fold_results.append((cv_results[0], cv_results[1], {}))
+        return fold_results
+
+    def _cross_validate_fold(
+        self,
+        experiments: pd.DataFrame,
+        train_index: np.ndarray,
+        test_index: np.ndarray,
+        include_X: bool,
+        include_labcodes: bool,
+        hooks: Dict[str, Callable],
+        hook_kwargs: Dict[str, Dict[str, Any]],
+        fit: bool = True,
+    ) -> Tuple[CvResult, CvResult, Dict[str, Any]]:
+        """Fits the surrogate on the training part of a fold and scores it.
+
+        Args:
+            experiments (pd.DataFrame): The preprocessed experiments.
+            train_index (np.ndarray): Indices of the training experiments.
+            test_index (np.ndarray): Indices of the test experiments.
+            include_X (bool): If true the X values of the fold are written to the
+                CvResult objects.
+            include_labcodes (bool): If true the labcodes of the fold are written to
+                the CvResult objects.
+            hooks (Dict[str, Callable]): Hooks called with the trained surrogate.
+            hook_kwargs (Dict[str, Dict[str, Any]]): Hook specific keyword arguments.
+            fit (bool, optional): If False, the surrogate is expected to be already
+                fitted on the training part of the fold. Defaults to True.
+
+        Returns:
+            Tuple[CvResult, CvResult, Dict[str, Any]]: The results on the training
+                and test data of the fold and the return values of the hooks.
+        """
+        key = self.outputs.get_keys()[0]  # type: ignore
+        X_train = experiments.iloc[train_index][self.inputs.get_keys()]  # type: ignore
+        X_test = experiments.iloc[test_index][self.inputs.get_keys()]  # type: ignore
+        y_train = experiments.iloc[train_index][self.outputs.get_keys()]  # type: ignore
+        y_test = experiments.iloc[test_index][self.outputs.get_keys()]  # type: ignore
+        train_labcodes = (
+            experiments.iloc[train_index]["labcode"] if include_labcodes else None
         )
+        test_labcodes = (
+            experiments.iloc[test_index]["labcode"] if include_labcodes else None
+        )
+        # now fit the model
+        if fit:
+            self._fit(X_train, y_train)
+        # now do the scoring
+        y_test_pred = self.predict(X_test)  # type: ignore
+        y_train_pred = self.predict(X_train)  # type: ignore
+
+        # Convert to categorical if applicable
+        if isinstance(self.outputs.get_by_key(key).objective, ConstrainedCategoricalObjective):  # type: ignore
+            y_test_pred[f"{key}_pred"] = y_test_pred[f"{key}_pred"].map(
+                self.outputs.get_by_key(key).objective.to_dict_label()  # type: ignore
+            )
+            y_train_pred[f"{key}_pred"] = y_train_pred[f"{key}_pred"].map(
+                self.outputs.get_by_key(key).objective.to_dict_label()  # type: ignore
+            )
+            y_test[key] = y_test[key].map(
+                self.outputs.get_by_key(key).objective.to_dict_label()  # type: ignore
+            )
+            y_train[key] = y_train[key].map(
+                self.outputs.get_by_key(key).objective.to_dict_label()  # type: ignore
+            )
+
+        # now store the results
+        train_result = CvResult(  # type: ignore
+            key=key,
+            observed=y_train[key],
+            predicted=y_train_pred[key + "_pred"],
+            standard_deviation=y_train_pred[key + "_sd"],
+            X=X_train if include_X else None,
+            labcodes=train_labcodes,
+        )
+        test_result = CvResult(  # type: ignore
+            key=key,
+            observed=y_test[key],
+            predicted=y_test_pred[key + "_pred"],
+            standard_deviation=y_test_pred[key + "_sd"],
+            X=X_test if include_X else None,
+            labcodes=test_labcodes,
+        )
+        # now call the hooks if available
+        hook_results = {
+            hookname: hook(
+                surrogate=self,  # type: ignore
+                X_train=X_train,
+                y_train=y_train,
+                X_test=X_test,
+                y_test=y_test,
+                **hook_kwargs.get(hookname, {}),
+            )
+            for hookname, hook in hooks.items()
+        }
+        return train_result, test_result, hook_results
@@ -1,8 +1,17 @@
-from typing import List, Union
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import pandas as pd
 import torch
+from botorch.fit import fit_gpytorch_mll
+from botorch.models import SingleTaskGP
+from botorch.models.gpytorch import GPyTorchModel
 from botorch.models.transforms.input import InputStandardize, Normalize
+from gpytorch.likelihoods import FixedNoiseGaussianLikelihood
+from gpytorch.mlls import ExactMarginalLogLikelihood
+from linear_operator.utils.cholesky import psd_safe_cholesky
 
 from bofire.data_models.domain.api import Inputs
 from bofire.data_models.enum import CategoricalEncodingEnum
@@ -17,6 +26,44 @@ from bofire.data_models.types import InputTransformSpecs
 from bofire.utils.torch_tools import tkwargs
 
 
+def _fit_in_process(surrogate: Any, method: str, args: Tuple, num_threads: int):
+    """Entry point of the worker processes of `fit_in_processes`."""
+    torch.set_num_threads(num_threads)
+    getattr(surrogate, method)(*args)
+    return surrogate
+
+
+def fit_in_processes(jobs: Sequence[Tuple[Any, str, Tuple]], n_jobs: int) -> List[Any]:
+    """Runs independent fits of surrogates in a pool of worker processes.
+
+    Every worker has its own warning filters, gpytorch settings and torch thread
+    pool, so that the marginal likelihood optimizations of several GPs do not
+    interfere with each other. The torch intra-op threads of the main process are
+    divided between the workers. The workers are spawned instead of forked, as
+    forking a process with initialized torch thread pools can deadlock. Starting a
+    worker costs a few seconds for importing bofire and torch, so that only fits
+    which take considerably longer benefit from it.
+
+    Args:
+        jobs (Sequence[Tuple[Any, str, Tuple]]): For every fit the surrogate, the
+            name of its fit method and the positional arguments of the method. The
+            surrogates and arguments have to be picklable.
+        n_jobs (int): Number of worker processes.
+
+    Returns:
+        List[Any]: The fitted copies of the surrogates in the order of `jobs`.
+    """
+    num_threads = max(1, torch.get_num_threads() // n_jobs)
+    with ProcessPoolExecutor(
+        max_workers=n_jobs, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = [
+            executor.submit(_fit_in_process, surrogate, method, args, num_threads)
+            for surrogate, method, args in jobs
+        ]
+        return [future.result() for future in futures]
+
+
 def get_molecular_feature_keys(
     specs: InputTransformSpecs,
 ) -> List[str]:
@@ -156,3 +203,184 @@ def get_scaler(
         return scaler_transform
     else:
         return None
+
+
+def _copy_hyperparameters(source: GPyTorchModel, target: GPyTorchModel) -> bool:
+    """Copies the values of all hyperparameters of `source` to `target`, for which
+    a parameter with the same name and shape exists in `target`.
+
+    Args:
+        source (GPyTorchModel): Model from which the hyperparameters are taken.
+        target (GPyTorchModel): Model into which the hyperparameters are written.
+
+    Returns:
+        bool: True if at least one hyperparameter was copied, else False.
+    """
+    source_parameters = dict(source.named_parameters())
+    copied = False
+    with torch.no_grad():
+        for name, parameter in target.named_parameters():
+            source_parameter = source_parameters.get(name)
+            if (
+                source_parameter is not None
+                and source_parameter.shape == parameter.shape
+            ):
+                parameter.copy_(source_parameter)
+                copied = True
+    return copied
+
+
+def get_mll_value(model: GPyTorchModel) -> float:
+    """Evaluates the (per datum) exact marginal log likelihood of a GP model on its
+    own training data at its current hyperparameters.
+
+    Args:
+        model (GPyTorchModel): The model to be evaluated.
+
+    Returns:
+        float: The marginal log likelihood.
+    """
+    # the evaluation is done in eval mode on the already transformed training
+    # inputs, this also works for models conditioned on additional observations
+    model.eval()
+    mll = ExactMarginalLogLikelihood(model.likelihood, model)
+    with torch.no_grad():
+        output = model.forward(*model.train_inputs)
+        value = mll(output, model.train_targets)
+    return value.sum().item()
+
+
+def fit_gp_model(
+    model: GPyTorchModel,
+    training_specs: Optional[Dict] = None,
+    max_attempts: int = 5,
+    warm_start_model: Optional[GPyTorchModel] = None,
+    warm_start_maxiter: int = 20,
+    mll_tolerance: float = 0.05,
+):
+    """Fits the hyperparameters of an exact GP model by maximizing its marginal
+    log likelihood.
+
+    If a `warm_start_model` is provided, its hyperparameters are used as starting
+    point and the optimizer is run with a reduced budget of `warm_start_maxiter`
+    iterations per newly added training point and a single attempt. Both marginal
+    log likelihoods are evaluated on the new training data. If the warm fit had to
+    improve on the copied hyperparameters by more than `mll_tolerance`, they no
+    longer explain the data and the optimizer may have got stuck in a local
+    optimum close to them. Then a cold restart from the default hyperparameters
+    is performed and the better of both fits is kept.
+
+    Args:
+        model (GPyTorchModel): The model to be fitted.
+        training_specs (Dict, optional): Options passed to `fit_gpytorch_mll`.
+            Defaults to None.
+        max_attempts (int, optional): Maximal number of attempts for a cold fit.
+            Defaults to 5.
+        warm_start_model (GPyTorchModel, optional): Previously fitted model used
+            for warm starting. Defaults to None.
+        warm_start_maxiter (int, optional): Optimizer iterations per new training
+            point in the warm started fit. Defaults to 20.
+        mll_tolerance (float, optional): Allowed increase of the per datum marginal
+            log likelihood by the warm fit before a cold restart is triggered.
+            Defaults to 0.05.
+    """
+    training_specs = training_specs or {}
+    mll = ExactMarginalLogLikelihood(model.likelihood, model)
+    if warm_start_model is None:
+        fit_gpytorch_mll(mll, options=training_specs, max_attempts=max_attempts)
+        return
+    initial_state = {k: v.clone() for k, v in model.state_dict().items()}
+    if not _copy_hyperparameters(source=warm_start_model, target=model):
+        fit_gpytorch_mll(mll, options=training_specs, max_attempts=max_attempts)
+        return
+    seeded_value = get_mll_value(model)
+    n_new = max(
+        model.train_targets.shape[-1] - warm_start_model.train_targets.shape[-1], 1
+    )
+    fit_gpytorch_mll(
+        mll,
+        options=training_specs,
+        optimizer_kwargs={"options": {"maxiter": warm_start_maxiter * n_new}},
+        max_attempts=1,
+    )
+    warm_value = get_mll_value(model)
+    if warm_value - seeded_value <= mll_tolerance:
+        return
+    # the warm start may be stuck, restart from the default hyperparameters
+    warm_state = {k: v.clone() for k, v in model.state_dict().items()}
+    model.load_state_dict(initial_state)
+    fit_gpytorch_mll(mll, options=training_specs, max_attempts=max_attempts)
+    if get_mll_value(model) < warm_value:
+        model.load_state_dict(warm_state)
+
+
+def get_exact_gp_cv_predictions(
+    model: SingleTaskGP, splits: Sequence[Tuple[np.ndarray, np.ndarray]]
+) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """Computes cross validated predictions of an exact GP in closed form.
+
+    The predictions of every fold are derived from the inverse of the kernel
+    matrix of the full training data, so that no refit is needed. The
+    hyperparameters, and also the outcome transform, are held fixed at the
+    values fitted on the full training data. For a test block I with training
+    data J and P the inverse of the full (noisy) kernel matrix:
+
+    - test means: y_I - P_II^-1 (P (y - m))_I
+    - test variances: diag(P_II^-1)
+    - train predictions via the inverse kernel matrix of J, obtained as the
+      Schur complement P_JJ - P_JI P_II^-1 P_IJ.
+
+    Args:
+        model (SingleTaskGP): Fitted single output GP with homoscedastic noise.
+        splits (Sequence[Tuple[np.ndarray, np.ndarray]]): Train and test indices
+            of the folds with respect to the training data of the model.
+
+    Raises:
+        ValueError: If the model is not supported.
+
+    Returns:
+        List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]: Means and
+            standard deviations (including observation noise) on the train and
+            test indices of every fold.
+    """
+    if (
+        not isinstance(model, SingleTaskGP)
+        or model.num_outputs != 1
+        or isinstance(model.likelihood, FixedNoiseGaussianLikelihood)
+    ):
+        raise ValueError(
+            "Closed form cross validation is only available for single output exact GPs with homoscedastic noise."
+        )
+    # in eval mode the training inputs are already transformed
+    model.eval()
+    with torch.no_grad():
+        train_X = model.train_inputs[0]
+        residuals = model.train_targets - model.mean_module(train_X)
+        noise = model.likelihood.noise.squeeze()
+        K = model.covar_module(train_X).to_dense()
+        K = K + noise * torch.eye(K.shape[-1], dtype=K.dtype, device=K.device)
+        P = torch.cholesky_inverse(psd_safe_cholesky(K))
+        alpha = P @ residuals
+        results = []
+        for train_index, test_index in splits:
+            test = torch.from_numpy(np.asarray(test_index)).to(K.device)
+            train = torch.from_numpy(np.asarray(train_index)).to(K.device)
+            P_tt_inv = torch.linalg.inv(P[:, test][test])
+            P_rt = P[:, test][train]
+            P_rt_P_tt_inv = P_rt @ P_tt_inv
+            # test predictions
+            test_mean = model.train_targets[test] - P_tt_inv @ alpha[test]
+            test_var = torch.diagonal(P_tt_inv)
+            # train predictions with the inverse kernel matrix of the train data
+            beta = alpha[train] - P_rt_P_tt_inv @ alpha[test]
+            diag = torch.diagonal(P)[train] - (P_rt_P_tt_inv * P_rt).sum(dim=-1)
+            train_mean = model.train_targets[train] - noise * beta
+            train_var = 2 * noise - noise**2 * diag
+            fold = []
+            for mean, var in [(train_mean, train_var), (test_mean, test_var)]:
+                mean, var = mean.unsqueeze(-1), var.clamp_min(0).unsqueeze(-1)
+                if getattr(model, "outcome_transform", None) is not None:
+                    mean, var = model.outcome_transform.untransform(mean, var)
+                fold += [mean.squeeze(-1).numpy(), var.squeeze(-1).sqrt().numpy()]
+            results.append(tuple(fold))
+    return results
@@ -1,12 +1,21 @@
+import os
 import warnings
-from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Callable, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 
 try:
     from rdkit import RDLogger
-    from rdkit.Chem import AllChem, Descriptors, MolFromSmiles  # type: ignore
+    from rdkit.Chem import (  # type: ignore
+        AllChem,
+        Descriptors,
+        MolFromSmiles,
+        MolToSmiles,
+    )
 
     lg = RDLogger.logger()
     lg.setLevel(RDLogger.CRITICAL)
@@ -45,19 +54,93 @@ def smiles2mol(smiles: str):
     return mol
 
 
-def smiles2fingerprints(
-    smiles: List[str], bond_radius: int = 5, n_bits: int = 2048
-) -> np.ndarray:
-    """Transforms a list of smiles to an array of morgan fingerprints.
+def smiles2canonical(smiles: str) -> str:
+    """Transforms a smiles string to its canonical form.
 
     Args:
-        smiles (List[str]): List of smiles
-        bond_radius (int, optional): Bond radius to use. Defaults to 5.
-        n_bits (int, optional): Number of bits. Defaults to 2048.
+        smiles (str): Smiles string.
+
+    Raises:
+        ValueError: If string is not a valid smiles.
+
+    Returns:
+        str: Canonical smiles string.
+    """
+    return MolToSmiles(smiles2mol(smiles))
+
+
+def featurize_batch(
+    featurizer: Callable[[List[str]], Union[np.ndarray, sp.csr_matrix]],
+    smiles: List[str],
+    n_features: int,
+    n_jobs: int = 1,
+    dtype=np.float64,
+    sparse: bool = False,
+) -> Union[np.ndarray, sp.csr_matrix]:
+    """Applies a featurizer to a list of smiles, optionally in parallel.
+
+    For `n_jobs > 1`, the smiles are split into shards which are featurized in a
+    process pool, the results are written into a preallocated array.
+
+    Args:
+        featurizer (Callable[[List[str]], Union[np.ndarray, sp.csr_matrix]]): Picklable
+            function computing the features of a list of smiles, one row per molecule.
+        smiles (List[str]): List of smiles.
+        n_features (int): Number of features per molecule.
+        n_jobs (int, optional): Number of processes, -1 uses all cores. Defaults to 1.
+        dtype (optional): Data type of the returned array. Defaults to np.float64.
+        sparse (bool, optional): Whether the featurizer returns sparse matrices, the
+            shards are then stacked into a sparse matrix. Defaults to False.
 
     Returns:
-        np.ndarray: Numpy array holding the fingerprints
+        Union[np.ndarray, sp.csr_matrix]: Array holding the features.
     """
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs < 1:
+        raise ValueError(f"n_jobs has to be at least 1 or -1 but got {n_jobs}.")
+    n_jobs = min(n_jobs, len(smiles))
+    if n_jobs <= 1:
+        if sparse:
+            return sp.csr_matrix(featurizer(smiles), dtype=dtype)
+        return np.asarray(featurizer(smiles), dtype=dtype).reshape(
+            (len(smiles), n_features)
+        )
+    features = None if sparse else np.empty((len(smiles), n_features), dtype=dtype)
+    # several shards per worker to balance the load
+    bounds = np.linspace(0, len(smiles), 4 * n_jobs + 1, dtype=int)
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = {
+            (start, end): executor.submit(featurizer, smiles[start:end])
+            for start, end in zip(bounds[:-1], bounds[1:])
+            if end > start
+        }
+        if features is None:
+            return sp.vstack(
+                [future.result() for future in futures.values()],
+                format="csr",
+                dtype=dtype,
+            )
+        for (start, end), future in futures.items():
+            features[start:end] = future.result()
+    return features
+
+
+def _to_csr(rows: List[List[int]], data: List[List[float]], n_features: int):
+    indptr = np.cumsum([0] + [len(row) for row in rows])
+    return sp.csr_matrix(
+        (
+            np.concatenate([np.asarray(d, dtype=np.float64) for d in data] or [[]]),
+            np.concatenate([np.asarray(r, dtype=np.int64) for r in rows] or [[]]),
+            indptr,
+        ),
+        shape=(len(rows), n_features),
+    )
+
+
+def _smiles2fingerprints(
+    smiles: List[str], bond_radius: int = 5, n_bits: int = 2048, sparse: bool = False
+) -> Union[np.ndarray, sp.csr_matrix]:
     rdkit_mols = [smiles2mol(m) for m in smiles]
     fps = [
         AllChem.GetMorganFingerprintAsBitVect(  # type: ignore
@@ -65,29 +148,107 @@ def smiles2fingerprints(
         )
         for mol in rdkit_mols
     ]
+    if sparse:
+        on_bits = [list(fp.GetOnBits()) for fp in fps]
+        return _to_csr(on_bits, [[1.0] * len(bits) for bits in on_bits], n_bits)
 
-    return np.asarray(fps)
+    return np.asarray(fps).reshape((len(smiles), n_bits))
 
 
-def smiles2fragments(
-    smiles: List[str], fragments_list: Optional[List[str]] = None
-) -> np.ndarray:
-    """Transforms smiles to an array of fragments.
+def smiles2fingerprints(
+    smiles: List[str],
+    bond_radius: int = 5,
+    n_bits: int = 2048,
+    n_jobs: int = 1,
+    sparse: bool = False,
+) -> Union[np.ndarray, sp.csr_matrix]:
+    """Transforms a list of smiles to an array of morgan fingerprints.
 
     Args:
         smiles (List[str]): List of smiles
+        bond_radius (int, optional): Bond radius to use. Defaults to 5.
+        n_bits (int, optional): Number of bits. Defaults to 2048.
+        n_jobs (int, optional): Number of processes, -1 uses all cores. Defaults to 1.
+        sparse (bool, optional): Whether to return a sparse CSR matrix, which is
+            built from the on bits without a dense intermediate. Defaults to False.
+
+    Returns:
+        Union[np.ndarray, sp.csr_matrix]: Array holding the fingerprints
+    """
+    return featurize_batch(
+        partial(
+            _smiles2fingerprints, bond_radius=bond_radius, n_bits=n_bits, sparse=sparse
+        ),
+        smiles,
+        n_features=n_bits,
+        n_jobs=n_jobs,
+        dtype=np.float64 if sparse else np.int64,
+        sparse=sparse,
+    )
+
+
+def pack_fingerprints(fingerprints: np.ndarray, word_size: int = 32) -> np.ndarray:
+    """Packs binary fingerprints into integer words.
+
+    Bit `j` of a fingerprint is stored at position `j % word_size` of word
+    `j // word_size`. With the default word size of 32 bits, the words are exactly
+    representable as float64, so that they can be stored in float columns.
+
+    Args:
+        fingerprints (np.ndarray): Array of binary fingerprints of shape `n x n_bits`.
+        word_size (int, optional): Number of bits per word. Defaults to 32.
+
+    Returns:
+        np.ndarray: Integer array of shape `n x ceil(n_bits / word_size)`.
+    """
+    if not 1 <= word_size <= 52:
+        raise ValueError(f"word_size has to be between 1 and 52 but got {word_size}.")
+    bits = np.asarray(fingerprints).astype(bool).astype(np.int64)
+    n_words = -(-bits.shape[-1] // word_size)
+    bits = np.pad(bits, [(0, 0), (0, n_words * word_size - bits.shape[-1])])
+    weights = np.left_shift(1, np.arange(word_size, dtype=np.int64))
+    return bits.reshape((bits.shape[0], n_words, word_size)) @ weights
+
+
+def unpack_fingerprints(
+    words: np.ndarray, n_bits: int, word_size: int = 32
+) -> np.ndarray:
+    """Unpacks fingerprints packed by `pack_fingerprints`.
+
+    Args:
+        words (np.ndarray): Array of packed fingerprints of shape `n x n_words`.
+        n_bits (int): Number of bits of the fingerprints.
+        word_size (int, optional): Number of bits per word. Defaults to 32.
 
     Returns:
-        np.ndarray: Array holding the fragment information.
+        np.ndarray: Integer array of shape `n x n_bits` holding zeros and ones.
     """
+    words = np.asarray(words).astype(np.int64)
+    bits = np.right_shift(words[..., None], np.arange(word_size, dtype=np.int64)) & 1
+    return bits.reshape((words.shape[0], -1))[:, :n_bits]
+
+
+def _get_fragments(fragments_list: Optional[List[str]] = None) -> dict:
     rdkit_fragment_list = [
         item for item in Descriptors.descList if item[0].startswith("fr_")
     ]
     if fragments_list is None:
-        fragments = {d[0]: d[1] for d in rdkit_fragment_list}
-    else:
-        fragments = {d[0]: d[1] for d in rdkit_fragment_list if d[0] in fragments_list}
-
+        return {d[0]: d[1] for d in rdkit_fragment_list}
+    return {d[0]: d[1] for d in rdkit_fragment_list if d[0] in fragments_list}
+
+
+def _smiles2fragments(
+    smiles: List[str], fragments_list: Optional[List[str]] = None, sparse: bool = False
+) -> Union[np.ndarray, sp.csr_matrix]:
+    fragments = _get_fragments(fragments_list)
+    if sparse:
+        rows, data = [], []
+        for smi in smiles:
+            mol = smiles2mol(smi)
+            features = np.asarray([fragments[d](mol) for d in fragments], dtype=float)
+            rows.append(np.flatnonzero(features))
+            data.append(features[rows[-1]])
+        return _to_csr(rows, data, len(fragments))
     frags = np.zeros((len(smiles), len(fragments)))
     for i, smi in enumerate(smiles):
         mol = smiles2mol(smi)
@@ -97,6 +258,34 @@ def smiles2fragments(
     return frags
 
 
+def smiles2fragments(
+    smiles: List[str],
+    fragments_list: Optional[List[str]] = None,
+    n_jobs: int = 1,
+    sparse: bool = False,
+) -> Union[np.ndarray, sp.csr_matrix]:
+    """Transforms smiles to an array of fragments.
+
+    Args:
+        smiles (List[str]): List of smiles
+        fragments_list (List[str], optional): Names of the fragments. Defaults to
+            None (all fragments).
+        n_jobs (int, optional): Number of processes, -1 uses all cores. Defaults to 1.
+        sparse (bool, optional): Whether to return a sparse CSR matrix. Defaults to
+            False.
+
+    Returns:
+        Union[np.ndarray, sp.csr_matrix]: Array holding the fragment information.
+    """
+    return featurize_batch(
+        partial(_smiles2fragments, fragments_list=fragments_list, sparse=sparse),
+        smiles,
+        n_features=len(_get_fragments(fragments_list)),
+        n_jobs=n_jobs,
+        sparse=sparse,
+    )
+
+
 # def smiles2bag_of_characters(smiles: List[str], max_ngram: int = 5) -> np.ndarray:
 #     """Transforms list of smiles to bag of characters.
 #
@@ -113,20 +302,18 @@ def smiles2fragments(
 #     return cv.fit_transform(smiles).toarray()
 
 
-def smiles2mordred(smiles: List[str], descriptors_list: List[str]) -> np.ndarray:
-    """Transforms list of smiles to mordred moelcular descriptors.
+@lru_cache(maxsize=16)
+def _get_mordred_calculator(descriptors_list: Tuple[str, ...]) -> "Calculator":
+    # building and filtering the calculator is expensive, hence it is reused
+    calc = Calculator(descriptors, ignore_3D=True)
+    calc.descriptors = [d for d in calc.descriptors if str(d) in descriptors_list]
+    return calc
 
-    Args:
-        smiles (List[str]): List of smiles
-        descriptors_list (List[str]): List of desired mordred descriptors
 
-    Returns:
-        np.ndarray: Array holding the mordred moelcular descriptors.
-    """
+def _smiles2mordred(smiles: List[str], descriptors_list: Tuple[str, ...]) -> np.ndarray:
     mols = [smiles2mol(smi) for smi in smiles]
 
-    calc = Calculator(descriptors, ignore_3D=True)
-    calc.descriptors = [d for d in calc.descriptors if str(d) in descriptors_list]
+    calc = _get_mordred_calculator(descriptors_list)
 
     descriptors_df = calc.pandas(mols)
     nan_list = [
@@ -141,13 +328,43 @@ def smiles2mordred(smiles: List[str], descriptors_list: List[str]) -> np.ndarray
     return descriptors_df.astype(float).values
 
 
+def smiles2mordred(
+    smiles: List[str], descriptors_list: List[str], n_jobs: int = 1
+) -> np.ndarray:
+    """Transforms list of smiles to mordred moelcular descriptors.
+
+    Args:
+        smiles (List[str]): List of smiles
+        descriptors_list (List[str]): List of desired mordred descriptors
+        n_jobs (int, optional): Number of processes, -1 uses all cores. Defaults to 1.
+
+    Returns:
+        np.ndarray: Array holding the mordred moelcular descriptors.
+    """
+    descriptors_tuple = tuple(descriptors_list)
+    return featurize_batch(
+        partial(_smiles2mordred, descriptors_list=descriptors_tuple),
+        smiles,
+        n_features=len(_get_mordred_calculator(descriptors_tuple).descriptors),
+        n_jobs=n_jobs,
+    )
+
+
 def smiles2fragments_fingerprints(
     smiles: List[str],
     bond_radius: int = 5,
     n_bits: int = 2048,
     fragments_list: Optional[List[str]] = None,
-) -> np.ndarray:
-    fingerprints = smiles2fingerprints(smiles, bond_radius=bond_radius, n_bits=n_bits)
-    fragments = smiles2fragments(smiles, fragments_list=fragments_list)
+    n_jobs: int = 1,
+    sparse: bool = False,
+) -> Union[np.ndarray, sp.csr_matrix]:
+    fingerprints = smiles2fingerprints(
+        smiles, bond_radius=bond_radius, n_bits=n_bits, n_jobs=n_jobs, sparse=sparse
+    )
+    fragments = smiles2fragments(
+        smiles, fragments_list=fragments_list, n_jobs=n_jobs, sparse=sparse
+    )
 
+    if sparse:
+        return sp.hstack((fingerprints, fragments), format="csr")
     return np.hstack((fingerprints, fragments))
@@ -0,0 +1,78 @@
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+import pandas as pd
+
+DataFrameSource = Union[pd.DataFrame, Iterable[pd.DataFrame], str, Path]
+
+
+def iter_dataframe_chunks(
+    source: DataFrameSource, chunksize: int = 10000
+) -> Iterator[pd.DataFrame]:
+    """Iterates over a table in chunks of rows.
+
+    Args:
+        source (DataFrameSource): Either a dataframe, an iterable of dataframes or
+            the path to a Parquet (`.parquet`, `.pq`) or CSV file.
+        chunksize (int, optional): Number of rows per chunk when reading from a
+            dataframe or a file. Iterables of dataframes are passed through as they
+            are. Defaults to 10000.
+
+    Yields:
+        Iterator[pd.DataFrame]: The chunks.
+    """
+    if chunksize < 1:
+        raise ValueError(f"chunksize has to be at least 1 but got {chunksize}.")
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunksize):
+            yield source.iloc[start : start + chunksize].copy()
+    elif isinstance(source, (str, Path)):
+        path = Path(source)
+        if path.suffix in [".parquet", ".pq"]:
+            try:
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("pyarrow is required to read Parquet files.")
+            offset = 0
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+                chunk = batch.to_pandas()
+                chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+                offset += len(chunk)
+                yield chunk
+        else:
+            yield from pd.read_csv(path, chunksize=chunksize)
+    else:
+        yield from source
+
+
+def iter_predictions(
+    predict: Callable[[pd.DataFrame], pd.DataFrame],
+    source: DataFrameSource,
+    chunksize: int = 10000,
+    callback: Optional[Callable[[int, float], None]] = None,
+) -> Iterator[pd.DataFrame]:
+    """Applies a prediction function chunk by chunk to a table.
+
+    Args:
+        predict (Callable[[pd.DataFrame], pd.DataFrame]): The prediction function.
+        source (DataFrameSource): The table, see `iter_dataframe_chunks`.
+        chunksize (int, optional): Number of rows per chunk. Defaults to 10000.
+        callback (Callable[[int, float], None], optional): Called after every chunk
+            with the number of rows predicted so far and the elapsed time in
+            seconds, e.g. to report the throughput. Defaults to None.
+
+    Yields:
+        Iterator[pd.DataFrame]: The predictions per chunk, indexed as the chunk.
+    """
+    start = time.perf_counter()
+    num_rows = 0
+    for chunk in iter_dataframe_chunks(source, chunksize=chunksize):
+        if len(chunk) == 0:
+            continue
+        predictions = predict(chunk)
+        predictions.index = chunk.index
+        num_rows += len(chunk)
+        if callback is not None:
+            callback(num_rows, time.perf_counter() - start)
+        yield predictions
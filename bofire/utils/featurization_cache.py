@@ -0,0 +1,290 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import scipy.sparse as sp
+
+from bofire.utils.cheminformatics import smiles2canonical
+
+_Row = Union[np.ndarray, sp.csr_matrix]
+
+# version of the layout of the persistent cache, stored as user_version of the
+# SQLite database, bump it and extend `FeaturizationCache._migrate` on changes
+_SCHEMA_VERSION = 1
+
+
+def _nbytes(vals: _Row) -> int:
+    """Returns the memory footprint of the buffers of a cached row."""
+    if sp.issparse(vals):
+        return vals.data.nbytes + vals.indices.nbytes + vals.indptr.nbytes  # type: ignore
+    return vals.nbytes
+
+
+class _LRUDict:
+    """Minimal least recently used mapping with a maximal number of entries and,
+    optionally, a maximal total size of the values in bytes."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = _nbytes,
+    ):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._data: OrderedDict = OrderedDict()
+        self.nbytes = 0
+
+    def get(self, key):
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        if self.max_bytes is not None:
+            if key in self._data:
+                self.nbytes -= self._sizeof(self._data[key])
+            self.nbytes += self._sizeof(value)
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize or (
+            self.max_bytes is not None and self.nbytes > self.max_bytes
+        ):
+            _, evicted = self._data.popitem(last=False)
+            if self.max_bytes is not None:
+                self.nbytes -= self._sizeof(evicted)
+
+    def clear(self):
+        self._data.clear()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class FeaturizationCache:
+    """Cache for molecular descriptor values.
+
+    Values are keyed by the canonical smiles and a key describing the configuration
+    of the featurizer. They are kept in an in-memory LRU cache and, if a path is
+    provided, persisted in a SQLite database, so that they survive restarts of the
+    process. Values of featurizers returning sparse matrices are cached as sparse
+    rows.
+
+    Args:
+        maxsize (int, optional): Maximal number of entries in the in-memory cache.
+            Defaults to 10000.
+        path (Union[str, Path], optional): Path of the SQLite database. Defaults to
+            None (no persistence).
+        max_bytes (int, optional): Maximal total size of the descriptor values in
+            the in-memory cache in bytes. Defaults to 64 MiB.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        path: Optional[Union[str, Path]] = None,
+        max_bytes: int = 64 * 2**20,
+    ):
+        if maxsize < 1:
+            raise ValueError(f"maxsize has to be at least 1 but got {maxsize}.")
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes has to be at least 1 but got {max_bytes}.")
+        self._values = _LRUDict(maxsize, max_bytes=max_bytes)
+        self._canonical_smiles = _LRUDict(maxsize)
+        self._lock = threading.RLock()
+        self.path = None if path is None else Path(path)
+        self._connection = None
+        if self.path is not None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS descriptors (config TEXT, smiles TEXT, "
+                "vals BLOB, n_features INTEGER, PRIMARY KEY (config, smiles))"
+            )
+            self._migrate()
+            self._connection.commit()
+
+    def _migrate(self):
+        """Upgrades databases written by older versions to `_SCHEMA_VERSION`."""
+        assert self._connection is not None
+        (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+        if version > _SCHEMA_VERSION:
+            self.close()
+            raise ValueError(
+                f"The featurization cache {self.path} has schema version {version}, "
+                f"only versions up to {_SCHEMA_VERSION} are supported."
+            )
+        if version < 1:
+            # version 0 only stored dense rows and had no number of features
+            columns = [
+                row[1]
+                for row in self._connection.execute("PRAGMA table_info(descriptors)")
+            ]
+            if "n_features" not in columns:
+                self._connection.execute(
+                    "ALTER TABLE descriptors ADD COLUMN n_features INTEGER"
+                )
+        self._connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the descriptor values in the in-memory cache in bytes."""
+        return self._values.nbytes
+
+    def canonicalize(self, smiles: str) -> str:
+        """Returns the memoized canonical form of a smiles string."""
+        with self._lock:
+            canonical = self._canonical_smiles.get(smiles)
+            if canonical is None:
+                canonical = smiles2canonical(smiles)
+                self._canonical_smiles.set(smiles, canonical)
+            return canonical
+
+    @staticmethod
+    def _to_blob(vals: _Row) -> Tuple[bytes, Optional[int]]:
+        # sparse rows are stored as their int64 indices followed by their data and
+        # the number of features, dense rows have no number of features
+        if sp.issparse(vals):
+            return (
+                vals.indices.astype(np.int64).tobytes()  # type: ignore
+                + vals.data.astype(np.float64).tobytes(),  # type: ignore
+                vals.shape[1],
+            )
+        return np.ascontiguousarray(vals, dtype=np.float64).tobytes(), None
+
+    @staticmethod
+    def _from_blob(blob: bytes, n_features: Optional[int]) -> _Row:
+        vals = np.frombuffer(blob, dtype=np.float64)
+        if n_features is None:
+            return vals
+        nnz = len(vals) // 2
+        return sp.csr_matrix(
+            (vals[nnz:], vals[:nnz].view(np.int64), [0, nnz]), shape=(1, n_features)
+        )
+
+    def _load(self, config: str, smiles: List[str]) -> Dict[str, _Row]:
+        if self._connection is None or len(smiles) == 0:
+            return {}
+        loaded = {}
+        # stay below the maximal number of variables in a SQLite statement
+        for start in range(0, len(smiles), 500):
+            chunk = smiles[start : start + 500]
+            rows = self._connection.execute(
+                "SELECT smiles, vals, n_features FROM descriptors WHERE config = ? "
+                "AND smiles IN "
+                f"({', '.join('?' * len(chunk))})",
+                [config, *chunk],
+            ).fetchall()
+            for smi, vals, n_features in rows:
+                loaded[smi] = self._from_blob(vals, n_features)
+        return loaded
+
+    def _store(self, config: str, values: Dict[str, _Row]):
+        if self._connection is None or len(values) == 0:
+            return
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO descriptors (config, smiles, vals, n_features) "
+            "VALUES (?, ?, ?, ?)",
+            [(config, smi, *self._to_blob(vals)) for smi, vals in values.items()],
+        )
+        self._connection.commit()
+
+    def featurize(
+        self,
+        config: str,
+        smiles: Sequence[str],
+        featurizer: Callable[[List[str]], Union[np.ndarray, sp.spmatrix]],
+    ) -> Union[np.ndarray, sp.csr_matrix]:
+        """Returns the descriptor values of the given smiles, only the molecules
+        which are not yet cached are passed to the featurizer.
+
+        Args:
+            config (str): Key describing the configuration of the featurizer.
+            smiles (Sequence[str]): The smiles.
+            featurizer (Callable[[List[str]], Union[np.ndarray, sp.spmatrix]]): Function
+                computing the descriptor values of a list of smiles, one row per
+                molecule.
+
+        Returns:
+            Union[np.ndarray, sp.csr_matrix]: Array holding the descriptor values as
+                floats, sparse if the featurizer returns sparse matrices.
+        """
+        canonical = [self.canonicalize(smi) for smi in smiles]
+        with self._lock:
+            values = {}
+            for smi in dict.fromkeys(canonical):
+                vals = self._values.get((config, smi))
+                if vals is not None:
+                    values[smi] = vals
+            loaded = self._load(config, [smi for smi in canonical if smi not in values])
+            for smi, vals in loaded.items():
+                self._values.set((config, smi), vals)
+            values.update(loaded)
+            missing = [smi for smi in dict.fromkeys(canonical) if smi not in values]
+            if len(missing) > 0:
+                computed = featurizer(missing)
+                if sp.issparse(computed):
+                    computed = sp.csr_matrix(computed, dtype=np.float64)
+                    new_values = {
+                        smi: computed.getrow(i) for i, smi in enumerate(missing)  # type: ignore
+                    }
+                else:
+                    computed = np.asarray(computed, dtype=np.float64)
+                    new_values = {smi: computed[i] for i, smi in enumerate(missing)}
+                    for vals in new_values.values():
+                        vals.flags.writeable = False
+                for smi, vals in new_values.items():
+                    self._values.set((config, smi), vals)
+                self._store(config, new_values)
+                values.update(new_values)
+        if len(canonical) == 0:
+            computed = featurizer([])
+            if sp.issparse(computed):
+                return sp.csr_matrix(computed, dtype=np.float64)
+            return np.asarray(computed, dtype=np.float64)
+        rows = [values[smi] for smi in canonical]
+        if sp.issparse(rows[0]):
+            return sp.vstack(rows, format="csr")
+        return np.stack(rows)
+
+    def clear(self):
+        """Removes all entries from the in-memory and the persistent cache."""
+        with self._lock:
+            self._values.clear()
+            self._canonical_smiles.clear()
+            if self._connection is not None:
+                self._connection.execute("DELETE FROM descriptors")
+                self._connection.commit()
+
+    def close(self):
+        """Closes the connection to the persistent cache."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+_featurization_cache: Optional[FeaturizationCache] = FeaturizationCache()
+
+
+def get_featurization_cache() -> Optional[FeaturizationCache]:
+    """Returns the featurization cache used by the molecular features."""
+    return _featurization_cache
+
+
+def set_featurization_cache(cache: Optional[FeaturizationCache]):
+    """Sets the featurization cache used by the molecular features.
+
+    Args:
+        cache (FeaturizationCache, optional): The cache, use None to disable caching.
+    """
+    global _featurization_cache
+    _featurization_cache = cache
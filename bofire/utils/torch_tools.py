@@ -2,6 +2,7 @@ import math
 from typing import Callable, Dict, List, Optional, Tuple, Type, Union
 
 import numpy as np
+import pandas as pd
 import torch
 from torch import Tensor
 
@@ -32,6 +33,25 @@ tkwargs = {
 }
 
 
+def sparse_frame_to_tensor(df: pd.DataFrame) -> Tensor:
+    """Converts a dataframe with sparse columns, as returned by `Inputs.transform`
+    for sparse molecular features, into a sparse COO tensor without densifying it.
+
+    Args:
+        df (pd.DataFrame): Dataframe whose columns are all sparse.
+
+    Returns:
+        Tensor: Sparse `n x d` COO tensor.
+    """
+    coo = df.sparse.to_coo()
+    return torch.sparse_coo_tensor(
+        np.vstack([coo.row, coo.col]),
+        coo.data,
+        size=coo.shape,
+        **tkwargs,
+    ).coalesce()
+
+
 def get_linear_constraints(
     domain: Domain,
     constraint: Union[Type[LinearEqualityConstraint], Type[LinearInequalityConstraint]],
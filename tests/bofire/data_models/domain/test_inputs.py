@@ -80,6 +80,30 @@ def test_inputs_get_categorical_combinations(inputs, data):
     assert inputs.get_categorical_combinations() == expected
 
 
+def test_inputs_iter_categorical_combinations():
+    inputs = Inputs(
+        features=[
+            CategoricalInput(key="f1", categories=["c11", "c12", "c13"]),
+            CategoricalInput(
+                key="f2", categories=["c21", "c22"], allowed=[True, False]
+            ),
+            DiscreteInput(key="f3", values=[1.0, 2.0, 5.0, 7.0]),
+            ContinuousInput(key="f4", bounds=(0, 1)),
+        ]
+    )
+    combinations = inputs.iter_categorical_combinations()
+    assert not isinstance(combinations, list)
+    assert list(combinations) == inputs.get_categorical_combinations()
+    assert inputs.get_number_of_categorical_combinations() == 12
+    assert len(inputs.get_categorical_combinations()) == 12
+    assert inputs.get_number_of_categorical_combinations(include=DiscreteInput) == 4
+    assert [f.key for f in inputs.get_categorical_combination_features()] == [
+        "f1",
+        "f3",
+    ]
+    assert Inputs(features=[]).get_number_of_categorical_combinations() == 1
+
+
 @pytest.mark.parametrize(
     "inputs, data, include, exclude",
     [
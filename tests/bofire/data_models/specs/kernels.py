@@ -76,5 +76,6 @@ specs.add_valid(
     kernels.TanimotoKernel,
     lambda: {
         "ard": True,
+        "packed": False,
     },
 )
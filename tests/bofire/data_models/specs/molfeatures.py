@@ -13,8 +13,10 @@ specs = Specs([])
 specs.add_valid(
     molfeatures.Fingerprints,
     lambda: {
+        "sparse": False,
         "bond_radius": random.randrange(1, 6),
         "n_bits": random.randrange(32, 2048),
+        "packed": False,
     },
 )
 
@@ -22,16 +24,19 @@ if RDKIT_AVAILABLE:
     specs.add_valid(
         molfeatures.Fragments,
         lambda: {
+            "sparse": False,
             "fragments": random.sample(
                 names.fragments, k=random.randrange(1, len(names.fragments))
-            )
+            ),
         },
     )
     specs.add_valid(
         molfeatures.FingerprintsFragments,
         lambda: {
+            "sparse": False,
             "bond_radius": random.randrange(1, 6),
             "n_bits": random.randrange(32, 2048),
+            "packed": False,
             "fragments": random.sample(
                 names.fragments, k=random.randrange(1, len(names.fragments))
             ),
@@ -42,6 +47,7 @@ if RDKIT_AVAILABLE:
         specs.add_valid(
             molfeatures.MordredDescriptors,
             lambda: {
-                "descriptors": random.sample(names.mordred, k=random.randrange(1, 10))
+                "sparse": False,
+                "descriptors": random.sample(names.mordred, k=random.randrange(1, 10)),
             },
         )
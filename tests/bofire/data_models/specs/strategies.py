@@ -33,8 +33,15 @@ strategy_commons = {
     "frequency_check": 1,
     "frequency_hyperopt": 0,
     "folds": 5,
+    "refit_every_n": 1,
     "maxiter": 2000,
     "batch_limit": 6,
+    "n_jobs": 1,
+    "screening_top_k": None,
+    "screening_num_samples": 64,
+    "combinatorial_chunk_size": 2048,
+    "ask_ahead": False,
+    "batch_method": "joint",
 }
 
 
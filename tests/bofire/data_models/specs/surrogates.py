@@ -69,6 +69,8 @@ specs.add_valid(
         "noise_prior": BOTORCH_NOISE_PRIOR().model_dump(),
         "input_preprocessing_specs": {},
         "dump": None,
+        "max_batch_rows": 2048,
+        "warm_start": False,
         "hyperconfig": SingleTaskGPHyperconfig().model_dump(),
     },
 )
@@ -94,6 +96,8 @@ specs.add_valid(
         "input_preprocessing_specs": {},
         "aggregations": None,
         "dump": None,
+        "max_batch_rows": 2048,
+        "warm_start": False,
         "kernel": InfiniteWidthBNNKernel(depth=3).model_dump(),
     },
 )
@@ -120,6 +124,8 @@ specs.add_valid(
         "noise_prior": BOTORCH_NOISE_PRIOR().model_dump(),
         "input_preprocessing_specs": {"cat1": CategoricalEncodingEnum.ONE_HOT},
         "dump": None,
+        "max_batch_rows": 2048,
+        "warm_start": False,
         "hyperconfig": None,
     },
 )
@@ -148,6 +154,8 @@ specs.add_valid(
         "noise_prior": BOTORCH_NOISE_PRIOR().model_dump(),
         "input_preprocessing_specs": {},
         "dump": None,
+        "max_batch_rows": 2048,
+        "warm_start": False,
         "hyperconfig": SingleTaskGPHyperconfig().model_dump(),
     },
 )
@@ -181,6 +189,7 @@ specs.add_valid(
         "ccp_alpha": 0.0,
         "max_samples": None,
         "dump": None,
+        "max_batch_rows": 2048,
         "hyperconfig": None,
         "scaler": ScalerEnum.IDENTITY,
         "output_scaler": ScalerEnum.IDENTITY,
@@ -211,10 +220,13 @@ specs.add_valid(
         "weight_decay": 0.0,
         "subsample_fraction": 1.0,
         "shuffle": True,
+        "early_stopping_patience": None,
+        "validation_fraction": 0.1,
         "scaler": ScalerEnum.IDENTITY,
         "output_scaler": ScalerEnum.IDENTITY,
         "input_preprocessing_specs": {},
         "dump": None,
+        "max_batch_rows": 2048,
         "hyperconfig": None,
     },
 )
@@ -243,10 +255,13 @@ specs.add_invalid(
         "weight_decay": 0.0,
         "subsample_fraction": 1.0,
         "shuffle": True,
+        "early_stopping_patience": None,
+        "validation_fraction": 0.1,
         "scaler": ScalerEnum.IDENTITY,
         "output_scaler": ScalerEnum.IDENTITY,
         "input_preprocessing_specs": {},
         "dump": None,
+        "max_batch_rows": 2048,
         "hyperconfig": None,
     },
     error=ValueError,
@@ -277,10 +292,13 @@ specs.add_valid(
         "weight_decay": 0.0,
         "subsample_fraction": 1.0,
         "shuffle": True,
+        "early_stopping_patience": None,
+        "validation_fraction": 0.1,
         "scaler": ScalerEnum.IDENTITY,
         "output_scaler": ScalerEnum.IDENTITY,
         "input_preprocessing_specs": {},
         "dump": None,
+        "max_batch_rows": 2048,
         "hyperconfig": None,
     },
 )
@@ -309,10 +327,13 @@ specs.add_invalid(
         "weight_decay": 0.0,
         "subsample_fraction": 1.0,
         "shuffle": True,
+        "early_stopping_patience": None,
+        "validation_fraction": 0.1,
         "scaler": ScalerEnum.IDENTITY,
         "output_scaler": ScalerEnum.IDENTITY,
         "input_preprocessing_specs": {},
         "dump": None,
+        "max_batch_rows": 2048,
         "hyperconfig": None,
     },
     error=ValueError,
@@ -386,10 +407,140 @@ specs.add_valid(
             "mol1": Fingerprints(n_bits=32, bond_radius=3).model_dump()
         },
         "dump": None,
+        "max_batch_rows": 2048,
+        "warm_start": False,
         "hyperconfig": None,
     },
 )
 
+specs.add_valid(
+    models.TanimotoGPSurrogate,
+    lambda: {
+        "inputs": Inputs(
+            features=[
+                MolecularInput(key="mol1"),
+            ]
+        ).model_dump(),
+        "outputs": Outputs(
+            features=[
+                features.valid(ContinuousOutput).obj(),
+            ]
+        ).model_dump(),
+        "kernel": ScaleKernel(
+            base_kernel=TanimotoKernel(ard=True, packed=True),
+            outputscale_prior=BOTORCH_SCALE_PRIOR(),
+        ).model_dump(),
+        "aggregations": None,
+        "scaler": ScalerEnum.IDENTITY,
+        "output_scaler": ScalerEnum.IDENTITY,
+        "noise_prior": BOTORCH_NOISE_PRIOR().model_dump(),
+        "input_preprocessing_specs": {
+            "mol1": Fingerprints(n_bits=64, packed=True).model_dump()
+        },
+        "dump": None,
+        "max_batch_rows": 2048,
+        "warm_start": False,
+        "hyperconfig": None,
+    },
+)
+
+specs.add_invalid(
+    models.TanimotoGPSurrogate,
+    lambda: {
+        "inputs": Inputs(
+            features=[
+                MolecularInput(key="mol1"),
+            ]
+        ).model_dump(),
+        "outputs": Outputs(
+            features=[
+                features.valid(ContinuousOutput).obj(),
+            ]
+        ).model_dump(),
+        "input_preprocessing_specs": {
+            "mol1": Fingerprints(n_bits=64, packed=True).model_dump()
+        },
+    },
+    error=ValueError,
+    message="The packed flag of the TanimotoKernel has to match the packed flag of the fingerprints.",
+)
+
+specs.add_invalid(
+    models.MixedTanimotoGPSurrogate,
+    lambda: {
+        "inputs": Inputs(
+            features=[
+                features.valid(ContinuousInput).obj(),
+                MolecularInput(key="mol1"),
+            ]
+        ).model_dump(),
+        "outputs": Outputs(
+            features=[
+                features.valid(ContinuousOutput).obj(),
+            ]
+        ).model_dump(),
+        "molecular_kernel": TanimotoKernel(ard=True, packed=True).model_dump(),
+        "input_preprocessing_specs": {
+            "mol1": Fingerprints(n_bits=32, bond_radius=3).model_dump(),
+        },
+    },
+    error=ValueError,
+    message="The packed flag of the TanimotoKernel has to match the packed flag of the fingerprints.",
+)
+
+specs.add_valid(
+    models.MinHashTanimotoGPSurrogate,
+    lambda: {
+        "inputs": Inputs(
+            features=[
+                MolecularInput(key="mol1"),
+            ]
+        ).model_dump(),
+        "outputs": Outputs(
+            features=[
+                features.valid(ContinuousOutput).obj(),
+            ]
+        ).model_dump(),
+        "aggregations": None,
+        "n_hashes": 256,
+        "hash_bits": 2,
+        "random_state": None,
+        "outputscale_prior": BOTORCH_SCALE_PRIOR().model_dump(),
+        "noise_prior": BOTORCH_NOISE_PRIOR().model_dump(),
+        "maxiter": 100,
+        "scaler": ScalerEnum.IDENTITY,
+        "output_scaler": ScalerEnum.STANDARDIZE,
+        "input_preprocessing_specs": {
+            "mol1": Fingerprints(n_bits=32, bond_radius=3).model_dump()
+        },
+        "dump": None,
+        "max_batch_rows": 2048,
+        "hyperconfig": None,
+    },
+)
+
+specs.add_invalid(
+    models.MinHashTanimotoGPSurrogate,
+    lambda: {
+        "inputs": Inputs(
+            features=[
+                MolecularInput(key="mol1"),
+                features.valid(ContinuousInput).obj(),
+            ]
+        ).model_dump(),
+        "outputs": Outputs(
+            features=[
+                features.valid(ContinuousOutput).obj(),
+            ]
+        ).model_dump(),
+        "input_preprocessing_specs": {
+            "mol1": Fingerprints(n_bits=32, bond_radius=3).model_dump()
+        },
+    },
+    error=ValueError,
+    message="MinHashTanimotoGPSurrogate can only be used if all inputs are molecular",
+)
+
 specs.add_valid(
     models.MixedTanimotoGPSurrogate,
     lambda: {
@@ -419,6 +570,8 @@ specs.add_valid(
         },
         "noise_prior": BOTORCH_NOISE_PRIOR().model_dump(),
         "dump": None,
+        "max_batch_rows": 2048,
+        "warm_start": False,
         "hyperconfig": None,
     },
 )
@@ -441,6 +594,7 @@ specs.add_valid(
         "coefficients": {"a": 2.0, "b": -3.0},
         "input_preprocessing_specs": {},
         "dump": None,
+        "max_batch_rows": 2048,
     },
 )
 
@@ -462,6 +616,7 @@ specs.add_invalid(
         "coefficients": {"a": 2.0, "b": -3.0, "c": 5.0},
         "input_preprocessing_specs": {},
         "dump": None,
+        "max_batch_rows": 2048,
     },
     error=ValueError,
     message="coefficient keys do not match input feature keys.",
@@ -485,6 +640,7 @@ specs.add_invalid(
         "coefficients": {"a": 2.0, "b": -3.0},
         "input_preprocessing_specs": {},
         "dump": None,
+        "max_batch_rows": 2048,
     },
     error=ValueError,
     message="Only numerical inputs are suppoerted for the `LinearDeterministicSurrogate`",
@@ -519,6 +675,8 @@ specs.add_valid(
             "task": CategoricalEncodingEnum.ORDINAL,
         },
         "dump": None,
+        "max_batch_rows": 2048,
+        "warm_start": False,
         "hyperconfig": MultiTaskGPHyperconfig().model_dump(),
     },
 )
@@ -553,6 +711,8 @@ specs.add_invalid(
             "task": CategoricalEncodingEnum.ONE_HOT,
         },
         "dump": None,
+        "max_batch_rows": 2048,
+        "warm_start": False,
         "hyperconfig": MultiTaskGPHyperconfig().model_dump(),
     },
     error=ValueError,
@@ -587,6 +747,8 @@ specs.add_invalid(
             "task": CategoricalEncodingEnum.ORDINAL,
         },
         "dump": None,
+        "max_batch_rows": 2048,
+        "warm_start": False,
         "hyperconfig": MultiTaskGPHyperconfig().model_dump(),
     },
     error=ValueError,
@@ -5,12 +5,15 @@ import pytest
 from pandas.testing import assert_frame_equal
 
 import bofire.data_models.molfeatures.names as names
+from bofire.data_models.domain.api import Inputs
+from bofire.data_models.features.api import MolecularInput
 from bofire.data_models.molfeatures.api import (
     Fingerprints,
     FingerprintsFragments,
     Fragments,
     MordredDescriptors,
 )
+from bofire.utils.cheminformatics import unpack_fingerprints
 
 RDKIT_AVAILABLE = importlib.util.find_spec("rdkit") is not None
 
@@ -68,6 +71,10 @@ def test_mordred():
             [f"fingerprint_{i}" for i in range(32)]
             + ["fr_unbrch_alkane", "fr_thiocyan"],
         ),
+        (
+            Fingerprints(n_bits=40, packed=True),
+            ["fingerprint_word_0", "fingerprint_word_1"],
+        ),
         (MordredDescriptors(descriptors=["NssCH2", "ATSC2d"]), ["NssCH2", "ATSC2d"]),
     ],
 )
@@ -117,6 +124,20 @@ def test_molfeatures_type_get_descriptor_values_fingerprints():
     assert_frame_equal(generated, pd.DataFrame.from_dict(values))
 
 
+@pytest.mark.skipif(not RDKIT_AVAILABLE, reason="requires rdkit")
+def test_molfeatures_type_get_descriptor_values_fingerprints_packed():
+    generated = Fingerprints(n_bits=32, packed=True).get_descriptor_values(VALID_SMILES)
+    expected = Fingerprints(n_bits=32).get_descriptor_values(VALID_SMILES)
+    assert generated.columns.tolist() == ["fingerprint_word_0"]
+    assert_frame_equal(
+        pd.DataFrame(
+            unpack_fingerprints(generated.values, n_bits=32).astype(float),
+            columns=expected.columns,
+        ),
+        expected,
+    )
+
+
 @pytest.mark.skipif(not RDKIT_AVAILABLE, reason="requires rdkit")
 def test_molfeatures_type_get_descriptor_values_fragments():
     values = {
@@ -201,6 +222,42 @@ def test_molfeatures_type_fingerprintsfragments_invalid(fragment_list):
         FingerprintsFragments(fragments=fragment_list)
 
 
+def test_molfeatures_type_fingerprints_invalid_packed_sparse():
+    with pytest.raises(ValueError, match="cannot be both packed and sparse"):
+        Fingerprints(packed=True, sparse=True)
+
+
+@pytest.mark.skipif(not RDKIT_AVAILABLE, reason="requires rdkit")
+@pytest.mark.parametrize(
+    "molfeatures",
+    [
+        Fingerprints(n_bits=32),
+        Fragments(),
+        FingerprintsFragments(n_bits=32),
+    ],
+)
+def test_molfeatures_get_descriptor_values_sparse(molfeatures):
+    inputs = Inputs(features=[MolecularInput(key="mol")])
+    experiments = pd.DataFrame({"mol": smiles}, index=[4, 3, 2, 1])
+    dense = inputs.transform(experiments, {"mol": molfeatures})
+    sparse_molfeatures = molfeatures.model_copy(update={"sparse": True})
+    transformed = inputs.transform(experiments, {"mol": sparse_molfeatures})
+    assert all(isinstance(d, pd.SparseDtype) for d in transformed.dtypes)
+    assert transformed.sparse.density < 0.5
+    assert_frame_equal(transformed.sparse.to_dense(), dense)
+    # the bounds can be computed from sparse values
+    assert MolecularInput(key="mol").get_bounds(
+        transform_type=sparse_molfeatures, values=experiments["mol"]
+    ) == MolecularInput(key="mol").get_bounds(
+        transform_type=molfeatures, values=experiments["mol"]
+    )
+
+
+def test_molfeatures_type_fingerprintsfragments_invalid_packed():
+    with pytest.raises(ValueError, match="Packed fingerprints are not supported"):
+        FingerprintsFragments(packed=True)
+
+
 @pytest.mark.skipif(not RDKIT_AVAILABLE, reason="requires rdkit")
 def test_molfeatures_type_get_descriptor_values_mordreddescriptors():
     values = {
@@ -19,6 +19,12 @@ from bofire.data_models.kernels.api import (
     TanimotoKernel,
 )
 from bofire.data_models.priors.api import BOTORCH_SCALE_PRIOR, GammaPrior
+from bofire.kernels.fingerprint_kernels.base_fingerprint_kernel import (
+    batch_packed_tanimoto_sim,
+    batch_tanimoto_sim,
+    popcount,
+)
+from bofire.utils.cheminformatics import pack_fingerprints
 from tests.bofire.data_models.specs.api import Spec
 
 try:
@@ -186,6 +192,12 @@ def test_map_continuous_kernel(kernel, ard_num_dims, active_dims, expected_kerne
             list(range(5)),
             bofire.kernels.fingerprint_kernels.tanimoto_kernel.TanimotoKernel,
         ),
+        (
+            TanimotoKernel(ard=False, packed=True),
+            10,
+            list(range(5)),
+            bofire.kernels.fingerprint_kernels.tanimoto_kernel.TanimotoKernel,
+        ),
     ],
 )
 def test_map_molecular_kernel(kernel, ard_num_dims, active_dims, expected_kernel):
@@ -202,3 +214,44 @@ def test_map_molecular_kernel(kernel, ard_num_dims, active_dims, expected_kernel
     else:
         assert k.ard_num_dims == len(active_dims)
     assert torch.eq(k.active_dims, torch.tensor(active_dims, dtype=torch.int64)).all()
+    assert k.metric == ("packed_tanimoto" if kernel.packed else "tanimoto")
+
+
+@pytest.mark.parametrize("n_bits", [32, 100])
+def test_packed_tanimoto_kernel(n_bits):
+    x1 = torch.randint(0, 2, (2, 7, n_bits)).to(torch.float64)
+    x2 = torch.randint(0, 2, (2, 5, n_bits)).to(torch.float64)
+    x1[0, 0] = 0.0
+    packed_x1, packed_x2 = (
+        torch.from_numpy(pack_fingerprints(x.reshape(-1, n_bits).numpy()))
+        .reshape(2, x.shape[-2], -1)
+        .to(torch.float64)
+        for x in (x1, x2)
+    )
+    k = bofire.kernels.fingerprint_kernels.tanimoto_kernel.TanimotoKernel()
+    k_packed = bofire.kernels.fingerprint_kernels.tanimoto_kernel.TanimotoKernel(
+        packed=True
+    )
+    expected = k(x1, x2).to_dense()
+    assert torch.allclose(k_packed(packed_x1, packed_x2).to_dense(), expected)
+    # chunked computation
+    assert torch.allclose(
+        batch_packed_tanimoto_sim(packed_x1, packed_x2, max_chunk_size=1), expected
+    )
+    assert torch.equal(popcount(packed_x1.long()).sum(-1), x1.sum(-1).long())
+
+
+def test_sparse_tanimoto_kernel():
+    x1 = torch.randint(0, 3, (7, 50)).to(torch.float64) * (torch.rand(7, 50) < 0.2)
+    x2 = torch.randint(0, 3, (5, 50)).to(torch.float64) * (torch.rand(5, 50) < 0.2)
+    x1[0] = 0.0
+    k = bofire.kernels.fingerprint_kernels.tanimoto_kernel.TanimotoKernel()
+    expected = k.forward(x1, x2)
+    for a, b in [
+        (x1.to_sparse(), x2.to_sparse()),
+        (x1, x2.to_sparse()),
+        (x1.to_sparse(), x2),
+    ]:
+        assert torch.allclose(k.forward(a, b), expected)
+    with pytest.raises(ValueError, match="only supported without batch dimensions"):
+        batch_tanimoto_sim(x1.unsqueeze(0).to_sparse(), x2.unsqueeze(0))
@@ -673,6 +673,36 @@ def test_base_get_categorical_combinations(
     c.assertCountEqual(combo, expected)
 
 
+@pytest.mark.parametrize(
+    "domain, descriptor_method, categorical_method, discrete_method",
+    [
+        (domains[0], "EXHAUSTIVE", "EXHAUSTIVE", "EXHAUSTIVE"),
+        (domains[0], "FREE", "EXHAUSTIVE", "FREE"),
+        (domains[1], "FREE", "EXHAUSTIVE", "FREE"),
+        (domains[3], "EXHAUSTIVE", "EXHAUSTIVE", "EXHAUSTIVE"),
+    ],
+)
+def test_base_get_categorical_combinations_by_index(
+    domain, descriptor_method, categorical_method, discrete_method
+):
+    data_model = DummyStrategyDataModel(
+        domain=domain,
+        descriptor_method=descriptor_method,
+        categorical_method=categorical_method,
+        discrete_method=discrete_method,
+    )
+    myStrategy = DummyStrategy(data_model=data_model)
+    combos = myStrategy.get_categorical_combinations()
+    assert list(myStrategy.iter_categorical_combinations()) == combos
+    assert myStrategy.get_number_of_categorical_combinations() == len(combos)
+    columns, values = myStrategy.get_categorical_combinations_by_index(
+        torch.arange(len(combos))
+    )
+    assert values.shape == (len(combos), len(columns))
+    for combo, row in zip(combos, values.tolist()):
+        assert dict(zip(columns, row)) == combo
+
+
 @pytest.mark.parametrize("domain", [(domains[0])])
 def test_base_invalid_pair_encoding_method(domain):
     with pytest.raises(ValueError):
@@ -818,6 +848,12 @@ def test_base_setup_ask_fixed_features(
     ):
         assert fixed_features is None
         assert fixed_features_list is not None
+        # the lazy sequence decodes the same combinations as the full enumeration
+        combinations = myStrategy.get_categorical_combinations()
+        assert len(fixed_features_list) == len(combinations)
+        assert list(fixed_features_list) == combinations
+        for i in [0, len(combinations) - 1]:
+            assert fixed_features_list[i] == pytest.approx(combinations[i])
     else:
         assert fixed_features == {}
         assert fixed_features_list is None
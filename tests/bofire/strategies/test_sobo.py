@@ -1,7 +1,10 @@
 import math
+from concurrent.futures import Future, ThreadPoolExecutor
 from itertools import chain
 
+import mock
 import numpy as np
+import pandas as pd
 import pytest
 import torch
 from botorch.acquisition import (
@@ -14,6 +17,7 @@ from botorch.acquisition import (
     qUpperConfidenceBound,
 )
 from botorch.acquisition.objective import ConstrainedMCObjective, GenericMCObjective
+from botorch.optim.optimize import optimize_acqf, optimize_acqf_discrete
 
 import bofire.data_models.strategies.api as data_models
 import tests.bofire.data_models.specs.api as specs
@@ -33,15 +37,24 @@ from bofire.data_models.acquisition_functions.api import (
 )
 from bofire.data_models.constraints.api import NChooseKConstraint
 from bofire.data_models.domain.api import Domain, Inputs, Outputs
-from bofire.data_models.features.api import ContinuousInput, ContinuousOutput
+from bofire.data_models.features.api import (
+    CategoricalInput,
+    ContinuousInput,
+    ContinuousOutput,
+)
 from bofire.data_models.objectives.api import (
     MaximizeObjective,
     MaximizeSigmoidObjective,
 )
 from bofire.data_models.strategies.api import LSRBO
 from bofire.data_models.strategies.api import RandomStrategy as RandomStrategyDataModel
+from bofire.data_models.surrogates.api import (
+    BotorchSurrogates,
+    SingleTaskGPSurrogate,
+)
 from bofire.data_models.unions import to_list
 from bofire.strategies.api import CustomSoboStrategy, RandomStrategy, SoboStrategy
+from bofire.utils.torch_tools import tkwargs
 from tests.bofire.strategies.test_base import domains
 
 # from tests.bofire.strategies.botorch.test_model_spec import VALID_MODEL_SPEC_LIST
@@ -478,3 +491,454 @@ def test_sobo_get_optimizer_options():
     strategy_data = data_models.SoboStrategy(domain=domain, maxiter=500, batch_limit=4)
     strategy = SoboStrategy(data_model=strategy_data)
     assert strategy._get_optimizer_options() == {"maxiter": 500, "batch_limit": 1}
+
+
+def test_sobo_warm_start():
+    benchmark = Himmelblau()
+    experiments = benchmark.f(
+        benchmark.domain.inputs.sample(12, seed=42), return_complete=True
+    )
+    strategy_data = data_models.SoboStrategy(
+        domain=benchmark.domain,
+        acquisition_function=qEI(),
+        surrogate_specs=BotorchSurrogates(
+            surrogates=[
+                SingleTaskGPSurrogate(
+                    inputs=benchmark.domain.inputs,
+                    outputs=benchmark.domain.outputs,
+                    warm_start=True,
+                )
+            ]
+        ),
+    )
+    strategy = SoboStrategy(data_model=strategy_data)
+    strategy.tell(experiments.iloc[:10])
+    surrogate = strategy.surrogates.surrogates[0]  # type: ignore
+    first_model = surrogate.model
+    strategy.tell(experiments.iloc[10:])
+    # the mapped surrogates are reused and refitted
+    assert strategy.surrogates.surrogates[0] is surrogate  # type: ignore
+    assert surrogate.model is not first_model
+    assert surrogate.model.train_targets.shape[-1] == 12
+    assert len(strategy.ask(1)) == 1
+
+
+def test_sobo_refit_every_n():
+    benchmark = Himmelblau()
+    experiments = benchmark.f(
+        benchmark.domain.inputs.sample(14, seed=42), return_complete=True
+    )
+    strategy_data = data_models.SoboStrategy(
+        domain=benchmark.domain, acquisition_function=qEI(), refit_every_n=3
+    )
+    strategy = SoboStrategy(data_model=strategy_data)
+    strategy.tell(experiments.iloc[:10])
+    surrogate = strategy.surrogates.surrogates[0]  # type: ignore
+    lengthscale = surrogate.model.covar_module.base_kernel.lengthscale.clone()
+    preds_before = strategy.predict(experiments.iloc[10:12])
+    # the next two tells only condition the fitted model on the new observations
+    for i in [11, 12]:
+        with mock.patch.object(
+            surrogate, "fit", side_effect=AssertionError("no refit expected")
+        ):
+            strategy.tell(experiments.iloc[i - 1 : i])
+        assert surrogate.model.train_targets.shape[-1] == i
+        assert torch.allclose(
+            surrogate.model.covar_module.base_kernel.lengthscale, lengthscale
+        )
+    # the predictions for the conditioned points moved towards the observations
+    preds_after = strategy.predict(experiments.iloc[10:12])
+    assert np.all(
+        np.abs(preds_after["y_pred"] - experiments.iloc[10:12]["y"])
+        < np.abs(preds_before["y_pred"] - experiments.iloc[10:12]["y"])
+    )
+    assert len(strategy.ask(1)) == 1
+    # the third tell triggers a full refit
+    with mock.patch.object(surrogate, "fit", wraps=surrogate.fit) as mock_fit:
+        strategy.tell(experiments.iloc[12:])
+    mock_fit.assert_called_once()
+    assert surrogate.model.train_targets.shape[-1] == 14
+    # replacing the experiments always triggers a full refit
+    with mock.patch.object(surrogate, "fit", wraps=surrogate.fit) as mock_fit:
+        strategy.tell(experiments, replace=True)
+    mock_fit.assert_called_once()
+
+
+def test_sobo_transformed_experiments_cache():
+    benchmark = Himmelblau()
+    experiments = benchmark.f(
+        benchmark.domain.inputs.sample(12, seed=42), return_complete=True
+    )
+    # add a duplicate and an invalid experiment
+    experiments = pd.concat(
+        [experiments, experiments.iloc[[0]], experiments.iloc[[1]]],
+        ignore_index=True,
+    )
+    experiments.loc[13, "valid_y"] = 0
+    strategy_data = data_models.SoboStrategy(
+        domain=benchmark.domain, acquisition_function=qEI()
+    )
+    strategy = SoboStrategy(data_model=strategy_data)
+    strategy.tell(experiments.iloc[:8])
+    X_train, _ = strategy.get_acqf_input_tensors()
+    assert X_train.shape == (8, 2)
+    X_cached = strategy._transformed_experiments_cache[1]  # type: ignore
+    strategy.tell(experiments.iloc[8:])
+    with mock.patch.object(
+        Inputs, "transform", autospec=True, side_effect=Inputs.transform
+    ) as mock_transform:
+        X_train, _ = strategy.get_acqf_input_tensors()
+        X_train_again, _ = strategy.get_acqf_input_tensors()
+    # only the newly told experiments are transformed
+    mock_transform.assert_called_once()
+    assert len(mock_transform.call_args.args[1]) == 6
+    assert torch.allclose(strategy._transformed_experiments_cache[1][:8], X_cached)  # type: ignore
+    clean_experiments = (
+        benchmark.domain.outputs.preprocess_experiments_all_valid_outputs(
+            experiments
+        ).drop_duplicates(subset=["x_1", "x_2"], keep="first")
+    )
+    expected = torch.from_numpy(
+        benchmark.domain.inputs.transform(
+            clean_experiments, strategy.input_preprocessing_specs
+        ).values
+    ).to(**tkwargs)
+    assert X_train.shape == (12, 2)
+    assert torch.allclose(X_train, expected)
+    assert torch.allclose(X_train_again, expected)
+    # replacing the experiments invalidates the cache
+    strategy.tell(experiments.iloc[:4], replace=True)
+    assert strategy._transformed_experiments_cache is None
+    X_train, _ = strategy.get_acqf_input_tensors()
+    assert X_train.shape == (4, 2)
+
+
+@pytest.mark.parametrize("candidate_count", [1, 2])
+def test_sobo_parallel_categorical_combinations(candidate_count):
+    domain = Domain.from_lists(
+        inputs=[
+            ContinuousInput(key="x_1", bounds=(0, 1)),
+            ContinuousInput(key="x_2", bounds=(0, 1)),
+            CategoricalInput(key="c", categories=["a", "b", "c"]),
+        ],
+        outputs=[ContinuousOutput(key="y")],
+    )
+    experiments = domain.inputs.sample(10, seed=42)
+    experiments["y"] = experiments.x_1 + experiments.c.map({"a": 0, "b": 1, "c": 2})
+    experiments["valid_y"] = 1
+    strategy_data = data_models.SoboStrategy(
+        domain=domain,
+        acquisition_function=qEI(),
+        n_jobs=3,
+        num_restarts=2,
+        num_raw_samples=64,
+    )
+    strategy = SoboStrategy(data_model=strategy_data)
+    strategy.tell(experiments)
+    with mock.patch(
+        "bofire.strategies.predictives.botorch.optimize_acqf",
+        wraps=optimize_acqf,
+    ) as mock_optimize_acqf:
+        candidates = strategy.ask(candidate_count=candidate_count)
+    # one optimization per combination and candidate
+    assert mock_optimize_acqf.call_count == 3 * candidate_count
+    assert len(candidates) == candidate_count
+    assert set(candidates.c).issubset({"a", "b", "c"})
+
+
+@pytest.mark.parametrize("candidate_count", [1, 2])
+def test_sobo_parallel_categorical_combinations_match_serial(candidate_count):
+    domain = Domain.from_lists(
+        inputs=[
+            ContinuousInput(key="x_1", bounds=(0, 1)),
+            ContinuousInput(key="x_2", bounds=(0, 1)),
+            CategoricalInput(key="c", categories=["a", "b", "c"]),
+        ],
+        outputs=[ContinuousOutput(key="y")],
+    )
+    experiments = domain.inputs.sample(10, seed=42)
+    experiments["y"] = experiments.x_1 + experiments.c.map({"a": 0, "b": 1, "c": 2})
+    experiments["valid_y"] = 1
+    # with as many raw samples as restarts and a seed, the initial conditions do
+    # not depend on the order in which the combinations are optimized
+    strategy_data = data_models.SoboStrategy(
+        domain=domain,
+        acquisition_function=qUCB(),
+        num_restarts=4,
+        num_raw_samples=4,
+    )
+    strategy = SoboStrategy(data_model=strategy_data)
+    strategy.tell(experiments)
+    bounds, _, _, ic_gen_kwargs, _, _, fixed_features_list = strategy._setup_ask()
+    acqf = strategy._get_acqfs(candidate_count)[0]
+    X_pending = acqf.X_pending
+    results = {}
+    for n_jobs in [1, 3]:
+        strategy.n_jobs = n_jobs
+        results[n_jobs] = strategy._optimize_acqf_mixed(
+            acq_function=acqf,
+            bounds=bounds,
+            q=candidate_count,
+            fixed_features_list=fixed_features_list,
+            ic_gen_kwargs=ic_gen_kwargs,
+            options={"seed": 42},
+        )
+    assert torch.allclose(results[1][0], results[3][0], atol=1e-5)
+    assert torch.allclose(results[1][1], results[3][1], atol=1e-5)
+    # the workers do not touch the original acquisition function
+    assert acqf.X_pending is X_pending
+
+
+def test_sobo_screen_categorical_combinations():
+    domain = Domain.from_lists(
+        inputs=[
+            ContinuousInput(key="x_1", bounds=(0, 1)),
+            CategoricalInput(key="c", categories=["a", "b", "c", "d", "e"]),
+        ],
+        outputs=[ContinuousOutput(key="y", objective=MaximizeObjective())],
+    )
+    experiments = domain.inputs.sample(15, seed=42)
+    experiments["y"] = experiments.x_1 + experiments.c.map(
+        {"a": 0, "b": 1, "c": 2, "d": 3, "e": 10}
+    )
+    experiments["valid_y"] = 1
+    strategy_data = data_models.SoboStrategy(
+        domain=domain,
+        acquisition_function=qUCB(beta=0.01),
+        screening_top_k=2,
+        screening_num_samples=16,
+        num_restarts=2,
+        num_raw_samples=64,
+    )
+    strategy = SoboStrategy(data_model=strategy_data)
+    strategy.tell(experiments)
+    with mock.patch(
+        "botorch.optim.optimize.optimize_acqf",
+        wraps=optimize_acqf,
+    ) as mock_optimize_acqf:
+        candidates = strategy.ask(candidate_count=1)
+    # only the two best combinations are optimized
+    assert mock_optimize_acqf.call_count == 2
+    assert candidates.c.iloc[0] == "e"
+
+
+@pytest.mark.parametrize("candidate_count", [1, 2])
+def test_sobo_fully_combinatorical_chunked(candidate_count):
+    benchmark = _CategoricalDiscreteHimmelblau()
+    strategy_data = data_models.SoboStrategy(
+        domain=benchmark.domain, combinatorial_chunk_size=7
+    )
+    strategy = SoboStrategy(data_model=strategy_data)
+    experiments = benchmark.f(
+        benchmark.domain.inputs.sample(10, seed=42), return_complete=True
+    )
+    strategy.tell(experiments=experiments)
+    acqf = strategy._get_acqfs(candidate_count)[0]
+    candidates = strategy._optimize_acqf_combinatorial(
+        acq_function=acqf, candidate_count=candidate_count
+    )
+    # reference: score all unmeasured combinations at once
+    choices = pd.DataFrame.from_dict(
+        [
+            {e[0]: e[1] for e in combi}  # type: ignore
+            for combi in benchmark.domain.inputs.get_categorical_combinations()
+        ]
+    )
+    merged = choices.merge(
+        experiments[benchmark.domain.inputs.get_keys()],
+        on=list(choices.columns),
+        how="left",
+        indicator=True,
+    )
+    choices = merged[merged["_merge"] == "left_only"].drop(columns=["_merge"])
+    expected, _ = optimize_acqf_discrete(
+        acq_function=acqf,
+        q=candidate_count,
+        unique=True,
+        choices=torch.from_numpy(
+            benchmark.domain.inputs.transform(
+                choices, specs=strategy.input_preprocessing_specs
+            ).values
+        ).to(**tkwargs),
+    )
+    assert torch.allclose(candidates, expected)
+    # measured combinations are never proposed again
+    proposals = strategy.ask(candidate_count=candidate_count)
+    assert (
+        proposals[benchmark.domain.inputs.get_keys()]
+        .merge(experiments[benchmark.domain.inputs.get_keys()])
+        .empty
+    )
+
+
+def test_sobo_ask_time_budget():
+    benchmark = Himmelblau()
+    experiments = benchmark.f(
+        benchmark.domain.inputs.sample(10, seed=42), return_complete=True
+    )
+    strategy_data = data_models.SoboStrategy(
+        domain=benchmark.domain, acquisition_function=qEI()
+    )
+    strategy = SoboStrategy(data_model=strategy_data)
+    strategy.tell(experiments)
+    with pytest.raises(ValueError, match="time_budget has to be positive"):
+        strategy.ask(1, time_budget=0)
+    # freeze the clock, so that the whole budget is left for the optimization
+    with mock.patch(
+        "bofire.strategies.predictives.botorch.optimize_acqf",
+        wraps=optimize_acqf,
+    ) as mock_optimize_acqf, mock.patch(
+        "bofire.strategies.predictives.botorch.time"
+    ) as mock_time:
+        mock_time.monotonic.return_value = 100.0
+        mock_time.perf_counter.return_value = 0.0
+        candidates = strategy.ask(1, time_budget=0.05)
+    assert len(candidates) == 1
+    kwargs = mock_optimize_acqf.call_args.kwargs
+    # a single optimize_acqf call gets the budget minus the safety margin
+    assert kwargs["timeout_sec"] == pytest.approx(0.8 * 0.05)
+    assert kwargs["raw_samples"] <= 1024
+    assert kwargs["num_restarts"] <= 8
+    assert kwargs["options"]["maxiter"] <= 2000
+    # the settings of the data model are restored afterwards
+    assert strategy.num_raw_samples == 1024
+    assert strategy.num_restarts == 8
+    assert strategy.maxiter == 2000
+    assert strategy._timeout_sec is None
+    with mock.patch(
+        "bofire.strategies.predictives.botorch.optimize_acqf",
+        wraps=optimize_acqf,
+    ) as mock_optimize_acqf:
+        strategy.ask(1)
+    assert mock_optimize_acqf.call_args.kwargs["timeout_sec"] is None
+    assert mock_optimize_acqf.call_args.kwargs["raw_samples"] == 1024
+
+
+def test_sobo_fully_combinatorical_time_budget():
+    benchmark = _CategoricalDiscreteHimmelblau()
+    strategy_data = data_models.SoboStrategy(
+        domain=benchmark.domain, combinatorial_chunk_size=1
+    )
+    strategy = SoboStrategy(data_model=strategy_data)
+    strategy.tell(benchmark.f(benchmark.domain.inputs.sample(10), return_complete=True))
+    acqf = strategy._get_acqfs(1)[0]
+    with mock.patch.object(acqf, "forward", wraps=acqf.forward) as mock_forward:
+        strategy._deadline = 0
+        candidates = strategy._optimize_acqf_combinatorial(
+            acq_function=acqf, candidate_count=1
+        )
+    # the deadline has passed, so the scoring stops after the first chunk
+    assert mock_forward.call_count == 1
+    assert candidates.shape[0] == 1
+
+
+def test_sobo_ask_ahead():
+    benchmark = Himmelblau()
+    experiments = benchmark.f(
+        benchmark.domain.inputs.sample(12, seed=42), return_complete=True
+    )
+    strategy_data = data_models.SoboStrategy(
+        domain=benchmark.domain, acquisition_function=qEI(), ask_ahead=True
+    )
+    strategy = SoboStrategy(data_model=strategy_data)
+    executors = []
+
+    def make_executor(*args, **kwargs):
+        executor = ThreadPoolExecutor(*args, **kwargs)
+        executor.shutdown = mock.Mock(wraps=executor.shutdown)
+        executors.append(executor)
+        return executor
+
+    with mock.patch(
+        "bofire.strategies.predictives.botorch.ThreadPoolExecutor",
+        side_effect=make_executor,
+    ):
+        strategy.tell(experiments.iloc[:10])
+    # the executor is shut down right away, its thread exits after the job
+    assert len(executors) == 1
+    executors[0].shutdown.assert_called_once_with(wait=False)
+    count, _, future = strategy._ask_ahead_job  # type: ignore
+    assert count == 1
+    precomputed = future.result()
+    with mock.patch.object(
+        SoboStrategy, "_get_acqfs", side_effect=AssertionError("no optimization")
+    ):
+        candidates = strategy.ask(1)
+    pd.testing.assert_frame_equal(candidates, precomputed)
+    assert strategy._ask_ahead_job is None
+    # a different candidate count cannot use the precomputed candidates
+    strategy.tell(experiments.iloc[10:11])
+    assert len(strategy.ask(2)) == 2
+    # new data discards the speculative work
+    strategy.tell(experiments.iloc[11:])
+    count, _, future = strategy._ask_ahead_job  # type: ignore
+    assert count == 2
+    strategy.add_experiments(experiments.iloc[:1])
+    assert strategy._ask_ahead_job is None
+    # changed pending candidates cannot use the precomputed candidates
+    strategy.tell(experiments.iloc[11:])
+    strategy._ask_ahead_job[2].result()  # type: ignore
+    strategy.add_candidates(experiments[benchmark.domain.inputs.get_keys()].iloc[:1])
+    with mock.patch.object(
+        SoboStrategy, "_get_acqfs", wraps=strategy._get_acqfs
+    ) as mock_get_acqfs:
+        strategy.ask(2)
+    mock_get_acqfs.assert_called_once()
+    # unfinished jobs are not waited for when asking within a time budget
+    running = mock.Mock(spec=Future)
+    running.done.return_value = False
+    strategy._ask_ahead_job = (1, strategy.candidates.copy(), running)
+    assert len(strategy.ask(1, time_budget=1.0)) == 1
+    running.cancel.assert_called_once()
+    running.result.assert_not_called()
+
+
+@pytest.mark.parametrize("batch_method", ["kriging_believer", "constant_liar"])
+def test_sobo_greedy_batch(batch_method):
+    benchmark = Himmelblau()
+    experiments = benchmark.f(
+        benchmark.domain.inputs.sample(10, seed=42), return_complete=True
+    )
+    strategy_data = data_models.SoboStrategy(
+        domain=benchmark.domain,
+        acquisition_function=qEI(),
+        batch_method=batch_method,
+    )
+    strategy = SoboStrategy(data_model=strategy_data)
+    strategy.tell(experiments)
+    with mock.patch.object(
+        SoboStrategy, "_get_acqfs", autospec=True, side_effect=SoboStrategy._get_acqfs
+    ) as mock_get_acqfs:
+        candidates = strategy.ask(4)
+    assert len(candidates) == 4
+    # every candidate is generated by an optimization with q=1
+    assert [call.args[1] for call in mock_get_acqfs.call_args_list] == [1] * 4
+    assert not candidates[benchmark.domain.inputs.get_keys()].duplicated().any()
+    # the predictions are not biased by the fantasized observations
+    pd.testing.assert_frame_equal(
+        candidates.drop(columns=benchmark.domain.inputs.get_keys()),
+        strategy.predict(candidates[benchmark.domain.inputs.get_keys()]),
+        check_like=True,
+    )
+    # the strategy itself is not modified by the fantasized observations
+    assert len(strategy.experiments) == 10  # type: ignore
+    assert strategy.surrogates.surrogates[0].model.train_targets.shape[-1] == 10  # type: ignore
+    assert strategy.candidates is None
+
+
+def test_sobo_predict_iter():
+    benchmark = Himmelblau()
+    experiments = benchmark.f(
+        benchmark.domain.inputs.sample(10, seed=42), return_complete=True
+    )
+    candidates = benchmark.domain.inputs.sample(15, seed=13)
+    strategy_data = data_models.SoboStrategy(
+        domain=benchmark.domain, acquisition_function=qEI()
+    )
+    strategy = SoboStrategy(data_model=strategy_data)
+    with pytest.raises(ValueError, match="Model not yet fitted."):
+        strategy.predict_iter(candidates)
+    strategy.tell(experiments)
+    chunks = list(strategy.predict_iter(candidates, chunksize=4))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 4, 3]
+    pd.testing.assert_frame_equal(pd.concat(chunks), strategy.predict(candidates))
@@ -1,5 +1,9 @@
+import mock
+import numpy as np
 import pandas as pd
 import pytest
+import torch
+from botorch.models import SingleTaskGP
 
 import bofire.surrogates.api as surrogates
 from bofire.data_models.domain.api import Inputs, Outputs
@@ -10,7 +14,12 @@ from bofire.data_models.features.api import (
     ContinuousInput,
     ContinuousOutput,
 )
-from bofire.data_models.surrogates.api import SingleTaskGPSurrogate
+from bofire.data_models.surrogates.api import (
+    RandomForestSurrogate,
+    SingleTaskGPSurrogate,
+)
+from bofire.surrogates.utils import fit_in_processes
+from bofire.utils.torch_tools import tkwargs
 
 
 @pytest.mark.parametrize("folds", [5, 3, 10, -1])
@@ -446,3 +455,142 @@ def test_model_cross_validate_stratified_invalid_feature_type(key):
         match="The feature to be stratified needs to be a DiscreteInput, CategoricalInput, CategoricalOutput, or ContinuousOutput",
     ):
         model.cross_validate(experiments, folds=5, stratified_feature=key)
+
+
+def test_model_cross_validate_parallel():
+    def hook(surrogate, X_train, y_train, X_test, y_test):
+        return list(X_test.index)
+
+    inputs = Inputs(
+        features=[
+            ContinuousInput(
+                key=f"x_{i+1}",
+                bounds=(-4, 4),
+            )
+            for i in range(2)
+        ]
+    )
+    outputs = Outputs(features=[ContinuousOutput(key="y")])
+    experiments = inputs.sample(n=12, seed=42)
+    experiments.eval("y=((x_1**2 + x_2 - 11)**2+(x_1 + x_2**2 -7)**2)", inplace=True)
+    experiments["valid_y"] = 1
+    model = SingleTaskGPSurrogate(
+        inputs=inputs,
+        outputs=outputs,
+    )
+    model = surrogates.map(model)
+    train_cv, test_cv, hook_results = model.cross_validate(
+        experiments, folds=4, random_state=1, hooks={"hook": hook}
+    )
+    preds = model.predict(experiments)
+    # the model is left fitted on the last fold as in the serial case
+    model.model = None
+    with mock.patch(
+        "bofire.surrogates.trainable.fit_in_processes", wraps=fit_in_processes
+    ) as mock_fit_in_processes:
+        train_cv_p, test_cv_p, hook_results_p = model.cross_validate(
+            experiments, folds=4, random_state=1, hooks={"hook": hook}, n_jobs=3
+        )
+    # the folds are fitted in worker processes, the hooks run in this process
+    mock_fit_in_processes.assert_called_once()
+    assert mock_fit_in_processes.call_args.kwargs["n_jobs"] == 3
+    assert model.model is not None
+    pd.testing.assert_frame_equal(model.predict(experiments), preds, rtol=1e-4)
+    assert hook_results == hook_results_p
+    for results, results_p in [(train_cv, train_cv_p), (test_cv, test_cv_p)]:
+        assert len(results.results) == len(results_p.results) == 4
+        for cvresult, cvresult_p in zip(results.results, results_p.results):
+            pd.testing.assert_series_equal(cvresult.observed, cvresult_p.observed)
+            pd.testing.assert_series_equal(
+                cvresult.predicted, cvresult_p.predicted, rtol=1e-4
+            )
+    with pytest.raises(ValueError, match="n_jobs has to be at least 1."):
+        model.cross_validate(experiments, folds=4, n_jobs=0)
+
+
+@pytest.mark.parametrize("folds", [-1, 3])
+def test_model_cross_validate_closed_form(folds):
+    inputs = Inputs(
+        features=[
+            ContinuousInput(
+                key=f"x_{i+1}",
+                bounds=(-4, 4),
+            )
+            for i in range(2)
+        ]
+    )
+    outputs = Outputs(features=[ContinuousOutput(key="y")])
+    experiments = inputs.sample(n=12, seed=42)
+    experiments.eval("y=((x_1**2 + x_2 - 11)**2+(x_1 + x_2**2 -7)**2)", inplace=True)
+    experiments["valid_y"] = 1
+    experiments["labcode"] = [f"l{i}" for i in range(12)]
+    model = surrogates.map(SingleTaskGPSurrogate(inputs=inputs, outputs=outputs))
+    train_cv, test_cv, hook_results = model.cross_validate(
+        experiments,
+        folds=folds,
+        random_state=1,
+        include_X=True,
+        include_labcodes=True,
+        closed_form=True,
+    )
+    assert hook_results == {}
+    n_folds = 12 if folds == -1 else folds
+    assert len(train_cv.results) == len(test_cv.results) == n_folds
+    # the hyperparameters are fixed at the values fitted on all experiments,
+    # the predictions have to match a gp with these hyperparameters conditioned
+    # on the training data of the fold
+    gp = model.model
+    gp.eval()
+    for train_result, test_result in zip(train_cv.results, test_cv.results):
+        assert len(train_result.observed) + len(test_result.observed) == 12
+        assert list(train_result.labcodes.index) == list(train_result.observed.index)
+        train_index = [experiments.index.get_loc(i) for i in train_result.X.index]
+        fold_gp = SingleTaskGP(
+            train_X=gp.train_inputs[0][train_index],
+            train_Y=gp.train_targets[train_index].unsqueeze(-1),
+            covar_module=gp.covar_module,
+            likelihood=gp.likelihood,
+            mean_module=gp.mean_module,
+        )
+        fold_gp.eval()
+        for result in [train_result, test_result]:
+            X = gp.transform_inputs(torch.from_numpy(result.X.values).to(**tkwargs))
+            with torch.no_grad():
+                posterior = fold_gp.posterior(X, observation_noise=True)
+                mean, var = gp.outcome_transform.untransform(
+                    posterior.mean, posterior.variance
+                )
+            np.testing.assert_allclose(
+                result.predicted.values, mean.squeeze(-1).numpy(), rtol=1e-5
+            )
+            np.testing.assert_allclose(
+                result.standard_deviation.values,
+                var.squeeze(-1).sqrt().numpy(),
+                rtol=1e-5,
+            )
+    with pytest.raises(ValueError, match="Hooks are not supported"):
+        model.cross_validate(
+            experiments,
+            folds=folds,
+            closed_form=True,
+            hooks={"hook": lambda surrogate, X_train, y_train, X_test, y_test: 1},
+        )
+
+
+def test_model_cross_validate_closed_form_invalid():
+    inputs = Inputs(
+        features=[
+            ContinuousInput(
+                key=f"x_{i+1}",
+                bounds=(-4, 4),
+            )
+            for i in range(2)
+        ]
+    )
+    outputs = Outputs(features=[ContinuousOutput(key="y")])
+    experiments = inputs.sample(n=12, seed=42)
+    experiments.eval("y=x_1 + x_2", inplace=True)
+    experiments["valid_y"] = 1
+    model = surrogates.map(RandomForestSurrogate(inputs=inputs, outputs=outputs))
+    with pytest.raises(ValueError, match="only available for single output exact"):
+        model.cross_validate(experiments, folds=3, closed_form=True)
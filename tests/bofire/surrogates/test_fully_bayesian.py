@@ -1,9 +1,13 @@
 import pytest
+import torch
+from botorch.models.fully_bayesian import SaasFullyBayesianSingleTaskGP
 from pandas.testing import assert_frame_equal
 
 import bofire.surrogates.api as surrogates
 from bofire.benchmarks.single import Himmelblau
 from bofire.data_models.surrogates.api import SaasSingleTaskGPSurrogate
+from bofire.surrogates.fully_bayesian import fit_saas_model_map
+from bofire.utils.torch_tools import tkwargs
 
 
 def test_SaasSingleTaskGPSurrogate_invalid_thinning():
@@ -38,3 +42,41 @@ def test_SaasSingleTaskGPSurrogate():
     assert preds.shape == (10, 2)
     preds2 = gp.predict(experiments)
     assert_frame_equal(preds, preds2)
+
+
+def test_SaasSingleTaskGPSurrogate_map():
+    bench = Himmelblau()
+    samples = bench.domain.inputs.sample(10)
+    experiments = bench.f(samples, return_complete=True)
+    data_model = SaasSingleTaskGPSurrogate(
+        inputs=bench.domain.inputs,
+        outputs=bench.domain.outputs,
+        fit_method="map",
+        num_restarts=4,
+    )
+    gp = surrogates.map(data_model)
+    gp.fit(experiments=experiments)
+    assert gp.model.num_mcmc_samples == 4
+    preds = gp.predict(experiments)
+    assert preds.shape == (10, 2)
+    dump = gp.dumps()
+    gp2 = surrogates.map(data_model=data_model)
+    gp2.loads(dump)
+    preds2 = gp2.predict(experiments)
+    assert_frame_equal(preds, preds2)
+
+
+def test_fit_saas_model_map_sparsity():
+    # only the first of ten dimensions is relevant
+    torch.manual_seed(42)
+    X = torch.rand(30, 10, **tkwargs)
+    Y = torch.sin(6 * X[:, :1])
+    Y = (Y - Y.mean()) / Y.std()
+    model = SaasFullyBayesianSingleTaskGP(train_X=X, train_Y=Y)
+    fit_saas_model_map(model, num_restarts=4)
+    assert model.num_mcmc_samples == 4
+    lengthscale = model.median_lengthscale
+    assert lengthscale.argmin() == 0
+    assert (lengthscale[1:] > 5 * lengthscale[0]).all()
+    posterior = model.posterior(X[:5])
+    assert posterior.mixture_mean.shape == torch.Size((5, 1))
@@ -1,8 +1,11 @@
 import importlib
 
+import mock
+import numpy as np
 import pandas as pd
 import pytest
 import torch
+from botorch.fit import fit_gpytorch_mll
 from botorch.models import MixedSingleTaskGP, SingleTaskGP
 from botorch.models.transforms.input import (
     ChainedInputTransform,
@@ -46,6 +49,8 @@ from bofire.data_models.surrogates.api import (
     SingleTaskGPSurrogate,
 )
 from bofire.data_models.surrogates.trainable import metrics2objectives
+from bofire.surrogates.utils import fit_gp_model
+from bofire.utils.torch_tools import tkwargs
 
 RDKIT_AVAILABLE = importlib.util.find_spec("rdkit") is not None
 
@@ -131,6 +136,118 @@ def test_SingleTaskGPModel(kernel, scaler, output_scaler):
     assert_frame_equal(preds, preds2)
 
 
+def test_SingleTaskGPModel_warm_start():
+    bench = Himmelblau()
+    experiments = bench.f(bench.domain.inputs.sample(12, seed=42), return_complete=True)
+    model = surrogates.map(
+        SingleTaskGPSurrogate(
+            inputs=bench.domain.inputs,
+            outputs=bench.domain.outputs,
+            warm_start=True,
+        )
+    )
+    with mock.patch(
+        "bofire.surrogates.utils.fit_gpytorch_mll", wraps=fit_gpytorch_mll
+    ) as mock_fit:
+        # the first fit is a cold one
+        model.fit(experiments.iloc[:10])
+        assert mock_fit.call_args.kwargs["max_attempts"] == 10
+        assert "optimizer_kwargs" not in mock_fit.call_args.kwargs
+        first_model = model.model
+        lengthscale = first_model.covar_module.base_kernel.lengthscale.clone()
+        # the second fit is warm started from the first one
+        model.fit(experiments)
+        assert model.model is not first_model
+        assert mock_fit.call_args_list[1].kwargs["max_attempts"] == 1
+        assert mock_fit.call_args_list[1].kwargs["optimizer_kwargs"] == {
+            "options": {"maxiter": 40}
+        }
+    # the previous model is untouched
+    assert torch.allclose(first_model.covar_module.base_kernel.lengthscale, lengthscale)
+    assert model.predict(experiments).shape == (12, 2)
+
+
+def test_SingleTaskGPModel_condition_on_observations():
+    bench = Himmelblau()
+    experiments = bench.f(bench.domain.inputs.sample(12, seed=42), return_complete=True)
+    model = surrogates.map(
+        SingleTaskGPSurrogate(
+            inputs=bench.domain.inputs,
+            outputs=bench.domain.outputs,
+            warm_start=True,
+        )
+    )
+    assert model.can_condition_on_observations is False
+    with pytest.raises(ValueError, match="Only fitted exact GP models"):
+        model.condition_on_observations(experiments.iloc[10:])
+    model.fit(experiments.iloc[:10])
+    assert model.can_condition_on_observations is True
+    noise = model.model.likelihood.noise.clone()
+    model.condition_on_observations(experiments.iloc[10:])
+    assert isinstance(model.model, SingleTaskGP)
+    assert model.model.train_targets.shape[-1] == 12
+    assert torch.allclose(model.model.likelihood.noise, noise)
+    assert model.predict(experiments).shape == (12, 2)
+    # a conditioned model can be used to warm start the next fit
+    model.fit(experiments)
+    assert model.model.train_targets.shape[-1] == 12
+
+
+def test_SingleTaskGPModel_warm_start_cold_restart():
+    bench = Himmelblau()
+    experiments = bench.f(bench.domain.inputs.sample(12, seed=42), return_complete=True)
+    model = surrogates.map(
+        SingleTaskGPSurrogate(
+            inputs=bench.domain.inputs,
+            outputs=bench.domain.outputs,
+            warm_start=True,
+        )
+    )
+    model.fit(experiments.iloc[:10])
+    # a large improvement over the copied hyperparameters on the new data triggers
+    # a cold restart
+    with mock.patch(
+        "bofire.surrogates.utils.get_mll_value", side_effect=[-1.0, 0.0, 1.0]
+    ), mock.patch(
+        "bofire.surrogates.utils.fit_gpytorch_mll", wraps=fit_gpytorch_mll
+    ) as mock_fit:
+        model.fit(experiments)
+    assert mock_fit.call_count == 2
+    assert mock_fit.call_args_list[1].kwargs["max_attempts"] == 10
+    # if the copied hyperparameters still explain the new data, the warm fit is kept
+    with mock.patch(
+        "bofire.surrogates.utils.get_mll_value", side_effect=[-1.0, -0.99]
+    ), mock.patch(
+        "bofire.surrogates.utils.fit_gpytorch_mll", wraps=fit_gpytorch_mll
+    ) as mock_fit:
+        model.fit(experiments)
+    assert mock_fit.call_count == 1
+    assert mock_fit.call_args.kwargs["max_attempts"] == 1
+
+
+def test_SingleTaskGPModel_warm_start_not_in_cross_validation():
+    bench = Himmelblau()
+    experiments = bench.f(bench.domain.inputs.sample(12, seed=42), return_complete=True)
+    model = surrogates.map(
+        SingleTaskGPSurrogate(
+            inputs=bench.domain.inputs,
+            outputs=bench.domain.outputs,
+            warm_start=True,
+        )
+    )
+    model.fit(experiments)
+    with mock.patch(
+        "bofire.surrogates.single_task_gp.fit_gp_model", wraps=fit_gp_model
+    ) as mock_fit:
+        model.cross_validate(experiments, folds=3)
+        assert mock_fit.call_count == 3
+        for call in mock_fit.call_args_list:
+            assert call.kwargs["warm_start_model"] is None
+        # a refit after the cross validation is warm started again
+        model.fit(experiments)
+        assert mock_fit.call_args.kwargs["warm_start_model"] is not None
+
+
 @pytest.mark.parametrize(
     "kernel, scaler, output_scaler",
     [
@@ -508,3 +625,64 @@ def test_MixedSingleTaskGPModel_mordred(kernel, scaler, output_scaler):
     model2.loads(dump)
     preds2 = model2.predict(experiments.iloc[:-1])
     assert_frame_equal(preds, preds2)
+
+
+def test_SingleTaskGPModel_predict_chunked():
+    bench = Himmelblau()
+    experiments = bench.f(bench.domain.inputs.sample(12, seed=42), return_complete=True)
+    candidates = bench.domain.inputs.sample(10, seed=13)
+    model = surrogates.map(
+        SingleTaskGPSurrogate(
+            inputs=bench.domain.inputs,
+            outputs=bench.domain.outputs,
+            max_batch_rows=4,
+        )
+    )
+    model.fit(experiments)
+    assert model._use_fast_pred_var
+    with mock.patch.object(
+        model.model, "posterior", wraps=model.model.posterior
+    ) as mock_posterior:
+        preds = model.predict(candidates)
+    # a single posterior per chunk
+    assert mock_posterior.call_count == 3
+    with torch.no_grad():
+        posterior = model.model.posterior(
+            torch.from_numpy(candidates.values).to(**tkwargs), observation_noise=True
+        )
+        mean = posterior.mean.numpy().ravel()
+        std = np.sqrt(posterior.variance.numpy().ravel())
+    np.testing.assert_allclose(preds["y_pred"], mean)
+    np.testing.assert_allclose(preds["y_sd"], std, rtol=1e-5)
+
+
+def test_SingleTaskGPModel_predict_iter(tmp_path):
+    bench = Himmelblau()
+    experiments = bench.f(bench.domain.inputs.sample(12, seed=42), return_complete=True)
+    candidates = bench.domain.inputs.sample(25, seed=13)
+    model = surrogates.map(
+        SingleTaskGPSurrogate(inputs=bench.domain.inputs, outputs=bench.domain.outputs)
+    )
+    model.fit(experiments)
+    expected = model.predict(candidates)
+    progress = []
+    chunks = list(
+        model.predict_iter(
+            candidates,
+            chunksize=10,
+            callback=lambda n, elapsed: progress.append(n),
+        )
+    )
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert progress == [10, 20, 25]
+    assert_frame_equal(pd.concat(chunks), expected)
+    # from an iterable of dataframes
+    chunks = model.predict_iter([candidates.iloc[:7], candidates.iloc[7:]], chunksize=1)
+    assert_frame_equal(pd.concat(chunks), expected)
+    # from a csv file
+    path = tmp_path / "candidates.csv"
+    candidates.to_csv(path, index=False)
+    preds = pd.concat(model.predict_iter(path, chunksize=10))
+    np.testing.assert_allclose(preds.values, expected.values)
+    with pytest.raises(ValueError, match="chunksize has to be at least 1"):
+        next(model.predict_iter(candidates, chunksize=0))
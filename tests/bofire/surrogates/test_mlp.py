@@ -1,3 +1,4 @@
+import mock
 import pytest
 import torch
 import torch.nn as nn
@@ -20,7 +21,15 @@ from bofire.data_models.surrogates.api import (
     RegressionMLPEnsemble,
     ScalerEnum,
 )
-from bofire.surrogates.mlp import MLP, MLPDataset, _MLPEnsemble, fit_mlp
+from bofire.surrogates.mlp import (
+    MLP,
+    BatchedMLP,
+    MLPDataset,
+    _MLPEnsemble,
+    _get_member_losses,
+    fit_batched_mlp,
+    fit_mlp,
+)
 from bofire.utils.torch_tools import tkwargs
 
 
@@ -169,6 +178,129 @@ def test_mlp_ensemble_forward():
     assert pred.shape == torch.Size((1, 2, 10, 1))
 
 
+@pytest.mark.parametrize(
+    "activation, dropout, final_activation",
+    [
+        ["relu", 0.0, "identity"],
+        ["tanh", 0.2, "softmax"],
+        ["logistic", 0.0, "identity"],
+    ],
+)
+def test_batched_mlp_from_mlps(activation, dropout, final_activation):
+    mlps = [
+        MLP(
+            input_size=2,
+            output_size=3,
+            hidden_layer_sizes=(5, 4),
+            activation=activation,
+            dropout=dropout,
+            final_activation=final_activation,
+        )
+        for _ in range(3)
+    ]
+    for mlp in mlps:
+        mlp.eval()
+    batched = BatchedMLP.from_mlps(mlps)
+    batched.eval()
+    assert batched.n_estimators == 3
+    assert batched.output_size == 3
+    X = torch.rand(2, 10, 2, **tkwargs)
+    pred = batched(X)
+    assert pred.shape == torch.Size((2, 3, 10, 3))
+    expected = torch.stack([mlp(X) for mlp in mlps], dim=-3)
+    assert torch.allclose(pred, expected)
+
+
+def test_batched_mlp_invalid():
+    with pytest.raises(ValueError):
+        BatchedMLP(n_estimators=2, input_size=2, activation="mama")
+    with pytest.raises(ValueError):
+        BatchedMLP(n_estimators=2, input_size=2, final_activation="mama")
+
+
+@pytest.mark.parametrize("shuffle", [True, False])
+def test_fit_batched_mlp(shuffle):
+    X = torch.rand(20, 2, **tkwargs)
+    y = X.sum(dim=-1, keepdim=True)
+    batched = BatchedMLP(n_estimators=3, input_size=2, hidden_layer_sizes=(8,))
+    initial = [p.detach().clone() for p in batched.parameters()]
+    sample_indices = torch.randint(20, (3, 20))
+    fit_batched_mlp(
+        mlp=batched,
+        X=X,
+        y=y,
+        sample_indices=sample_indices,
+        n_epoches=5,
+        lr=1e-2,
+        shuffle=shuffle,
+    )
+    assert not batched.training
+    for p, p0 in zip(batched.parameters(), initial):
+        assert not torch.allclose(p, p0)
+
+
+def test_fit_batched_mlp_members_independent():
+    # the gradients of the members are independent, so training a member on
+    # its own yields the same weights as training it within the ensemble
+    X = torch.rand(20, 2, **tkwargs)
+    y = X.sum(dim=-1, keepdim=True)
+    batched = BatchedMLP(n_estimators=2, input_size=2, hidden_layer_sizes=(8,))
+    single = BatchedMLP(n_estimators=1, input_size=2, hidden_layer_sizes=(8,))
+    with torch.no_grad():
+        for p, q in zip(single.parameters(), batched.parameters()):
+            p.copy_(q[:1])
+    sample_indices = torch.randint(20, (2, 20))
+    for mlp, indices in [(batched, sample_indices), (single, sample_indices[:1])]:
+        fit_batched_mlp(
+            mlp=mlp, X=X, y=y, sample_indices=indices, n_epoches=3, shuffle=False
+        )
+    for p, q in zip(single.parameters(), batched.parameters()):
+        assert torch.allclose(p, q[:1])
+
+
+def test_fit_batched_mlp_early_stopping():
+    X = torch.rand(20, 2, **tkwargs)
+    y = X.sum(dim=-1, keepdim=True)
+    batched = BatchedMLP(n_estimators=2, input_size=2, hidden_layer_sizes=(8,))
+    # validation losses per epoch, the first member is best after the second
+    # epoch, the second member after the first one
+    validation_losses = iter(
+        torch.tensor(losses, **tkwargs)
+        for losses in [[1.0, 1.0], [0.5, 2.0], [2.0, 2.0], [2.0, 2.0]]
+    )
+    snapshots = []
+
+    def get_member_losses(loss_function, outputs, targets):
+        if torch.is_grad_enabled():
+            return _get_member_losses(loss_function, outputs, targets)
+        snapshots.append([p.detach().clone() for p in batched.parameters()])
+        return next(validation_losses)
+
+    with mock.patch(
+        "bofire.surrogates.mlp._get_member_losses", side_effect=get_member_losses
+    ):
+        fit_batched_mlp(
+            mlp=batched,
+            X=X[:15],
+            y=y[:15],
+            sample_indices=torch.randint(15, (2, 15)),
+            n_epoches=50,
+            lr=0.1,
+            validation_data=(X[15:], y[15:]),
+            early_stopping_patience=2,
+        )
+    assert not batched.training
+    # the training stopped once both members did not improve for two epoches
+    assert len(snapshots) == 4
+    # the weights of the best epoch of every member are restored
+    assert not all(
+        torch.allclose(first, second) for first, second in zip(*snapshots[:2])
+    )
+    for i, parameter in enumerate(batched.parameters()):
+        assert torch.allclose(parameter[0], snapshots[1][i][0])
+        assert torch.allclose(parameter[1], snapshots[0][i][1])
+
+
 @pytest.mark.parametrize(
     "scaler, output_scaler",
     [
@@ -307,3 +439,23 @@ def test_mlp_classification_ensemble_fit():
     surrogate2.loads(dump)
     preds2 = surrogate2.predict(samples)
     assert_frame_equal(preds, preds2)
+
+
+@pytest.mark.parametrize("n_experiments", [1, 10])
+def test_mlp_ensemble_fit_early_stopping(n_experiments):
+    bench = Himmelblau()
+    samples = bench.domain.inputs.sample(n_experiments)
+    experiments = bench.f(samples, return_complete=True)
+    ens = RegressionMLPEnsemble(
+        inputs=bench.domain.inputs,
+        outputs=bench.domain.outputs,
+        n_estimators=3,
+        n_epochs=20,
+        early_stopping_patience=2,
+        validation_fraction=0.2,
+    )
+    surrogate = surrogates.map(ens)
+    surrogate.fit(experiments=experiments)
+    assert surrogate.model.mlp.n_estimators == 3
+    preds = surrogate.predict(experiments)
+    assert preds.shape == (n_experiments, 2)
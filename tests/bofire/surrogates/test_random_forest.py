@@ -57,6 +57,29 @@ def test_random_forest_forward():
     assert rf.num_outputs == 1
 
 
+@pytest.mark.parametrize("max_depth", [None, 3])
+def test_random_forest_forward_per_tree(max_depth):
+    bench = Himmelblau()
+    experiments = bench.f(bench.domain.inputs.sample(30, seed=42), return_complete=True)
+    rfr = RandomForestRegressor(
+        n_estimators=20, max_depth=max_depth, random_state=42
+    ).fit(experiments[["x_1", "x_2"]].values, experiments.y.values.ravel())
+    rf = _RandomForest(rf=rfr)
+    X = torch.from_numpy(bench.domain.inputs.sample(24, seed=13).values)
+    # also include the training points to hit the split thresholds exactly
+    X = torch.cat([X, torch.from_numpy(experiments[["x_1", "x_2"]].values)])
+    expected = np.stack([estimator.predict(X.numpy()) for estimator in rfr.estimators_])
+    pred = rf.forward(X)
+    assert pred.shape == torch.Size((20, 54, 1))
+    np.testing.assert_allclose(pred.squeeze(-1).numpy(), expected)
+    # arbitrary batch shapes
+    pred = rf.forward(X.reshape(3, 2, 9, 2))
+    assert pred.shape == torch.Size((3, 2, 20, 9, 1))
+    np.testing.assert_allclose(
+        pred.squeeze(-1).movedim(-2, 0).reshape(20, 54).numpy(), expected
+    )
+
+
 @pytest.mark.parametrize(
     "scaler, output_scaler",
     [
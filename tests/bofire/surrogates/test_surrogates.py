@@ -128,3 +128,26 @@ def test_is_fitted():
     assert d.is_fitted is False
     d.model = "dummymodel"  # type: ignore
     assert d.is_fitted is True
+
+
+def test_predict_array():
+    inputs = Inputs(
+        features=[
+            ContinuousInput(
+                key=f"x_{i+1}",
+                bounds=(-4, 4),
+            )
+            for i in range(5)
+        ]
+    )
+    outputs = Outputs(features=[ContinuousOutput(key="y")])
+    data_model = DummyDataModel(inputs=inputs, outputs=outputs)
+    model = Dummy(data_model=data_model)
+    X = inputs.sample(10).values
+    with pytest.raises(ValueError, match="Model is not fitted/available yet."):
+        model.predict_array(X)
+    model.model = "dummymodel"  # type: ignore
+    preds, stds = model.predict_array(X, validate=True)
+    assert preds.shape == stds.shape == (10, 1)
+    with pytest.raises(ValueError, match="Expected an array of shape"):
+        model.predict_array(X[:, :4], validate=True)
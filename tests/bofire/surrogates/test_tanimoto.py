@@ -11,6 +11,7 @@ from botorch.models.transforms.input import (
     OneHotToNumeric,
 )
 from botorch.models.transforms.outcome import Standardize
+from gpytorch.priors import GammaPrior
 from pandas.testing import assert_frame_equal
 from pydantic import ValidationError
 
@@ -36,11 +37,17 @@ from bofire.data_models.molfeatures.api import (
     MordredDescriptors,
 )
 from bofire.data_models.surrogates.api import (
+    MinHashTanimotoGPSurrogate,
     ScalerEnum,
 )
 from bofire.data_models.surrogates.mixed_tanimoto_gp import MixedTanimotoGPSurrogate
 from bofire.data_models.surrogates.tanimoto_gp import TanimotoGPSurrogate
+from bofire.kernels.fingerprint_kernels.base_fingerprint_kernel import (
+    batch_tanimoto_sim,
+)
+from bofire.surrogates.minhash_tanimoto_gp import _MinHashTanimotoGP
 from bofire.surrogates.mixed_tanimoto_gp import MixedTanimotoGP
+from bofire.utils.torch_tools import tkwargs
 
 RDKIT_AVAILABLE = importlib.util.find_spec("rdkit") is not None
 
@@ -128,6 +135,39 @@ def test_TanimotoGP(kernel, specs):
     assert_frame_equal(preds, preds2)
 
 
+@pytest.mark.skipif(not RDKIT_AVAILABLE, reason="requires rdkit")
+def test_TanimotoGP_packed():
+    inputs = Inputs(features=[MolecularInput(key="x_1")])
+    outputs = Outputs(features=[ContinuousOutput(key="y")])
+    experiments = pd.DataFrame(
+        [
+            ["CC(=O)Oc1ccccc1C(=O)O", 88.0],
+            ["c1ccccc1", 35.0],
+            ["[CH3][CH2][OH]", 69.0],
+            ["N[C@](C)(F)C(=O)O", 20.0],
+        ],
+        columns=["x_1", "y"],
+    )
+    experiments["valid_y"] = 1
+    preds = []
+    for packed in [False, True]:
+        torch.manual_seed(42)
+        model = surrogates.map(
+            TanimotoGPSurrogate(
+                inputs=inputs,
+                outputs=outputs,
+                kernel=ScaleKernel(base_kernel=TanimotoKernel(packed=packed)),
+                input_preprocessing_specs={
+                    "x_1": Fingerprints(n_bits=48, packed=packed)
+                },
+            )
+        )
+        model.fit(experiments)
+        assert model.model.train_inputs[0].shape[-1] == (2 if packed else 48)
+        preds.append(model.predict(experiments))
+    assert_frame_equal(preds[0], preds[1], atol=1e-4)
+
+
 def test_MixedTanimotoGPModel_invalid_preprocessing():
     inputs = Inputs(
         features=[
@@ -526,3 +566,86 @@ def test_MixedTanimotoGP_with_mordred(
     model2.loads(dump)
     preds2 = model2.predict(experiments.iloc[:-1])
     assert_frame_equal(preds, preds2)
+
+
+def test_MinHashTanimotoGP_embedding():
+    torch.manual_seed(42)
+    X = (torch.rand(20, 64) < 0.2).to(**tkwargs)
+    X[0] = 0.0
+    model = _MinHashTanimotoGP(
+        n_features=64,
+        n_hashes=2048,
+        hash_bits=2,
+        outputscale_prior=GammaPrior(2.0, 0.15),
+        noise_prior=GammaPrior(1.1, 0.05),
+        random_state=42,
+    )
+    embedding = model.embed(X)
+    assert embedding.shape == (20, 2048 * 4)
+    # empty fingerprints are mapped to zero
+    assert torch.all(embedding[0] == 0)
+    similarities = embedding[1:] @ embedding[1:].T
+    assert torch.allclose(similarities.diagonal(), torch.ones(19, **tkwargs))
+    assert torch.allclose(similarities, batch_tanimoto_sim(X[1:], X[1:]), atol=0.1)
+    # sparse and dense inputs give the same embedding
+    assert torch.allclose(model.embed(X.to_sparse()), embedding)
+
+
+def test_MinHashTanimotoGPModel_invalid_preprocessing_mordred():
+    inputs = Inputs(features=[MolecularInput(key="x_mol")])
+    outputs = Outputs(features=[ContinuousOutput(key="y")])
+    with pytest.raises(
+        ValidationError,
+        match="MinHashTanimotoGPSurrogate can only be used if all inputs are molecular",
+    ):
+        MinHashTanimotoGPSurrogate(
+            inputs=inputs,
+            outputs=outputs,
+            input_preprocessing_specs={
+                "x_mol": MordredDescriptors(descriptors=["NssCH2", "ATSC2d"])
+            },
+        )
+
+
+@pytest.mark.skipif(not RDKIT_AVAILABLE, reason="requires rdkit")
+@pytest.mark.parametrize(
+    "specs",
+    [
+        {"x_1": Fingerprints(n_bits=32)},
+        {"x_1": Fingerprints(n_bits=32, sparse=True)},
+        {"x_1": Fragments()},
+        {"x_1": FingerprintsFragments(n_bits=32)},
+    ],
+)
+def test_MinHashTanimotoGP(specs):
+    inputs = Inputs(features=[MolecularInput(key="x_1")])
+    outputs = Outputs(features=[ContinuousOutput(key="y")])
+    experiments = [
+        ["CC(=O)Oc1ccccc1C(=O)O", 88.0],
+        ["c1ccccc1", 35.0],
+        ["[CH3][CH2][OH]", 69.0],
+        ["N[C@](C)(F)C(=O)O", 20.0],
+    ]
+    experiments = pd.DataFrame(experiments, columns=["x_1", "y"])
+    experiments["valid_y"] = 1
+    data_model = MinHashTanimotoGPSurrogate(
+        inputs=inputs,
+        outputs=outputs,
+        input_preprocessing_specs=specs,
+        random_state=42,
+        # fit in more than one chunk
+        max_batch_rows=3,
+    )
+    model = surrogates.map(data_model)
+    model.fit(experiments)
+    dump = model.dumps()
+    preds = model.predict(experiments.iloc[:-1])
+    assert preds.shape == (3, 2)
+    assert isinstance(model.model, _MinHashTanimotoGP)
+    assert isinstance(model.model.outcome_transform, Standardize)
+    assert model.is_compatibilized is False
+    # reload the model from dump and check for equality in predictions
+    model2 = surrogates.map(data_model)
+    model2.loads(dump)
+    preds2 = model2.predict(experiments.iloc[:-1])
+    assert_frame_equal(preds, preds2)
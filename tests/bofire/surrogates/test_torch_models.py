@@ -1,10 +1,13 @@
+import os
+import time
 from importlib.util import find_spec
 
+import botorch
 import numpy as np
 import pandas as pd
 import pytest
 import torch
-from botorch.models import MixedSingleTaskGP, SingleTaskGP
+from botorch.models import MixedSingleTaskGP, ModelListGP, SingleTaskGP
 from botorch.models.deterministic import DeterministicModel
 from botorch.models.transforms.input import (
     ChainedInputTransform,
@@ -13,6 +16,7 @@ from botorch.models.transforms.input import (
     Normalize,
     OneHotToNumeric,
 )
+from botorch.models.transforms.outcome import Standardize
 from pandas.testing import assert_frame_equal
 from torch import Tensor
 
@@ -29,6 +33,7 @@ from bofire.data_models.features.api import (
 from bofire.data_models.surrogates.api import ScalerEnum
 from bofire.surrogates.api import BotorchSurrogates
 from bofire.surrogates.random_forest import _RandomForest
+from bofire.surrogates.single_task_gp import SingleTaskGPSurrogate
 from bofire.utils.torch_tools import tkwargs
 
 CLOUDPICKLE_NOT_AVAILABLE = find_spec("cloudpickle") is None
@@ -708,6 +713,244 @@ def test_botorch_models_fit_and_compatibilize():
     assert isinstance(botorch_surrogates.surrogates[0].model.input_transform, Normalize)
 
 
+def test_botorch_models_predict_array():
+    inputs = Inputs(
+        features=[ContinuousInput(key=f"x_{i+1}", bounds=(-4, 4)) for i in range(2)]
+        + [CategoricalInput(key="x_cat", categories=["mama", "papa"])]
+    )
+    experiments = inputs.sample(n=10, seed=42)
+    experiments.eval("y=((x_1**2 + x_2 - 11)**2+(x_1 + x_2**2 -7)**2)", inplace=True)
+    experiments["y2"] = experiments.y * np.where(experiments.x_cat == "mama", 5, 0.5)
+    experiments["valid_y"] = 1
+    experiments["valid_y2"] = 1
+    data_model1 = data_models.SingleTaskGPSurrogate(
+        inputs=inputs.get_by_keys(["x_1", "x_2"]),
+        outputs=Outputs(features=[ContinuousOutput(key="y")]),
+    )
+    data_model2 = data_models.MixedSingleTaskGPSurrogate(
+        inputs=inputs,
+        outputs=Outputs(features=[ContinuousOutput(key="y2")]),
+        input_preprocessing_specs={"x_cat": CategoricalEncodingEnum.ONE_HOT},
+    )
+    botorch_surrogates = BotorchSurrogates(
+        data_model=data_models.BotorchSurrogates(surrogates=[data_model1, data_model2])
+    )
+    botorch_surrogates.fit(experiments=experiments)
+    candidates = inputs.sample(n=5, seed=13)
+    preds1 = botorch_surrogates.surrogates[0].predict(candidates)
+    preds2 = botorch_surrogates.surrogates[1].predict(candidates)
+    X = inputs.transform(
+        candidates, specs={"x_cat": CategoricalEncodingEnum.ONE_HOT}
+    ).values
+    # single surrogate on its own encoding
+    mean, std = botorch_surrogates.surrogates[0].predict_array(X[:, :2])
+    assert np.allclose(mean[:, 0], preds1.y_pred.values)
+    assert np.allclose(std[:, 0], preds1.y_sd.values)
+    # all surrogates before and after making them compatible
+    for compatibilize in [False, True]:
+        if compatibilize:
+            botorch_surrogates.compatibilize(
+                inputs=inputs,
+                outputs=Outputs(
+                    features=[ContinuousOutput(key="y"), ContinuousOutput(key="y2")]
+                ),
+            )
+            assert botorch_surrogates.surrogates[0].is_compatibilized
+        for X_ in [X, torch.from_numpy(X)]:
+            mean, std = botorch_surrogates.predict_array(X_, validate=True)
+            assert mean.shape == std.shape == (5, 2)
+            assert np.allclose(mean[:, 0], preds1.y_pred.values)
+            assert np.allclose(mean[:, 1], preds2.y2_pred.values)
+            assert np.allclose(std[:, 1], preds2.y2_sd.values)
+    # validation
+    with pytest.raises(ValueError, match="Expected an array of shape"):
+        botorch_surrogates.surrogates[1].predict_array(X[:, :3], validate=True)
+    X[0, 0] = np.nan
+    with pytest.raises(ValueError, match="Not all values in the inputs are finite."):
+        botorch_surrogates.predict_array(X, validate=True)
+
+
+def test_botorch_models_fit_parallel():
+    inputs = Inputs(
+        features=[ContinuousInput(key=f"x_{i+1}", bounds=(-4, 4)) for i in range(2)]
+    )
+    experiments = inputs.sample(n=10, seed=42)
+    experiments.eval("y1=((x_1**2 + x_2 - 11)**2+(x_1 + x_2**2 -7)**2)", inplace=True)
+    experiments.eval("y2=x_1 + x_2", inplace=True)
+    experiments.eval("y3=x_1 * x_2", inplace=True)
+    outputs = [ContinuousOutput(key=f"y{i+1}") for i in range(3)]
+    for output in outputs:
+        experiments[f"valid_{output.key}"] = 1
+    surrogate_specs = [
+        data_models.SingleTaskGPSurrogate(
+            inputs=inputs, outputs=Outputs(features=[output])
+        )
+        for output in outputs
+    ]
+    sequential = BotorchSurrogates(
+        data_model=data_models.BotorchSurrogates(surrogates=surrogate_specs)
+    )
+    sequential.fit(experiments)
+    parallel = BotorchSurrogates(
+        data_model=data_models.BotorchSurrogates(surrogates=surrogate_specs, n_jobs=2)
+    )
+    num_threads = torch.get_num_threads()
+    experiments_copy = experiments.copy()
+    parallel.fit(experiments)
+    assert torch.get_num_threads() == num_threads
+    assert_frame_equal(experiments, experiments_copy)
+    candidates = inputs.sample(n=5, seed=13)
+    for model, other in zip(sequential.surrogates, parallel.surrogates):
+        assert model.outputs == other.outputs
+        assert_frame_equal(model.predict(candidates), other.predict(candidates))
+    # the fitted models can be combined as usual
+    combined = parallel.compatibilize(inputs=inputs, outputs=Outputs(features=outputs))
+    assert combined.num_outputs == 3
+    # errors in the workers are raised
+    with pytest.raises(ValueError):
+        parallel.fit(experiments.drop(columns=["y2"]))
+    assert torch.get_num_threads() == num_threads
+
+
+class _SlowSingleTaskGPSurrogate(SingleTaskGPSurrogate):
+    """Records when and in which process it was fitted."""
+
+    def _fit(self, X, Y, **kwargs):
+        start = time.time()
+        # make the fit long enough to outlast the startup of the other workers
+        time.sleep(2.0)
+        super()._fit(X, Y, **kwargs)
+        self.fit_record = (os.getpid(), start, time.time())
+
+
+def test_botorch_models_fit_parallel_overlaps_fits():
+    inputs = Inputs(
+        features=[ContinuousInput(key=f"x_{i+1}", bounds=(-4, 4)) for i in range(2)]
+    )
+    experiments = inputs.sample(n=10, seed=42)
+    outputs = [ContinuousOutput(key=f"y{i+1}") for i in range(2)]
+    for output in outputs:
+        experiments.eval(f"{output.key}=x_1 + x_2", inplace=True)
+        experiments[f"valid_{output.key}"] = 1
+    surrogate_specs = [
+        data_models.SingleTaskGPSurrogate(
+            inputs=inputs, outputs=Outputs(features=[output])
+        )
+        for output in outputs
+    ]
+    parallel = BotorchSurrogates(
+        data_model=data_models.BotorchSurrogates(surrogates=surrogate_specs, n_jobs=2)
+    )
+    parallel.surrogates = [
+        _SlowSingleTaskGPSurrogate(data_model=spec) for spec in surrogate_specs
+    ]
+    parallel.fit(experiments)
+    pids, starts, ends = zip(*(model.fit_record for model in parallel.surrogates))
+    # the GPs are fitted at the same time in separate processes
+    assert len(set(pids)) == 2
+    assert os.getpid() not in pids
+    assert max(starts) < min(ends)
+    assert all(model.model is not None for model in parallel.surrogates)
+
+
+class _StandardizingSingleTaskGP(SingleTaskGP):
+    """Emulates botorch>=0.12, in which `SingleTaskGP` standardizes by default."""
+
+    def __init__(self, train_X, train_Y, *args, **kwargs):
+        kwargs.setdefault("outcome_transform", Standardize(m=train_Y.shape[-1]))
+        super().__init__(train_X, train_Y, *args, **kwargs)
+
+
+@pytest.mark.parametrize("default_standardize", [False, True])
+@pytest.mark.parametrize(
+    "output_scaler, fuse_models",
+    [
+        (ScalerEnum.STANDARDIZE, True),
+        (ScalerEnum.IDENTITY, True),
+        (ScalerEnum.STANDARDIZE, False),
+    ],
+)
+def test_botorch_models_fuse(
+    output_scaler, fuse_models, default_standardize, monkeypatch
+):
+    if default_standardize:
+        monkeypatch.setattr(botorch.models, "SingleTaskGP", _StandardizingSingleTaskGP)
+    inputs = Inputs(
+        features=[ContinuousInput(key=f"x_{i+1}", bounds=(-4, 4)) for i in range(2)]
+    )
+    experiments = inputs.sample(n=12, seed=42)
+    experiments.eval("y1=((x_1**2 + x_2 - 11)**2+(x_1 + x_2**2 -7)**2)", inplace=True)
+    experiments.eval("y2=x_1 + x_2", inplace=True)
+    experiments.eval("y3=x_1 * x_2", inplace=True)
+    outputs = Outputs(features=[ContinuousOutput(key=f"y{i+1}") for i in range(3)])
+    for key in outputs.get_keys():
+        experiments[f"valid_{key}"] = 1
+    botorch_surrogates = BotorchSurrogates(
+        data_model=data_models.BotorchSurrogates(
+            # the order of the surrogates differs from the order of the outputs
+            surrogates=[
+                data_models.SingleTaskGPSurrogate(
+                    inputs=inputs,
+                    outputs=Outputs(features=[outputs.get_by_key(key)]),
+                    output_scaler=output_scaler,
+                )
+                for key in ["y2", "y1", "y3"]
+            ],
+            # fusion is the default
+            **({} if fuse_models else {"fuse_models": False}),
+        )
+    )
+    botorch_surrogates.fit(experiments)
+    combined = botorch_surrogates.compatibilize(inputs=inputs, outputs=outputs)
+    if fuse_models:
+        assert isinstance(combined, SingleTaskGP)
+        assert combined.num_outputs == 3
+        if output_scaler == ScalerEnum.IDENTITY:
+            assert not hasattr(combined, "outcome_transform")
+        assert combined.covar_module.batch_shape == torch.Size([3])
+    else:
+        assert isinstance(combined, ModelListGP)
+    candidates = inputs.sample(n=5, seed=13)
+    X = torch.from_numpy(candidates.values).to(**tkwargs)
+    with torch.no_grad():
+        posterior = combined.posterior(X, observation_noise=True)
+        mean, std = posterior.mean.numpy(), posterior.variance.sqrt().numpy()
+    for i, key in enumerate(outputs.get_keys()):
+        preds = [s for s in botorch_surrogates.surrogates if s.outputs[0].key == key][
+            0
+        ].predict(candidates)
+        assert np.allclose(mean[:, i], preds[f"{key}_pred"])
+        assert np.allclose(std[:, i], preds[f"{key}_sd"])
+
+
+def test_botorch_models_fuse_different_training_data():
+    inputs = Inputs(
+        features=[ContinuousInput(key=f"x_{i+1}", bounds=(-4, 4)) for i in range(2)]
+    )
+    experiments = inputs.sample(n=12, seed=42)
+    experiments.eval("y1=x_1 - x_2", inplace=True)
+    experiments.eval("y2=x_1 + x_2", inplace=True)
+    experiments["valid_y1"] = 1
+    experiments["valid_y2"] = 1
+    # y2 is missing for one experiment
+    experiments.loc[0, "valid_y2"] = 0
+    outputs = Outputs(features=[ContinuousOutput(key=f"y{i+1}") for i in range(2)])
+    botorch_surrogates = BotorchSurrogates(
+        data_model=data_models.BotorchSurrogates(
+            surrogates=[
+                data_models.SingleTaskGPSurrogate(
+                    inputs=inputs, outputs=Outputs(features=[output])
+                )
+                for output in outputs
+            ],
+            fuse_models=True,
+        )
+    )
+    botorch_surrogates.fit(experiments)
+    combined = botorch_surrogates.compatibilize(inputs=inputs, outputs=outputs)
+    assert isinstance(combined, ModelListGP)
+
+
 def test_botorch_models_rf_fit_and_compatibilize():
     # model 1
     inputs = Inputs(
@@ -2,16 +2,21 @@ import importlib
 
 import numpy as np
 import pytest
+import scipy.sparse as sp
 
 from bofire.utils.cheminformatics import (  # smiles2bag_of_characters,
+    featurize_batch,
+    pack_fingerprints,
     smiles2fingerprints,
     smiles2fragments,
     smiles2fragments_fingerprints,
     smiles2mol,
     smiles2mordred,
+    unpack_fingerprints,
 )
 
 RDKIT_AVAILABLE = importlib.util.find_spec("rdkit") is not None
+MORDRED_AVAILABLE = importlib.util.find_spec("mordred") is not None
 
 
 @pytest.mark.skipif(not RDKIT_AVAILABLE, reason="requires rdkit")
@@ -372,3 +377,80 @@ def test_smiles2mordred():
 #     smiles = ["CC(=O)Oc1ccccc1C(=O)O", "c1ccccc1"]
 #     desc = smiles2bag_of_characters(smiles=smiles)
 #     assert desc.shape[0] == 2
+
+
+@pytest.mark.skipif(not RDKIT_AVAILABLE, reason="requires rdkit")
+@pytest.mark.parametrize("n_jobs", [2, -1])
+def test_smiles2fingerprints_parallel(n_jobs):
+    many_smiles = smiles * 5
+    np.testing.assert_array_equal(
+        smiles2fingerprints(smiles=many_smiles, n_bits=32, n_jobs=n_jobs),
+        smiles2fingerprints(smiles=many_smiles, n_bits=32),
+    )
+    np.testing.assert_array_equal(
+        smiles2fragments_fingerprints(smiles=many_smiles, n_bits=32, n_jobs=n_jobs),
+        smiles2fragments_fingerprints(smiles=many_smiles, n_bits=32),
+    )
+
+
+@pytest.mark.skipif(
+    not (RDKIT_AVAILABLE and MORDRED_AVAILABLE), reason="requires rdkit and mordred"
+)
+def test_smiles2mordred_parallel():
+    many_smiles = smiles * 5
+    np.testing.assert_array_equal(
+        smiles2mordred(
+            smiles=many_smiles, descriptors_list=["NssCH2", "ATSC2d"], n_jobs=2
+        ),
+        smiles2mordred(smiles=many_smiles, descriptors_list=["NssCH2", "ATSC2d"]),
+    )
+
+
+@pytest.mark.skipif(not RDKIT_AVAILABLE, reason="requires rdkit")
+def test_smiles2fingerprints_parallel_invalid_smiles():
+    with pytest.raises(ValueError, match="is not a valid smiles string"):
+        smiles2fingerprints(smiles=[*smiles, "abcd"], n_bits=32, n_jobs=2)
+
+
+def test_featurize_batch_invalid_n_jobs():
+    with pytest.raises(ValueError, match="n_jobs has to be at least 1"):
+        featurize_batch(np.asarray, smiles, n_features=1, n_jobs=0)
+
+
+@pytest.mark.parametrize("n_bits, word_size", [(32, 32), (70, 32), (10, 4)])
+def test_pack_fingerprints(n_bits, word_size):
+    fingerprints = np.random.randint(0, 2, size=(5, n_bits))
+    words = pack_fingerprints(fingerprints, word_size=word_size)
+    assert words.shape == (5, -(-n_bits // word_size))
+    assert (words >= 0).all() and (words < 2**word_size).all()
+    np.testing.assert_array_equal(
+        unpack_fingerprints(words, n_bits=n_bits, word_size=word_size), fingerprints
+    )
+    # the words are exactly representable as floats
+    np.testing.assert_array_equal(
+        unpack_fingerprints(
+            words.astype(np.float64), n_bits=n_bits, word_size=word_size
+        ),
+        fingerprints,
+    )
+
+
+def test_pack_fingerprints_invalid_word_size():
+    with pytest.raises(ValueError, match="word_size has to be between"):
+        pack_fingerprints(np.ones((2, 8)), word_size=64)
+
+
+@pytest.mark.skipif(not RDKIT_AVAILABLE, reason="requires rdkit")
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_smiles2features_sparse(n_jobs):
+    many_smiles = smiles * 3
+    for featurizer, kwargs in [
+        (smiles2fingerprints, {"n_bits": 64}),
+        (smiles2fragments, {}),
+        (smiles2fragments_fingerprints, {"n_bits": 64}),
+    ]:
+        dense = featurizer(smiles=many_smiles, n_jobs=n_jobs, **kwargs)
+        sparse = featurizer(smiles=many_smiles, n_jobs=n_jobs, sparse=True, **kwargs)
+        assert sp.isspmatrix_csr(sparse)
+        assert sparse.nnz == np.count_nonzero(dense)
+        np.testing.assert_array_equal(sparse.toarray(), dense)
@@ -0,0 +1,203 @@
+import importlib
+import sqlite3
+
+import mock
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.sparse as sp
+
+import bofire.utils.featurization_cache as featurization_cache
+from bofire.data_models.molfeatures.api import Fingerprints, Fragments
+from bofire.utils.cheminformatics import smiles2canonical, smiles2fingerprints
+from bofire.utils.featurization_cache import (
+    FeaturizationCache,
+    get_featurization_cache,
+    set_featurization_cache,
+)
+
+RDKIT_AVAILABLE = importlib.util.find_spec("rdkit") is not None
+
+smiles = [
+    "CC(=O)Oc1ccccc1C(=O)O",
+    "c1ccccc1",
+    "[CH3][CH2][OH]",
+    "N[C@](C)(F)C(=O)O",
+]
+
+
+def featurizer(smiles):
+    return smiles2fingerprints(smiles, n_bits=32)
+
+
+def test_featurization_cache_invalid_maxsize():
+    with pytest.raises(ValueError):
+        FeaturizationCache(maxsize=0)
+    with pytest.raises(ValueError):
+        FeaturizationCache(max_bytes=0)
+
+
+@pytest.mark.skipif(not RDKIT_AVAILABLE, reason="requires rdkit")
+def test_featurization_cache_featurize():
+    cache = FeaturizationCache()
+    mocked = mock.Mock(side_effect=featurizer)
+    values = cache.featurize("fps", smiles[:2], mocked)
+    np.testing.assert_allclose(values, featurizer(smiles[:2]))
+    # only the new molecules are featurized, non canonical smiles are recognized
+    values = cache.featurize("fps", ["CCO", *smiles[:2], "CCO"], mocked)
+    np.testing.assert_allclose(values, featurizer(["CCO", *smiles[:2], "CCO"]))
+    assert mocked.call_count == 2
+    assert mocked.call_args[0][0] == ["CCO"]
+    assert len(cache) == 3
+    # different configs are cached separately
+    cache.featurize("other", smiles[:1], mocked)
+    assert mocked.call_count == 3
+    assert len(cache) == 4
+    cache.clear()
+    assert len(cache) == 0
+
+
+@pytest.mark.skipif(not RDKIT_AVAILABLE, reason="requires rdkit")
+def test_featurization_cache_lru():
+    cache = FeaturizationCache(maxsize=2)
+    mocked = mock.Mock(side_effect=featurizer)
+    cache.featurize("fps", smiles[:2], mocked)
+    cache.featurize("fps", smiles[:1], mocked)
+    cache.featurize("fps", smiles[2:3], mocked)
+    assert len(cache) == 2
+    assert mocked.call_count == 2
+    # the least recently used entry got evicted
+    cache.featurize("fps", smiles[:1], mocked)
+    assert mocked.call_count == 2
+    cache.featurize("fps", smiles[1:2], mocked)
+    assert mocked.call_count == 3
+
+
+@pytest.mark.skipif(not RDKIT_AVAILABLE, reason="requires rdkit")
+def test_featurization_cache_max_bytes():
+    # 32 float64 values per molecule, room for two of them
+    cache = FeaturizationCache(max_bytes=2 * 32 * 8)
+    mocked = mock.Mock(side_effect=featurizer)
+    values = cache.featurize("fps", smiles[:3], mocked)
+    np.testing.assert_allclose(values, featurizer(smiles[:3]))
+    assert len(cache) == 2
+    assert cache.nbytes == 2 * 32 * 8
+    # the least recently used entry got evicted
+    cache.featurize("fps", smiles[1:3], mocked)
+    assert mocked.call_count == 1
+    cache.featurize("fps", smiles[:1], mocked)
+    assert mocked.call_count == 2
+    cache.clear()
+    assert cache.nbytes == 0
+
+
+@pytest.mark.skipif(not RDKIT_AVAILABLE, reason="requires rdkit")
+def test_featurization_cache_invalid_smiles():
+    cache = FeaturizationCache()
+    with pytest.raises(ValueError, match="is not a valid smiles string"):
+        cache.featurize("fps", ["abcd"], featurizer)
+
+
+@pytest.mark.skipif(not RDKIT_AVAILABLE, reason="requires rdkit")
+def test_featurization_cache_persistent(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = FeaturizationCache(path=path)
+    values = cache.featurize("fps", smiles, featurizer)
+    cache.close()
+    cache = FeaturizationCache(path=path)
+    mocked = mock.Mock(side_effect=featurizer)
+    np.testing.assert_allclose(cache.featurize("fps", smiles, mocked), values)
+    assert mocked.call_count == 0
+    cache.clear()
+    cache.close()
+    cache = FeaturizationCache(path=path)
+    cache.featurize("fps", smiles, mocked)
+    assert mocked.call_count == 1
+    cache.close()
+
+
+@pytest.mark.skipif(not RDKIT_AVAILABLE, reason="requires rdkit")
+def test_featurization_cache_migrate(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    values = FeaturizationCache().featurize("fps", smiles, featurizer)
+    # layout of version 0 without the number of features
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE descriptors (config TEXT, smiles TEXT, vals BLOB, "
+        "PRIMARY KEY (config, smiles))"
+    )
+    connection.executemany(
+        "INSERT INTO descriptors VALUES (?, ?, ?)",
+        [
+            ("fps", smiles2canonical(smi), vals.tobytes())
+            for smi, vals in zip(smiles, values)
+        ],
+    )
+    connection.commit()
+    connection.close()
+    cache = FeaturizationCache(path=path)
+    mocked = mock.Mock(side_effect=featurizer)
+    np.testing.assert_allclose(cache.featurize("fps", smiles, mocked), values)
+    assert mocked.call_count == 0
+    cache.close()
+    connection = sqlite3.connect(path)
+    assert connection.execute("PRAGMA user_version").fetchone()[0] == 1
+    connection.execute("PRAGMA user_version = 2")
+    connection.commit()
+    connection.close()
+    with pytest.raises(ValueError, match="has schema version 2"):
+        FeaturizationCache(path=path)
+
+
+@pytest.mark.skipif(not RDKIT_AVAILABLE, reason="requires rdkit")
+def test_featurization_cache_sparse(tmp_path):
+    def sparse_featurizer(smiles):
+        return smiles2fingerprints(smiles, n_bits=32, sparse=True)
+
+    path = tmp_path / "cache.sqlite"
+    cache = FeaturizationCache(path=path)
+    cache.featurize("fps", smiles[:2], sparse_featurizer)
+    values = cache.featurize("fps", smiles, sparse_featurizer)
+    assert sp.issparse(values)
+    np.testing.assert_array_equal(values.toarray(), featurizer(smiles))
+    cache.close()
+    cache = FeaturizationCache(path=path)
+    mocked = mock.Mock(side_effect=sparse_featurizer)
+    loaded = cache.featurize("fps", smiles[::-1], mocked)
+    assert mocked.call_count == 0
+    assert sp.issparse(loaded)
+    np.testing.assert_array_equal(loaded.toarray(), featurizer(smiles[::-1]))
+    cache.close()
+
+
+@pytest.mark.skipif(not RDKIT_AVAILABLE, reason="requires rdkit")
+def test_molfeatures_use_featurization_cache():
+    original = get_featurization_cache()
+    try:
+        cache = FeaturizationCache()
+        set_featurization_cache(cache)
+        fingerprints = Fingerprints(n_bits=32)
+        values = pd.Series(smiles, index=[3, 2, 1, 0])
+        with mock.patch.object(
+            Fingerprints,
+            "_get_descriptor_values",
+            autospec=True,
+            side_effect=lambda self, smiles: featurizer(smiles),
+        ) as mocked:
+            df = fingerprints.get_descriptor_values(values)
+            df2 = fingerprints.get_descriptor_values(values)
+            assert mocked.call_count == 1
+            # another configuration is featurized again
+            Fingerprints(n_bits=32, bond_radius=3).get_descriptor_values(values)
+            assert mocked.call_count == 2
+        pd.testing.assert_frame_equal(df, df2)
+        assert list(df.index) == [3, 2, 1, 0]
+        assert df.columns.tolist() == fingerprints.get_descriptor_names()
+        assert Fingerprints(n_bits=32).get_cache_key() == fingerprints.get_cache_key()
+        assert Fragments().get_cache_key() != fingerprints.get_cache_key()
+        # without cache
+        set_featurization_cache(None)
+        assert featurization_cache.get_featurization_cache() is None
+        pd.testing.assert_frame_equal(fingerprints.get_descriptor_values(values), df)
+    finally:
+        set_featurization_cache(original)
@@ -1,6 +1,7 @@
 import random
 
 import numpy as np
+import pandas as pd
 import pytest
 import torch
 from botorch.acquisition.objective import ConstrainedMCObjective, GenericMCObjective
@@ -46,6 +47,7 @@ from bofire.utils.torch_tools import (
     get_objective_callable,
     get_output_constraints,
     get_product_constraints,
+    sparse_frame_to_tensor,
     tkwargs,
 )
 
@@ -876,3 +878,14 @@ def test_constrained_objective():
         .ravel()
     )
     assert np.allclose(true_y.numpy(), result)
+
+
+def test_sparse_frame_to_tensor():
+    values = np.array([[0.0, 1.0, 0.0], [2.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+    df = pd.DataFrame(values, columns=["a", "b", "c"]).astype(
+        pd.SparseDtype(float, 0.0)
+    )
+    t = sparse_frame_to_tensor(df)
+    assert t.is_sparse
+    assert t._nnz() == 2
+    assert torch.equal(t.to_dense(), torch.from_numpy(values))